@@ -3,11 +3,21 @@ SUMMARY 파일 자동 복사 스크립트
 회사 OneDrive의 SUMMARY 파일을 Google Drive로 자동 복사합니다.
 Windows 작업 스케줄러와 함께 사용하여 주기적으로 실행할 수 있습니다.
 """
+import atexit
+import os
 import shutil
 from pathlib import Path
 import time
-from datetime import datetime
+from typing import Optional
 import sys
+import traceback
+
+try:
+    import xxhash
+except ImportError:
+    # xxhash가 없으면 표준 라이브러리 blake2b 사용 (느리지만 동일하게 동작)
+    xxhash = None
+    import hashlib
 
 # 경로 설정
 # 회사 OneDrive 경로 (원본 파일)
@@ -19,13 +29,62 @@ DEST_FILE = Path(r"G:\내 드라이브\MLB PROD DASHBOARD\★26SS MLB 생산스
 # 로그 파일 경로 (선택사항)
 LOG_FILE = Path(r"G:\내 드라이브\MLB PROD DASHBOARD\copy_log.txt")
 
-# 강제 덮어쓰기 옵션 (True: 항상 복사, False: 최신일 때만 복사)
-FORCE_COPY = True  # True로 설정하면 항상 덮어쓰기
+# 해시 파일 경로 (마지막으로 복사한 원본 내용의 해시 저장)
+HASH_FILE = DEST_FILE.with_suffix(".xlsx.xxh3")
+
+# 강제 덮어쓰기 옵션 (True: 항상 복사, False: 변경되었을 때만 복사)
+FORCE_COPY = False  # True로 설정하면 항상 덮어쓰기
+
+# 내용 해시 비교 옵션 (True: 해시로 변경 여부 판단, False: 수정 시간 비교)
+# OneDrive는 내용이 바뀌어도 수정 시간이 그대로이거나 초기화되는 경우가 있어 해시 비교가 정확함
+USE_HASH_CHECK = True
+
+
+# 로그/수정 시간 표시 형식
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 로그 파일 핸들 (open_log_file()로 한 번만 열고 종료 시 닫음)
+_log_handle = None
+
+# 복사본/로그 폴더 생성 여부 (Google Drive 경로는 mkdir마다 상위 폴더를 모두 확인하므로 한 번만 생성)
+_DIRS_READY = False
+
+
+def ensure_dirs():
+    """복사본 폴더와 로그 폴더를 한 번만 생성"""
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    DEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    if LOG_FILE:
+        LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    _DIRS_READY = True
+
+
+def open_log_file():
+    """로그 파일을 한 번 열어두고 프로그램 종료 시 닫도록 등록
+    
+    Google Drive 경로는 open/close마다 느리므로 메시지마다 파일을 다시 열지 않습니다.
+    """
+    global _log_handle
+    if _log_handle is not None or not LOG_FILE:
+        return
+    try:
+        ensure_dirs()
+        _log_handle = open(LOG_FILE, "a", encoding="utf-8", buffering=1 << 16)
+        atexit.register(_log_handle.close)
+    except Exception as e:
+        print(f"로그 파일 열기 오류: {e}")
+
+
+def fmt_mtime(ts: float) -> str:
+    """수정 시간(타임스탬프)을 로그용 문자열로 변환 (datetime 객체 생성 없이 C 함수로 포맷)"""
+    return time.strftime(TIME_FORMAT, time.localtime(ts))
 
 
 def log_message(message: str, to_console: bool = True, to_file: bool = True):
     """메시지를 콘솔과 로그 파일에 기록"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = time.strftime(TIME_FORMAT)
     log_msg = f"[{timestamp}] {message}"
     
     if to_console:
@@ -33,58 +92,189 @@ def log_message(message: str, to_console: bool = True, to_file: bool = True):
     
     if to_file and LOG_FILE:
         try:
-            LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(LOG_FILE, "a", encoding="utf-8") as f:
-                f.write(log_msg + "\n")
+            if _log_handle is not None:
+                _log_handle.write(log_msg + "\n")
+            else:
+                # open_log_file() 전에 호출된 경우 (모듈로 import해서 사용할 때)
+                ensure_dirs()
+                with open(LOG_FILE, "a", encoding="utf-8") as f:
+                    f.write(log_msg + "\n")
         except Exception as e:
             print(f"로그 파일 쓰기 오류: {e}")
 
 
+def fast_copy(src: Path, dst: Path, src_stat: Optional[os.stat_result] = None) -> None:
+    """파일을 커널 수준에서 복사 (Windows: CopyFileExW, Linux: copy_file_range/sendfile)
+    
+    shutil.copy2의 사용자 공간 read/write 루프를 거치지 않으므로
+    큰 엑셀 파일도 메모리 사용 없이 복사됩니다. 수정 시간은 copy2와 동일하게 유지합니다.
+    src_stat을 넘기면 원본 stat()을 다시 호출하지 않습니다.
+    
+    임시 파일(.part)에 복사한 뒤 os.replace로 교체하므로 대시보드가 복사 중인
+    파일(잘린 ZIP)을 읽는 일이 없습니다.
+    """
+    if src_stat is None:
+        src_stat = src.stat()
+    final_dst = dst
+    dst = dst.with_suffix(dst.suffix + ".part")
+    copied_size: Optional[int] = None
+    
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+        
+        copy_file_ex = ctypes.windll.kernel32.CopyFileExW
+        copy_file_ex.argtypes = [
+            wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p,
+            ctypes.c_void_p, ctypes.POINTER(wintypes.BOOL), wintypes.DWORD,
+        ]
+        copy_file_ex.restype = wintypes.BOOL
+        cancel = wintypes.BOOL(False)
+        if not copy_file_ex(str(src), str(dst), None, None, ctypes.byref(cancel), 0):
+            raise ctypes.WinError()
+    elif hasattr(os, "sendfile"):
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            src_fd = fsrc.fileno()
+            dst_fd = fdst.fileno()
+            offset = 0
+            try:
+                # Linux: copy_file_range는 SMB/NFS 마운트에서 서버 측 복사, XFS/btrfs에서 reflink로 동작
+                if hasattr(os, "copy_file_range"):
+                    try:
+                        while offset < src_stat.st_size:
+                            copied = os.copy_file_range(src_fd, dst_fd, src_stat.st_size - offset, offset, offset)
+                            if copied == 0:
+                                break
+                            offset += copied
+                    except OSError:
+                        # 파일 시스템 간 복사 미지원 등 - sendfile로 이어서 복사
+                        pass
+                # copy_file_range에 오프셋을 직접 넘겼으므로 대상 파일 위치는 움직이지 않음.
+                # sendfile은 대상 파일의 현재 위치에 쓰므로 이어서 쓸 위치로 옮겨 둠
+                os.lseek(dst_fd, offset, os.SEEK_SET)
+                while True:
+                    sent = os.sendfile(dst_fd, src_fd, offset, 1 << 20)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except OSError:
+                # sendfile 미지원 파일 시스템이면 일반 복사로 대체
+                fsrc.seek(offset)
+                fdst.seek(offset)
+                shutil.copyfileobj(fsrc, fdst, 1 << 20)
+            fdst.flush()
+            os.fsync(dst_fd)
+            copied_size = os.fstat(dst_fd).st_size
+    else:
+        shutil.copyfile(src, dst)
+    
+    if copied_size is None:
+        copied_size = dst.stat().st_size
+    # 잘리거나 어긋난 복사본으로 교체하지 않도록 크기 확인 (해시도 저장되지 않음)
+    if copied_size != src_stat.st_size:
+        dst.unlink(missing_ok=True)
+        raise OSError(f"복사본 크기 불일치: {copied_size} != {src_stat.st_size} ({src})")
+    
+    # copy2와 동일하게 원본 수정 시간 유지
+    os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+    os.replace(dst, final_dst)
+
+
+def file_digest(path: Path) -> str:
+    """파일 내용의 해시를 계산 (xxh3_64, 없으면 blake2b)"""
+    if xxhash is not None:
+        h = xxhash.xxh3_64()
+        prefix = "xxh3"
+    else:
+        h = hashlib.blake2b(digest_size=16)
+        prefix = "blake2b"
+    
+    with open(path, "rb", buffering=1 << 20) as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    return f"{prefix}:{h.hexdigest()}"
+
+
+def read_saved_digest() -> Optional[str]:
+    """마지막으로 복사한 원본의 해시를 읽음 (없으면 None)"""
+    try:
+        return HASH_FILE.read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+def save_digest(digest: str):
+    """복사한 원본의 해시를 저장"""
+    try:
+        HASH_FILE.write_text(digest, encoding="utf-8")
+    except OSError as e:
+        log_message(f"해시 파일 쓰기 오류: {e}")
+
+
 def copy_if_newer():
     """원본 파일을 복사 (FORCE_COPY 옵션에 따라 강제 복사 또는 조건부 복사)"""
     try:
-        # 원본 파일 존재 확인
-        if not SOURCE_FILE.exists():
+        # 원본 파일 존재 확인 (stat은 한 번만 호출: OneDrive 플레이스홀더는 stat마다 지연될 수 있음)
+        try:
+            src_stat = SOURCE_FILE.stat()
+        except FileNotFoundError:
             log_message(f"원본 파일을 찾을 수 없습니다: {SOURCE_FILE}")
             return False
+        source_mtime = fmt_mtime(src_stat.st_mtime)
         
-        # Google Drive 폴더 생성
-        DEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # Google Drive 폴더 생성 (이미 생성했으면 건너뜀)
+        ensure_dirs()
         
         # 강제 복사 모드인 경우
         if FORCE_COPY:
-            # 파일 복사 (덮어쓰기)
-            shutil.copy2(SOURCE_FILE, DEST_FILE)
+            # 파일 복사 (덮어쓰기) - 복사본 수정 시간은 원본과 동일하게 설정됨
+            fast_copy(SOURCE_FILE, DEST_FILE, src_stat)
             log_message(f"파일 강제 복사 완료: {DEST_FILE}")
-            log_message(f"  원본 수정 시간: {datetime.fromtimestamp(SOURCE_FILE.stat().st_mtime)}")
-            log_message(f"  복사본 수정 시간: {datetime.fromtimestamp(DEST_FILE.stat().st_mtime)}")
+            log_message(f"  원본 수정 시간: {source_mtime}")
+            log_message(f"  복사본 수정 시간: {source_mtime}")
+            if USE_HASH_CHECK:
+                save_digest(file_digest(SOURCE_FILE))
             return True
         
-        # 조건부 복사 모드 (기존 로직)
+        # 조건부 복사 모드
         should_copy = False
         reason = ""
+        source_digest = None
         
-        if not DEST_FILE.exists():
+        try:
+            dest_stat = DEST_FILE.stat()
+        except FileNotFoundError:
+            dest_stat = None
+        
+        if dest_stat is None:
             should_copy = True
             reason = "복사본 파일이 없음"
+        elif USE_HASH_CHECK:
+            # 내용 해시 비교 (수정 시간과 무관하게 실제 변경 여부 판단)
+            source_digest = file_digest(SOURCE_FILE)
+            saved_digest = read_saved_digest()
+            if source_digest != saved_digest:
+                should_copy = True
+                reason = f"원본 내용 변경 (원본: {source_digest}, 복사본: {saved_digest or '해시 없음'})"
+            else:
+                reason = "복사본이 이미 최신 상태 (내용 해시 동일)"
         else:
             # 파일 수정 시간 비교
-            source_mtime = SOURCE_FILE.stat().st_mtime
-            dest_mtime = DEST_FILE.stat().st_mtime
-            
-            if source_mtime > dest_mtime:
+            if src_stat.st_mtime > dest_stat.st_mtime:
                 should_copy = True
-                reason = f"원본이 더 최신 (원본: {datetime.fromtimestamp(source_mtime)}, 복사본: {datetime.fromtimestamp(dest_mtime)})"
+                reason = f"원본이 더 최신 (원본: {source_mtime}, 복사본: {fmt_mtime(dest_stat.st_mtime)})"
             else:
                 reason = "복사본이 이미 최신 상태"
         
         if should_copy:
             # 파일 복사
-            shutil.copy2(SOURCE_FILE, DEST_FILE)
+            fast_copy(SOURCE_FILE, DEST_FILE, src_stat)
             log_message(f"파일 복사 완료: {DEST_FILE}")
             log_message(f"  이유: {reason}")
-            log_message(f"  원본 수정 시간: {datetime.fromtimestamp(SOURCE_FILE.stat().st_mtime)}")
-            log_message(f"  복사본 수정 시간: {datetime.fromtimestamp(DEST_FILE.stat().st_mtime)}")
+            log_message(f"  원본 수정 시간: {source_mtime}")
+            log_message(f"  복사본 수정 시간: {source_mtime}")
+            if USE_HASH_CHECK:
+                save_digest(source_digest or file_digest(SOURCE_FILE))
             return True
         else:
             log_message(f"파일 복사 건너뜀: {reason}")
@@ -95,18 +285,19 @@ def copy_if_newer():
         return False
     except Exception as e:
         log_message(f"오류 발생: {e}")
-        import traceback
         log_message(f"상세 오류:\n{traceback.format_exc()}")
         return False
 
 
 def main():
     """메인 함수"""
+    open_log_file()
     log_message("=" * 60)
     log_message("SUMMARY 파일 자동 복사 스크립트 시작")
     log_message(f"원본 파일: {SOURCE_FILE}")
     log_message(f"복사본 파일: {DEST_FILE}")
     log_message(f"강제 복사 모드: {'ON' if FORCE_COPY else 'OFF'}")
+    log_message(f"해시 비교 모드: {'ON' if USE_HASH_CHECK else 'OFF'}")
     log_message("=" * 60)
     
     success = copy_if_newer()
@@ -130,7 +321,6 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         log_message(f"예상치 못한 오류: {e}")
-        import traceback
         log_message(traceback.format_exc())
         sys.exit(1)
 
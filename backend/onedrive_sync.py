@@ -1,228 +1,643 @@
 """OneDrive 파일 동기화 모듈"""
+import asyncio
+import atexit
+import importlib.util
+import json
 import os
+import re
+import threading
 import time
 import httpx
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 import traceback
 
+__all__ = [
+    "download_from_onedrive_share_link",
+    "sync_onedrive_file",
+    "sync_onedrive_files",
+    "sync_many",
+]
 
-def download_from_onedrive_share_link(share_link: str, output_path: Path) -> bool:
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1MB
+# xlsx(ZIP) 로컬 파일 헤더 시그니처
+ZIP_SIGNATURE = b"PK\x03\x04"
+# 여러 파일 동시 다운로드 시 최대 동시 요청 수
+MAX_CONCURRENT_DOWNLOADS = 8
+# HTTP/2는 h2 패키지가 설치된 경우에만 사용
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# 모듈 전역 HTTP 클라이언트 (리다이렉트 확인과 다운로드 사이에 연결/TLS 세션 재사용)
+_CLIENT = httpx.Client(
+    http2=HTTP2_AVAILABLE,
+    follow_redirects=True,
+    timeout=60.0,
+    limits=httpx.Limits(max_keepalive_connections=16),
+)
+atexit.register(_CLIENT.close)
+
+# SharePoint/1drv.ms 리다이렉트 결과 캐시 파일 (공유 링크 -> 최종 URL, 몇 시간 동안 변하지 않음)
+URL_CACHE_FILE = Path(os.getenv("ONEDRIVE_URL_CACHE", str(Path.home() / ".cache" / "onedrive_sync" / "urls.json")))
+_url_cache: Optional[Dict[str, Dict[str, Any]]] = None
+# sync_onedrive_files는 여러 스레드에서 동시에 다운로드하므로 캐시 읽기/쓰기를 잠금
+_url_cache_lock = threading.RLock()
+
+
+# 공유 링크 호스트 분류 + 파일 ID 추출을 한 번의 정규식 검색으로 처리
+_HOST_RE = re.compile(
+    r"(?P<sharepoint>sharepoint\.com)"
+    r"|(?P<onedrive_short>1drv\.ms)"
+    r"|(?P<onedrive_live>onedrive\.live\.com)"
+    r"|(?P<google_sheets>docs\.google\.com/spreadsheets(?:/d/(?P<sheets_id>[^/?#]+))?)"
+    r"|(?P<google_drive>drive\.google\.com(?:/file/d/(?P<drive_id>[^/?#]+)|[^?#]*\?(?:[^#]*&)?id=(?P<drive_query_id>[^&#]+))?)"
+)
+
+# Google Drive 바이러스 스캔 경고 페이지의 실제 다운로드 링크 (디코딩 없이 bytes로 검색)
+_GDRIVE_CONFIRM_RE = re.compile(rb'href="(/uc\?export=download[^"]+)"')
+GDRIVE_HTML_SCAN_LIMIT = 64 * 1024
+
+# 리다이렉트를 따라가야 실제 URL을 알 수 있는 호스트
+_REDIRECT_HOSTS = frozenset(("sharepoint", "onedrive_short"))
+
+
+def _classify_link(share_link: str) -> Optional[re.Match]:
+    """공유 링크의 호스트 종류를 분류합니다. (match.lastgroup이 호스트 종류)"""
+    return _HOST_RE.search(share_link)
+
+
+def _normalize_share_link(share_link: str) -> Tuple[str, Optional[re.Match]]:
+    """공유 링크에 프로토콜을 붙이고 SharePoint 폴더 링크를 파일 링크로 바꿉니다.
+    
+    Returns:
+        (정규화된 링크, 호스트 분류 결과). 분류는 여기서 한 번만 하고 이후 단계에 그대로 넘깁니다.
+    """
+    # URL에 프로토콜이 없으면 https:// 추가
+    if share_link and not share_link.startswith(("http://", "https://")):
+        share_link = "https://" + share_link
+        print(f"Added protocol to URL: {share_link}")
+    
+    # SharePoint :f: (폴더) 링크는 :x: (파일) 링크로 변환 시도
+    # (":f:"와 ":x:"는 길이가 같아 변환 후에도 분류 결과/그룹 값은 그대로 유효)
+    match = _classify_link(share_link)
+    if match is not None and match.lastgroup == "sharepoint" and ":f:" in share_link:
+        print("Warning: Folder link detected. Please use file direct link (with :x:) instead.")
+        # 폴더 링크는 파일 링크로 변환 시도 (작동하지 않을 수 있음)
+        share_link = share_link.replace(":f:", ":x:")
+    
+    return share_link, match
+
+
+def _needs_redirect_probe(match: Optional[re.Match]) -> bool:
+    """리다이렉트를 따라가야 실제 URL을 알 수 있는 링크인지 확인합니다."""
+    return match is not None and match.lastgroup in _REDIRECT_HOSTS
+
+
+def _probe_redirect(share_link: str) -> str:
+    """리다이렉트 최종 URL을 확인합니다. 본문이 필요 없으므로 HEAD로 요청하고, 405면 GET으로 재시도합니다."""
+    response = _CLIENT.head(share_link)
+    if response.status_code == 405:
+        response = _CLIENT.get(share_link)
+    return str(response.url)
+
+
+def _load_url_cache() -> Dict[str, Dict[str, Any]]:
+    """리다이렉트 결과 캐시를 읽습니다. (프로세스당 한 번만 파일에서 읽음)"""
+    global _url_cache
+    with _url_cache_lock:
+        if _url_cache is None:
+            try:
+                with open(URL_CACHE_FILE, "r", encoding="utf-8") as f:
+                    _url_cache = json.load(f)
+            except (OSError, ValueError):
+                _url_cache = {}
+        return _url_cache
+
+
+def _write_url_cache() -> None:
+    try:
+        URL_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(URL_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(_load_url_cache(), f)
+    except OSError as e:
+        print(f"Warning: Could not write URL cache: {e}")
+
+
+def _get_cached_redirect(share_link: str, ttl: float) -> Optional[str]:
+    """ttl초 이내에 확인한 리다이렉트 최종 URL이 있으면 반환합니다."""
+    if ttl <= 0:
+        return None
+    entry = _load_url_cache().get(share_link)
+    if entry is None or time.time() - entry.get("ts", 0) > ttl:
+        return None
+    return entry.get("url")
+
+
+def _store_redirect(share_link: str, final_url: str) -> None:
+    with _url_cache_lock:
+        _load_url_cache()[share_link] = {"url": final_url, "ts": time.time()}
+        _write_url_cache()
+
+
+def _forget_redirect(share_link: str) -> None:
+    """캐시된 URL로 다운로드에 실패하면 (공유 토큰 만료 등) 캐시에서 제거합니다."""
+    with _url_cache_lock:
+        if _load_url_cache().pop(share_link, None) is not None:
+            _write_url_cache()
+
+
+def _handle_sharepoint(share_link: str, match: re.Match, final_url: Optional[str]) -> str:
+    """SharePoint 링크 처리"""
+    print(f"Detected SharePoint link: {share_link}")
+    if final_url is None:
+        # 리다이렉트 실패 시 원본 링크 사용
+        return share_link
+    
+    # SharePoint 직접 다운로드 링크 생성
+    # 형식: https://*.sharepoint.com/:x:/s/... -> 다운로드 가능
+    # 또는 download.aspx 링크로 변환
+    if ":x:" in final_url or ":x:" in share_link:
+        # :x: 링크는 직접 다운로드 가능
+        # 다운로드 파라미터 추가
+        if "?download=1" not in final_url and "download.aspx" not in final_url:
+            # 직접 다운로드 링크 생성
+            if "?" in final_url:
+                return final_url + "&download=1"
+            return final_url + "?download=1"
+    return final_url
+
+
+def _handle_onedrive_short(share_link: str, match: re.Match, final_url: Optional[str]) -> str:
+    """OneDrive 1drv.ms 링크 처리"""
+    print(f"Detected OneDrive 1drv.ms link: {share_link}")
+    if final_url is None:
+        return share_link
+    # onedrive.live.com 링크로 변환
+    if "onedrive.live.com" in final_url:
+        # 다운로드 링크로 변환 (embed를 download로 변경)
+        return final_url.replace("/embed?", "/download?")
+    return final_url
+
+
+def _handle_onedrive_live(share_link: str, match: re.Match, final_url: Optional[str]) -> str:
+    """OneDrive live.com 링크 처리"""
+    print(f"Detected OneDrive live.com link: {share_link}")
+    # 이미 onedrive.live.com 링크인 경우
+    download_url = share_link.replace("/embed?", "/download?")
+    if "download" not in download_url:
+        # embed가 없으면 download 추가
+        download_url = share_link.replace("?", "/download?")
+    return download_url
+
+
+def _handle_google_sheets(share_link: str, match: re.Match, final_url: Optional[str]) -> str:
+    """Google Sheets 링크 처리 (docs.google.com/spreadsheets)"""
+    print(f"Detected Google Sheets link: {share_link}")
+    # 형식: https://docs.google.com/spreadsheets/d/FILE_ID/edit?usp=sharing
+    file_id = match.group("sheets_id")
+    if file_id:
+        # Google Sheets를 Excel 형식으로 다운로드
+        download_url = f"https://docs.google.com/spreadsheets/d/{file_id}/export?format=xlsx"
+        print(f"Converted Google Sheets link to Excel download URL: {download_url}")
+        return download_url
+    print(f"Warning: Could not extract file ID from Google Sheets link: {share_link}")
+    return share_link
+
+
+def _handle_google_drive(share_link: str, match: re.Match, final_url: Optional[str]) -> str:
+    """Google Drive 링크 처리"""
+    print(f"Detected Google Drive link: {share_link}")
+    # 형식: https://drive.google.com/file/d/FILE_ID/view?usp=sharing
+    # 또는: https://drive.google.com/open?id=FILE_ID
+    file_id = match.group("drive_id") or match.group("drive_query_id")
+    if file_id:
+        # Google Drive 직접 다운로드 링크 생성
+        # usercontent 도메인 + confirm=t는 큰 파일도 바이러스 스캔 경고 페이지 없이 바로 내려받음
+        download_url = f"https://drive.usercontent.google.com/download?id={file_id}&export=download&confirm=t"
+        print(f"Converted Google Drive link to download URL: {download_url}")
+        return download_url
+    print(f"Warning: Could not extract file ID from Google Drive link: {share_link}")
+    # 파일 ID를 찾을 수 없으면 원본 링크 사용 시도
+    return share_link
+
+
+_HOST_HANDLERS = {
+    "sharepoint": _handle_sharepoint,
+    "onedrive_short": _handle_onedrive_short,
+    "onedrive_live": _handle_onedrive_live,
+    "google_sheets": _handle_google_sheets,
+    "google_drive": _handle_google_drive,
+}
+
+
+def _build_download_url(share_link: str, match: Optional[re.Match], final_url: Optional[str] = None) -> Optional[str]:
+    """공유 링크를 직접 다운로드 URL로 변환합니다.
+    
+    Args:
+        share_link: 정규화된 공유 링크
+        match: _normalize_share_link에서 구한 호스트 분류 결과 (분류되지 않으면 None)
+        final_url: SharePoint/1drv.ms 링크의 리다이렉트 최종 URL (리다이렉트 실패 시 None)
+    
+    Returns:
+        다운로드 URL
+    """
+    if match is None:
+        # 다른 형식의 링크는 그대로 사용
+        print(f"Using link as-is: {share_link}")
+        return share_link
+    return _HOST_HANDLERS[match.lastgroup](share_link, match, final_url)
+
+
+def _is_drive_virus_scan_page(download_url: str, response: httpx.Response) -> bool:
+    """Google Drive 바이러스 스캔 경고 페이지(HTML 응답)인지 확인합니다."""
+    content_type = response.headers.get("content-type", "").lower()
+    return (
+        ("drive.google.com" in download_url or "drive.usercontent.google.com" in download_url)
+        and response.status_code == 200
+        and "text/html" in content_type
+    )
+
+
+def _extract_drive_confirm_url(html_content: bytes) -> Optional[str]:
+    """바이러스 스캔 경고 페이지 HTML에서 실제 다운로드 링크를 추출합니다. (앞부분 64KB만 검색)"""
+    # "downloadUrl" 또는 "uc-download-link" 찾기
+    match = _GDRIVE_CONFIRM_RE.search(html_content, 0, GDRIVE_HTML_SCAN_LIMIT)
+    if match is None:
+        return None
+    actual_download_url = "https://drive.google.com" + match.group(1).decode("utf-8", errors="ignore")
+    print(f"Found actual download URL in HTML: {actual_download_url}")
+    # confirm 파라미터 추가
+    if "confirm=" not in actual_download_url:
+        actual_download_url += "&confirm=t"
+    return actual_download_url
+
+
+def _print_error_response(response: httpx.Response) -> None:
+    """다운로드 실패 응답 정보를 출력합니다. (본문은 이미 읽힌 상태여야 함)"""
+    print(f"Failed to download file. Status code: {response.status_code}")
+    print(f"Response headers: {dict(response.headers)}")
+    # 응답 본문 일부 읽기 (에러 메시지 확인용)
+    try:
+        error_text = response.text[:500]
+        print(f"Error response: {error_text}")
+    except:
+        pass
+
+
+def _is_zip_chunk(first_chunk: bytes) -> bool:
+    """파일 유효성 검사: Excel 파일은 ZIP 형식이어야 함"""
+    # ZIP 파일 시그니처 확인 (PK\x03\x04)
+    if first_chunk[:4] == ZIP_SIGNATURE:
+        return True
+    # HTML 에러 페이지일 가능성
+    content_text = first_chunk[:500].decode('utf-8', errors='ignore')
+    print(f"ERROR: Downloaded file is not a valid Excel file (ZIP signature not found)")
+    print(f"File content preview (first 500 chars): {content_text}")
+    return False
+
+
+def _log_downloaded_file(output_path: Path) -> None:
+    """다운로드된 파일 크기를 출력합니다. (HTML 에러 페이지는 첫 청크 시그니처 검사에서 이미 걸러짐)"""
+    print(f"Successfully downloaded file to {output_path} (size: {output_path.stat().st_size} bytes)")
+
+
+class DownloadInterrupted(Exception):
+    """본문을 받는 도중 연결이 끊긴 경우 (Range 요청으로 이어받기 가능)"""
+    
+    def __init__(self, validator: Optional[str], total: Optional[int] = None):
+        super().__init__("download interrupted")
+        # If-Range에 사용할 ETag 또는 Last-Modified (없으면 이어받기 불가)
+        self.validator = validator
+        # 원본 응답이 알려 준 전체 크기 (Content-Encoding 없이 받은 경우만, 없으면 이어받기 불가)
+        self.total = total
+
+
+# 부분 응답의 Content-Range: bytes <시작>-<끝>/<전체 크기>
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+)")
+
+
+def _meta_path(output_path: Path) -> Path:
+    """다운로드한 파일의 ETag/크기 정보를 저장하는 사이드카 파일 경로"""
+    return output_path.with_suffix(".meta.json")
+
+
+def _load_meta(output_path: Path) -> Dict[str, str]:
+    """마지막 다운로드의 ETag/Content-Length/Last-Modified 정보를 읽습니다."""
+    if not output_path.exists():
+        return {}
+    try:
+        with open(_meta_path(output_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _entity_length(response: httpx.Response) -> Optional[str]:
+    """응답이 나타내는 전체 엔터티 크기 (전송 인코딩 기준)를 반환합니다.
+    
+    200이면 Content-Length, 부분 응답(206)이면 Content-Range의 전체 크기("bytes a-b/total")입니다.
+    iter_bytes()는 Content-Encoding(gzip/br)을 풀어서 쓰므로 디스크 파일 크기와는 다를 수 있고,
+    HEAD 응답의 Content-Length와 비교하려면 이 값을 저장해야 합니다.
+    """
+    if response.status_code == 206:
+        total = response.headers.get("content-range", "").rpartition("/")[2]
+        return total if total.isdigit() else None
+    return response.headers.get("content-length")
+
+
+def _save_meta(output_path: Path, response: httpx.Response) -> None:
+    """응답의 ETag/Content-Length/Last-Modified 정보를 저장합니다."""
+    meta = {
+        key: response.headers[key]
+        for key in ("etag", "last-modified")
+        if key in response.headers
+    }
+    content_length = _entity_length(response)
+    if content_length is not None:
+        meta["content-length"] = content_length
+    try:
+        with open(_meta_path(output_path), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except OSError as e:
+        print(f"Warning: Could not write download metadata: {e}")
+
+
+def _part_path(output_path: Path) -> Path:
+    """다운로드 중인 임시 파일 경로 (완료 후 os.replace로 교체)"""
+    return output_path.with_suffix(output_path.suffix + ".part")
+
+
+def _publish(f, output_path: Path) -> None:
+    """임시 파일을 디스크에 기록한 뒤 원자적으로 최종 파일과 교체합니다.
+    
+    읽는 쪽은 항상 이전 파일 또는 새 파일 전체만 보게 되고, 쓰다 만 ZIP은 보지 않습니다.
+    """
+    f.flush()
+    os.fsync(f.fileno())
+    f.close()
+    os.replace(_part_path(output_path), output_path)
+
+
+def _conditional_headers(meta: Dict[str, str]) -> Dict[str, str]:
+    """이전 다운로드 정보로 조건부 요청 헤더를 만듭니다."""
+    headers = {}
+    if "etag" in meta:
+        headers["If-None-Match"] = meta["etag"]
+    if "last-modified" in meta:
+        headers["If-Modified-Since"] = meta["last-modified"]
+    return headers
+
+
+def _is_unchanged(response: httpx.Response, meta: Dict[str, str]) -> bool:
+    """서버 파일이 마지막 다운로드 이후 변경되지 않았는지 확인합니다.
+    
+    304 응답이거나, 조건부 헤더를 무시하는 서버라도 ETag와 크기가 같으면 변경 없음으로 판단합니다.
+    """
+    if not meta:
+        return False
+    if response.status_code == 304:
+        return True
+    etag = response.headers.get("etag")
+    content_length = response.headers.get("content-length")
+    return (
+        response.status_code == 200
+        and etag is not None
+        and content_length is not None
+        and etag == meta.get("etag")
+        and content_length == meta.get("content-length")
+    )
+
+
+def _save_response(response: httpx.Response, output_path: Path) -> bool:
+    """스트리밍 응답을 파일로 저장합니다. 첫 청크로 ZIP 시그니처를 확인합니다.
+    
+    Args:
+        response: 스트리밍 응답
+        output_path: 저장할 파일 경로
+    
+    Returns:
+        성공 여부
+    """
+    validator = response.headers.get("etag") or response.headers.get("last-modified")
+    # 바이트 범위는 전송된 표현 기준이므로, 압축(Content-Encoding) 없이 받은 경우에만 이어받기 가능
+    total = None
+    if response.headers.get("content-encoding", "identity").lower() == "identity":
+        length = _entity_length(response)
+        total = int(length) if length is not None and length.isdigit() else None
+    
+    if response.status_code != 200:
+        response.read()
+        _print_error_response(response)
+        return False
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    chunks = response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE)
+    first_chunk = next(chunks, b"")
+    if not _is_zip_chunk(first_chunk):
+        return False
+    
+    with open(_part_path(output_path), "wb", buffering=DOWNLOAD_CHUNK_SIZE) as f:
+        f.write(first_chunk)
+        try:
+            for chunk in chunks:
+                f.write(chunk)
+        except httpx.TransportError as e:
+            raise DownloadInterrupted(validator, total) from e
+        _publish(f, output_path)
+    
+    _log_downloaded_file(output_path)
+    _save_meta(output_path, response)
+    return True
+
+
+def _append_range(response: httpx.Response, output_path: Path, resume_from: int, total: int) -> bool:
+    """부분 응답(206)을 임시 파일 뒤에 이어 쓰고, 범위/전체 크기가 모두 맞을 때만 최종 파일로 교체합니다.
+    
+    Content-Range 시작 위치가 받은 크기와 다르거나, 전체 크기가 원본 응답과 다르거나,
+    압축된 응답이거나, 이어 쓴 뒤 크기가 전체 크기와 다르면 교체하지 않고 False를 반환합니다.
+    """
+    match = _CONTENT_RANGE_RE.fullmatch(response.headers.get("content-range", "").strip())
+    if (
+        match is None
+        or int(match.group(1)) != resume_from
+        or int(match.group(3)) != total
+        or response.headers.get("content-encoding", "identity").lower() != "identity"
+    ):
+        print(f"Range response does not continue the partial file (Content-Range: {response.headers.get('content-range')})")
+        return False
+    
+    print(f"Resuming download from byte {resume_from}")
+    validator = response.headers.get("etag") or response.headers.get("last-modified")
+    with open(_part_path(output_path), "ab", buffering=DOWNLOAD_CHUNK_SIZE) as f:
+        try:
+            for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+        except httpx.TransportError as e:
+            raise DownloadInterrupted(validator, total) from e
+        f.flush()
+        if f.tell() != total:
+            print(f"Resumed file size mismatch: {f.tell()} != {total}")
+            return False
+        _publish(f, output_path)
+    _save_meta(output_path, response)
+    _log_downloaded_file(output_path)
+    return True
+
+
+def _resume_download(download_url: str, output_path: Path, validator: str, total: int) -> bool:
+    """중간에 끊긴 다운로드를 Range 요청으로 이어받습니다.
+    
+    If-Range로 원본이 그 사이 바뀌었으면 서버가 전체 파일(200)을 다시 보내도록 합니다.
+    부분 응답이 받은 부분과 이어지지 않으면 임시 파일을 버리고 처음부터 다시 받습니다.
+    """
+    part_path = _part_path(output_path)
+    resume_from = part_path.stat().st_size
+    headers = {"Range": f"bytes={resume_from}-", "If-Range": validator, "Accept-Encoding": "identity"}
+    with _CLIENT.stream("GET", download_url, headers=headers) as response:
+        if response.status_code != 206:
+            # 원본이 바뀌었거나 Range를 지원하지 않으면 전체 응답(200)을 처음부터 저장
+            return _save_response(response, output_path)
+        if _append_range(response, output_path, resume_from, total):
+            return True
+    part_path.unlink(missing_ok=True)
+    print("Discarded partial download, downloading the whole file again...")
+    return _download_to(download_url, output_path, force=True)
+
+
+def _download_to(download_url: str, output_path: Path, force: bool = False) -> bool:
+    """다운로드 URL에서 파일을 받아 저장합니다. force면 변경 여부 확인 없이 항상 새로 받습니다."""
+    # 이전 다운로드 정보가 있으면 조건부 요청 (변경 없으면 304로 본문 없이 종료)
+    # 강제 다운로드는 로컬 파일이 손상된 경우에도 다시 받아야 하므로 이전 정보를 쓰지 않음
+    meta = {} if force else _load_meta(output_path)
+    
+    # 조건부 헤더를 무시하는 서버도 있으므로 HEAD로 ETag/크기를 먼저 비교 (본문 전송 없이 종료)
+    if meta:
+        try:
+            head = _CLIENT.head(download_url, headers=_conditional_headers(meta))
+            if _is_unchanged(head, meta):
+                print(f"Remote file unchanged (HEAD status: {head.status_code}), skipping download")
+                return True
+        except httpx.HTTPError as e:
+            print(f"Warning: HEAD request failed, falling back to GET: {e}")
+    
+    # 파일 다운로드 (Google Drive 바이러스 스캔 페이지 처리 포함)
+    # 스트리밍으로 받아서 바로 디스크에 기록 (전체 응답을 메모리에 올리지 않음)
+    try:
+        with _CLIENT.stream("GET", download_url, headers=_conditional_headers(meta)) as response:
+            if _is_unchanged(response, meta):
+                print(f"Remote file unchanged (status: {response.status_code}), skipping download")
+                return True
+            if not _is_drive_virus_scan_page(download_url, response):
+                return _save_response(response, output_path)
+            print("Detected HTML response (possibly virus scan warning), extracting download link...")
+            response.read()
+            # Content-Type이 HTML이어도 실제 내용이 xlsx(ZIP)이면 그대로 저장
+            actual_download_url = None
+            if response.content[:4] != ZIP_SIGNATURE:
+                actual_download_url = _extract_drive_confirm_url(response.content)
+            if actual_download_url is None:
+                return _save_response(response, output_path)
+        
+        download_url = actual_download_url
+        with _CLIENT.stream("GET", download_url) as response:
+            return _save_response(response, output_path)
+    except DownloadInterrupted as e:
+        # 전송 중 연결이 끊기면 받은 부분부터 이어받기
+        if e.validator is None or e.total is None:
+            raise
+        print(f"Download interrupted ({e.__cause__}), retrying with Range request...")
+        return _resume_download(download_url, output_path, e.validator, e.total)
+
+
+def download_from_onedrive_share_link(
+    share_link: str,
+    output_path: Path,
+    url_cache_ttl: float = 0,
+    force: bool = False,
+) -> bool:
     """OneDrive/SharePoint 공유 링크에서 파일을 다운로드합니다.
     
     Args:
         share_link: OneDrive/SharePoint 공유 링크 
             (예: https://1drv.ms/x/..., https://onedrive.live.com/..., https://*.sharepoint.com/...)
         output_path: 저장할 파일 경로
+        url_cache_ttl: 리다이렉트 결과를 재사용할 시간 (초, 0이면 매번 확인)
+        force: True면 HEAD/조건부 요청으로 변경 여부를 확인하지 않고 항상 새로 받음
     
     Returns:
         성공 여부
     """
     try:
-        # URL에 프로토콜이 없으면 https:// 추가
-        if share_link and not share_link.startswith(("http://", "https://")):
-            share_link = "https://" + share_link
-            print(f"Added protocol to URL: {share_link}")
+        share_link, match = _normalize_share_link(share_link)
         
-        download_url = None
-        
-        # SharePoint 링크 처리
-        if "sharepoint.com" in share_link:
-            print(f"Detected SharePoint link: {share_link}")
-            # SharePoint 링크를 직접 다운로드 링크로 변환
-            # :f: (폴더) 링크는 :x: (파일) 링크로 변환 시도
-            if ":f:" in share_link:
-                print("Warning: Folder link detected. Please use file direct link (with :x:) instead.")
-                # 폴더 링크는 파일 링크로 변환 시도 (작동하지 않을 수 있음)
-                share_link = share_link.replace(":f:", ":x:")
-            
-            # SharePoint 직접 다운로드 링크로 변환
-            # SharePoint 링크는 리다이렉트를 따라가서 실제 다운로드 URL 찾기
-            with httpx.Client(follow_redirects=True, timeout=30.0) as client:
+        # SharePoint/1drv.ms 링크는 리다이렉트를 따라가서 실제 다운로드 URL 찾기
+        final_url = None
+        from_cache = False
+        if _needs_redirect_probe(match):
+            final_url = _get_cached_redirect(share_link, url_cache_ttl)
+            from_cache = final_url is not None
+            if from_cache:
+                print(f"Redirect URL (cached): {final_url}")
+            else:
                 try:
-                    # 먼저 링크에 접근하여 리다이렉트 확인
-                    response = client.get(share_link)
-                    final_url = str(response.url)
-                    print(f"SharePoint redirect URL: {final_url}")
-                    
-                    # SharePoint 직접 다운로드 링크 생성
-                    # 형식: https://*.sharepoint.com/:x:/s/... -> 다운로드 가능
-                    # 또는 download.aspx 링크로 변환
-                    if ":x:" in final_url or ":x:" in share_link:
-                        # :x: 링크는 직접 다운로드 가능
-                        # 다운로드 파라미터 추가
-                        if "?download=1" not in final_url and "download.aspx" not in final_url:
-                            # 직접 다운로드 링크 생성
-                            if "?" in final_url:
-                                download_url = final_url + "&download=1"
-                            else:
-                                download_url = final_url + "?download=1"
-                        else:
-                            download_url = final_url
-                    else:
-                        download_url = final_url
+                    final_url = _probe_redirect(share_link)
+                    print(f"Redirect URL: {final_url}")
+                    if url_cache_ttl > 0:
+                        _store_redirect(share_link, final_url)
                 except Exception as e:
-                    print(f"Error following SharePoint redirect: {e}")
-                    # 리다이렉트 실패 시 원본 링크 사용
-                    download_url = share_link.replace(":f:", ":x:")
-        
-        # OneDrive 1drv.ms 링크 처리
-        elif "1drv.ms" in share_link:
-            print(f"Detected OneDrive 1drv.ms link: {share_link}")
-            # 1drv.ms 링크는 리다이렉트를 따라가야 함
-            with httpx.Client(follow_redirects=True, timeout=30.0) as client:
-                response = client.get(share_link)
-                # 리다이렉트된 URL에서 다운로드 링크 추출
-                final_url = str(response.url)
-                print(f"OneDrive redirect URL: {final_url}")
-                # onedrive.live.com 링크로 변환
-                if "onedrive.live.com" in final_url:
-                    # 다운로드 링크로 변환 (embed를 download로 변경)
-                    download_url = final_url.replace("/embed?", "/download?")
-                else:
-                    download_url = final_url
-        
-        # OneDrive live.com 링크 처리
-        elif "onedrive.live.com" in share_link:
-            print(f"Detected OneDrive live.com link: {share_link}")
-            # 이미 onedrive.live.com 링크인 경우
-            download_url = share_link.replace("/embed?", "/download?")
-            if "download" not in download_url:
-                # embed가 없으면 download 추가
-                download_url = share_link.replace("?", "/download?")
-        
-        # Google Sheets 링크 처리 (docs.google.com/spreadsheets)
-        elif "docs.google.com/spreadsheets" in share_link:
-            print(f"Detected Google Sheets link: {share_link}")
-            # Google Sheets 공유 링크에서 파일 ID 추출
-            # 형식: https://docs.google.com/spreadsheets/d/FILE_ID/edit?usp=sharing
-            file_id = None
-            if "/spreadsheets/d/" in share_link:
-                parts = share_link.split("/spreadsheets/d/")
-                if len(parts) > 1:
-                    file_id = parts[1].split("/")[0].split("?")[0]
-            
-            if file_id:
-                # Google Sheets를 Excel 형식으로 다운로드
-                download_url = f"https://docs.google.com/spreadsheets/d/{file_id}/export?format=xlsx"
-                print(f"Converted Google Sheets link to Excel download URL: {download_url}")
-            else:
-                print(f"Warning: Could not extract file ID from Google Sheets link: {share_link}")
-                download_url = share_link
-        
-        # Google Drive 링크 처리
-        elif "drive.google.com" in share_link:
-            print(f"Detected Google Drive link: {share_link}")
-            # Google Drive 공유 링크에서 파일 ID 추출
-            # 형식: https://drive.google.com/file/d/FILE_ID/view?usp=sharing
-            # 또는: https://drive.google.com/open?id=FILE_ID
-            file_id = None
-            if "/file/d/" in share_link:
-                # /file/d/FILE_ID/ 형식
-                parts = share_link.split("/file/d/")
-                if len(parts) > 1:
-                    file_id = parts[1].split("/")[0].split("?")[0]
-            elif "id=" in share_link:
-                # ?id=FILE_ID 형식
-                from urllib.parse import urlparse, parse_qs
-                parsed = urlparse(share_link)
-                params = parse_qs(parsed.query)
-                if "id" in params:
-                    file_id = params["id"][0]
-            
-            if file_id:
-                # Google Drive 직접 다운로드 링크 생성
-                # 큰 파일의 경우 confirm 파라미터가 필요할 수 있음
-                download_url = f"https://drive.google.com/uc?export=download&id={file_id}&confirm=t"
-                print(f"Converted Google Drive link to download URL: {download_url}")
-            else:
-                print(f"Warning: Could not extract file ID from Google Drive link: {share_link}")
-                # 파일 ID를 찾을 수 없으면 원본 링크 사용 시도
-                download_url = share_link
-        
-        else:
-            # 다른 형식의 링크는 그대로 사용
-            print(f"Using link as-is: {share_link}")
-            download_url = share_link
+                    print(f"Error following redirect: {e}")
         
+        download_url = _build_download_url(share_link, match, final_url)
         if not download_url:
             print("Error: Could not determine download URL")
             return False
         
         print(f"Attempting to download from: {download_url}")
         
-        # 파일 다운로드 (Google Drive 바이러스 스캔 페이지 처리 포함)
-        with httpx.Client(follow_redirects=True, timeout=60.0) as client:
-            response = client.get(download_url, follow_redirects=True)
-            
-            # Google Drive 바이러스 스캔 경고 페이지 처리
-            if "drive.google.com" in download_url and response.status_code == 200:
-                content_type = response.headers.get("content-type", "").lower()
-                # HTML 응답이면 바이러스 스캔 페이지일 수 있음
-                if "text/html" in content_type:
-                    print("Detected HTML response (possibly virus scan warning), extracting download link...")
-                    # HTML에서 실제 다운로드 링크 추출 시도
-                    import re
-                    html_content = response.text
-                    # "downloadUrl" 또는 "uc-download-link" 찾기
-                    download_pattern = r'href="(/uc\?export=download[^"]+)"'
-                    matches = re.findall(download_pattern, html_content)
-                    if matches:
-                        actual_download_url = "https://drive.google.com" + matches[0]
-                        print(f"Found actual download URL in HTML: {actual_download_url}")
-                        # confirm 파라미터 추가
-                        if "confirm=" not in actual_download_url:
-                            actual_download_url += "&confirm=t"
-                        response = client.get(actual_download_url, follow_redirects=True)
-            
-            if response.status_code == 200:
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # 파일 유효성 검사: Excel 파일은 ZIP 형식이어야 함
-                content = response.content
-                # ZIP 파일 시그니처 확인 (PK\x03\x04)
-                is_zip = content[:2] == b'PK'
-                
-                if not is_zip:
-                    # HTML 에러 페이지일 가능성
-                    content_text = content[:500].decode('utf-8', errors='ignore')
-                    print(f"ERROR: Downloaded file is not a valid Excel file (ZIP signature not found)")
-                    print(f"File content preview (first 500 chars): {content_text}")
-                    return False
-                
-                with open(output_path, "wb") as f:
-                    f.write(content)
-                
-                # 파일 크기 확인
-                file_size = output_path.stat().st_size
-                print(f"Successfully downloaded file to {output_path} (size: {file_size} bytes)")
-                
-                if file_size < 1000:  # 1KB 미만이면 의심스러움
-                    print(f"WARNING: Downloaded file is very small ({file_size} bytes), might be an error page")
-                    # 파일 내용 확인
-                    with open(output_path, "rb") as f:
-                        preview = f.read(100).decode('utf-8', errors='ignore')
-                        if "<html" in preview.lower() or "<!doctype" in preview.lower():
-                            print("ERROR: Downloaded file appears to be HTML, not Excel")
-                            return False
-                
-                return True
-            else:
-                print(f"Failed to download file. Status code: {response.status_code}")
-                print(f"Response headers: {dict(response.headers)}")
-                # 응답 본문 일부 읽기 (에러 메시지 확인용)
-                try:
-                    error_text = response.text[:500] if hasattr(response, 'text') else "N/A"
-                    print(f"Error response: {error_text}")
-                except:
-                    pass
-                return False
+        try:
+            success = _download_to(download_url, output_path, force=force)
+        except Exception:
+            if from_cache:
+                _forget_redirect(share_link)
+            raise
+        if not success and from_cache:
+            _forget_redirect(share_link)
+        return success
     except Exception as e:
         print(f"Error downloading from OneDrive/SharePoint: {e}")
         print(traceback.format_exc())
         return False
 
 
+async def sync_onedrive_files(pairs: List[Tuple[str, Path]], url_cache_ttl: float = 0) -> List[bool]:
+    """여러 공유 링크를 동시에 다운로드합니다.
+    
+    파일마다 download_from_onedrive_share_link를 스레드에서 실행하므로 단일 다운로드와 같은 경로
+    (URL 캐시, HEAD/조건부 요청, Range 이어받기)를 그대로 사용합니다. 모듈 전역 클라이언트의
+    연결 풀(HTTP/2 사용 가능 시 멀티플렉싱)을 공유하고, 최대 MAX_CONCURRENT_DOWNLOADS개까지 동시에 요청합니다.
+    
+    Args:
+        pairs: (공유 링크, 저장할 파일 경로) 목록
+        url_cache_ttl: 리다이렉트 결과를 재사용할 시간 (초, 0이면 매번 확인)
+    
+    Returns:
+        pairs 순서대로 각 파일의 다운로드 성공 여부
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    
+    async def _download_one(share_link: str, output_path: Path) -> bool:
+        async with semaphore:
+            return await asyncio.to_thread(download_from_onedrive_share_link, share_link, output_path, url_cache_ttl)
+    
+    return await asyncio.gather(*(_download_one(share_link, output_path) for share_link, output_path in pairs))
+
+
+def sync_many(pairs: List[Tuple[str, Path]], url_cache_ttl: float = 0) -> List[bool]:
+    """sync_onedrive_files의 동기 래퍼입니다. (실행 중인 이벤트 루프가 없을 때 사용)"""
+    return asyncio.run(sync_onedrive_files(pairs, url_cache_ttl))
+
+
 def sync_onedrive_file(
     share_link: str,
     local_path: Path,
@@ -241,14 +656,18 @@ def sync_onedrive_file(
         동기화 성공 여부
     """
     # 파일이 존재하고 최근에 다운로드되었으면 스킵
-    if not force_download and local_path.exists():
-        file_age = time.time() - local_path.stat().st_mtime
-        if file_age < sync_interval:
+    if not force_download:
+        try:
+            file_age = time.time() - local_path.stat().st_mtime
+        except FileNotFoundError:
+            file_age = None
+        if file_age is not None and file_age < sync_interval:
             print(f"File is recent (age: {file_age:.0f}s), skipping download")
             return True
     
-    # 파일 다운로드
-    return download_from_onedrive_share_link(share_link, local_path)
+    # 파일 다운로드 (리다이렉트 결과는 동기화 주기 동안 재사용)
+    # 강제 다운로드는 원격 파일이 그대로여도 로컬 사본을 다시 받음 (손상된 사본 복구)
+    return download_from_onedrive_share_link(share_link, local_path, url_cache_ttl=sync_interval, force=force_download)
 
 
 if __name__ == "__main__":
@@ -1,26 +1,60 @@
 from __future__ import annotations
 
 import os
-import re
+import asyncio
+import gzip
+import hashlib
+import io
+import math
 import json
+import logging
 import traceback
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 from urllib.parse import quote
 
 import openpyxl
 from openpyxl.utils import get_column_letter
 from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from fastapi.responses import HTMLResponse, Response, FileResponse
-from openpyxl.worksheet.worksheet import Worksheet
+from fastapi.responses import HTMLResponse, Response, FileResponse, JSONResponse, ORJSONResponse
 import secrets
 
+try:
+    import orjson
+except ImportError:
+    # orjson이 없으면 표준 json으로 직렬화 (느리지만 동일하게 동작)
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    # brotli가 없으면 gzip으로만 압축해서 전송
+    brotli = None
+
+try:
+    import xxhash
+except ImportError:
+    # xxhash가 없으면 hashlib.blake2s로 ETag 계산 (느리지만 동일하게 프로세스와 무관한 값)
+    xxhash = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    # python-calamine이 없으면 openpyxl(read_only)로 시트를 읽음 (느리지만 동일하게 동작)
+    CalamineWorkbook = None
+
 # OneDrive 동기화 모듈 import
 try:
     from onedrive_sync import sync_onedrive_file
@@ -29,6 +63,9 @@ except ImportError:
     def sync_onedrive_file(*args, **kwargs):
         return True
 
+# 요청 경로의 디버그 로그/예외 로그용 (레벨로 걸러서 문자열 포맷·stderr 출력 비용을 줄임)
+logger = logging.getLogger(__name__)
+
 BASE_DIR = Path(__file__).resolve().parent
 EXCEL_FILENAME = "★26SS MLB 생산스케쥴_DASHBOARD.xlsx"
 DEFAULT_WORKBOOK = BASE_DIR / EXCEL_FILENAME
@@ -41,24 +78,36 @@ DEFAULT_WORKBOOK_V2 = BASE_DIR / EXCEL_FILENAME_V2
 FILE_PATH = Path(os.getenv("SUMMARY_EXCEL", str(DEFAULT_WORKBOOK)))
 FILE_PATH_V2 = Path(os.getenv("SUMMARY_EXCEL_V2", str(DEFAULT_WORKBOOK_V2)))
 SHEET_NAME = os.getenv("SUMMARY_SHEET", "수량 기준")
+# 대시보드가 읽는 시트 (한 번의 워크북 열기로 함께 읽음)
+SUMMARY_SHEETS = ("수량 기준", "스타일수 기준")
 ONEDRIVE_SHARE_LINK = os.getenv("ONEDRIVE_FILE_URL", "")
 ONEDRIVE_SHARE_LINK_V2 = os.getenv("ONEDRIVE_FILE_URL_V2", "")
 DASHBOARD_PASSWORD = os.getenv("DASHBOARD_PASSWORD", "MLB123")  # 기본값, 배포 시 변경 필수
 SYNC_INTERVAL = int(os.getenv("SYNC_INTERVAL", "3600"))  # 기본 1시간
+STAT_MEMO_TTL = float(os.getenv("STAT_MEMO_TTL", "1.0"))  # 파일 stat 결과 재사용 시간 (초)
 
 # 기본값 (주차를 찾을 수 없을 때 사용)
 DEFAULT_WEEK1 = 48
 DEFAULT_WEEK2 = 49
 
+# 숫자 문자열 정리용 변환 테이블 (쉼표/공백 제거를 C 루프 한 번으로 처리)
+_CLEAN_TRANS = str.maketrans("", "", ", ")
+# 엑셀 오류 값 (#VALUE!, #REF! 등). 그 밖의 '#...' 문자열도 숫자 변환에 실패하므로 결과는 같음
+_EXCEL_ERRORS = frozenset({"#VALUE!", "#REF!", "#NAME?", "#DIV/0!", "#NULL!", "#N/A", "#NUM!", "#SPILL!", "#CALC!", "#GETTING_DATA"})
+
 # 고정 컬럼: 총 수량
 TOTAL_QTY_COL = "C"
 TOTAL_QTY_COL_DETAIL = "P"
 
+# 시트 읽기 범위 (openpyxl fallback 시 사용): 세부 복종 150행, 협력사 AW열(49)까지
+SHEET_READ_MAX_ROW = 150
+SHEET_READ_MAX_COL = 49
+
 # 비밀번호 인증
 security = HTTPBasic()
 
-def verify_password(credentials: HTTPBasicCredentials = Depends(security)) -> bool:
-    """비밀번호 인증"""
+async def verify_password(credentials: HTTPBasicCredentials = Depends(security)) -> bool:
+    """비밀번호 인증 (블로킹 작업이 없으므로 async로 두어 요청마다 스레드 풀을 거치지 않음)"""
     correct_password = DASHBOARD_PASSWORD
     is_correct = secrets.compare_digest(credentials.password, correct_password)
     if not is_correct:
@@ -72,8 +121,10 @@ def verify_password(credentials: HTTPBasicCredentials = Depends(security)) -> bo
     return True
 
 
+@lru_cache(maxsize=256)
 def _extract_week_from_header(cell_value: Any) -> Optional[int]:
-    """셀 값에서 주차 번호를 추출합니다. 'xx주차' 형식을 찾습니다."""
+    """셀 값에서 주차 번호를 추출합니다. 'xx주차' 형식을 찾습니다.
+    헤더 값은 V1/V2 로드마다 반복되므로 결과를 캐시합니다 (셀 값은 모두 hashable)."""
     if cell_value is None:
         return None
     
@@ -87,22 +138,28 @@ def _extract_week_from_header(cell_value: Any) -> Optional[int]:
     # 문자열로 변환
     text = str(cell_value).strip()
     
-    # 'xx주차' 패턴 찾기 (예: "1주차", "52주차" 등)
-    match = re.search(r'(\d+)\s*주차', text)
-    if match:
-        try:
-            week_num = int(match.group(1))
+    # 'xx주차' 패턴 찾기 (예: "1주차", "52주차" 등) - 정규식 없이 직접 파싱
+    # "주차" 앞의 공백을 건너뛰고 그 앞의 숫자를 읽음 (숫자가 없으면 다음 "주차" 위치 확인)
+    end = text.find("주차")
+    while end != -1:
+        digits_end = end
+        while digits_end > 0 and text[digits_end - 1].isspace():
+            digits_end -= 1
+        digits_start = digits_end
+        while digits_start > 0 and text[digits_start - 1].isdecimal():
+            digits_start -= 1
+        if digits_start < digits_end:
+            week_num = int(text[digits_start:digits_end])
             if 1 <= week_num <= 60:  # 합리적인 주차 범위
                 return week_num
             return None
-        except (ValueError, AttributeError):
-            return None
+        end = text.find("주차", end + 2)
     
     return None
 
 
-def _find_week_numbers(ws: Worksheet) -> Tuple[int, int]:
-    """엑셀 시트의 헤더 행에서 주차 번호를 찾습니다.
+def _find_week_numbers(rows: List[Tuple[Any, ...]]) -> Tuple[int, int]:
+    """시트 행 데이터의 헤더 행에서 주차 번호를 찾습니다.
     
     V2 엑셀 파일 구조:
     - D3: "1주차 (금주)" - 실제 주차 번호 (예: 1주차)
@@ -112,28 +169,22 @@ def _find_week_numbers(ws: Worksheet) -> Tuple[int, int]:
     week2 = None  # 차주 주차 번호
     
     # D3에서 금주 정보 직접 읽기
-    try:
-        d3_value = ws["D3"].value
-        if d3_value is not None:
-            week1 = _extract_week_from_header(d3_value)
-            if week1 is not None:
-                print(f"금주 정보 발견: D3 = '{d3_value}' -> 주차 {week1}")
-            else:
-                print(f"Warning: D3에서 주차 번호를 추출할 수 없습니다: '{d3_value}'")
-    except Exception as e:
-        print(f"Warning: D3 셀 읽기 오류: {e}")
+    d3_value = _cell(rows, 3, 4)
+    if d3_value is not None:
+        week1 = _extract_week_from_header(d3_value)
+        if week1 is not None:
+            print(f"금주 정보 발견: D3 = '{d3_value}' -> 주차 {week1}")
+        else:
+            print(f"Warning: D3에서 주차 번호를 추출할 수 없습니다: '{d3_value}'")
     
     # K3에서 차주 정보 직접 읽기
-    try:
-        k3_value = ws["K3"].value
-        if k3_value is not None:
-            week2 = _extract_week_from_header(k3_value)
-            if week2 is not None:
-                print(f"차주 정보 발견: K3 = '{k3_value}' -> 주차 {week2}")
-            else:
-                print(f"Warning: K3에서 주차 번호를 추출할 수 없습니다: '{k3_value}'")
-    except Exception as e:
-        print(f"Warning: K3 셀 읽기 오류: {e}")
+    k3_value = _cell(rows, 3, 11)
+    if k3_value is not None:
+        week2 = _extract_week_from_header(k3_value)
+        if week2 is not None:
+            print(f"차주 정보 발견: K3 = '{k3_value}' -> 주차 {week2}")
+        else:
+            print(f"Warning: K3에서 주차 번호를 추출할 수 없습니다: '{k3_value}'")
     
     # 최종 결과 결정
     if week1 is not None and week2 is not None:
@@ -151,8 +202,15 @@ def _find_week_numbers(ws: Worksheet) -> Tuple[int, int]:
         return result
 
 
+# 열 번호 <-> 열 문자 변환 테이블 (A..ZZ, 두 글자 열까지 모두 포함. 그 밖은 계산으로 변환)
+_COL_LETTERS = [""] + [get_column_letter(i) for i in range(1, 703)]
+_COL_NUMS = {letter: i for i, letter in enumerate(_COL_LETTERS) if letter}
+
+
 def _col_num_to_letter(n: int) -> str:
     """열 번호를 엑셀 열 문자로 변환 (1=A, 2=B, ..., 27=AA)"""
+    if 0 < n < len(_COL_LETTERS):
+        return _COL_LETTERS[n]
     result = ""
     while n > 0:
         n -= 1
@@ -163,14 +221,177 @@ def _col_num_to_letter(n: int) -> str:
 
 def _col_letter_to_num(col: str) -> int:
     """엑셀 열 문자를 열 번호로 변환 (A=1, B=2, ..., AA=27)"""
+    col = col.upper()
+    num = _COL_NUMS.get(col)
+    if num is not None:
+        return num
     result = 0
-    for char in col.upper():
+    for char in col:
         result = result * 26 + (ord(char) - ord('A') + 1)
     return result
 
 
+# 워크북별 파싱된 행 데이터: (path, mtime_ns, size, 시트 목록) -> (시트 목록, {시트: 행 데이터})
+_raw_rows_cache: Dict[Tuple[str, int, int, Tuple[str, ...]], Tuple[List[str], Dict[str, List[Tuple[Any, ...]]]]] = {}
+_raw_rows_lock = threading.Lock()
+
+
+def _read_workbook_rows(path: str, mtime_ns: int, size: int, sheet_names: Tuple[str, ...]) -> Tuple[List[str], Dict[str, List[Tuple[Any, ...]]]]:
+    """워크북의 행 데이터를 (path, mtime_ns, size) 기준으로 캐시해서 반환합니다.
+
+    파일이 바뀌면 자동으로 다시 읽고, 같은 파일의 이전 버전(mtime/크기가 다른 항목)은 버려 메모리에 최신 버전만 유지합니다.
+    같은 버전의 다른 시트 조합 항목은 남겨 두므로, 단일 시트 읽기가 요약 시트 항목을 밀어내지 않습니다.
+    요청 스레드와 백그라운드 업데이트 스레드가 동시에 같은 파일을 요청해도 파싱은 한 번만 합니다.
+    """
+    key = (path, mtime_ns, size, sheet_names)
+    cached = _raw_rows_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    with _raw_rows_lock:
+        # 락을 기다리는 동안 다른 스레드가 이미 읽었으면 그 결과 사용
+        cached = _raw_rows_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        cached = _parse_workbook_rows(path, sheet_names)
+        for old_key in [k for k in _raw_rows_cache if k[0] == path and k[1:3] != (mtime_ns, size)]:
+            del _raw_rows_cache[old_key]
+        _raw_rows_cache[key] = cached
+        return cached
+
+
+def _calamine_rows(sheet: Any) -> List[Tuple[Any, ...]]:
+    """python-calamine 시트를 openpyxl(values_only)과 같은 값의 행 튜플 리스트로 읽습니다.
+
+    calamine은 숫자 셀을 모두 float로 돌려주므로, 정수로 떨어지는 값은 openpyxl처럼 int로 바꿉니다
+    (그래야 JSON/ETag가 어느 리더를 쓰든 같음). 엑셀은 1e15 이상을 지수 표기로 저장해 openpyxl도 float로 읽으므로 그 범위는 그대로 둡니다.
+    각 행은 최소 SHEET_READ_MAX_COL 길이로 맞추고, SHEET_READ_MAX_ROW 이후 행은 아예 만들지 않습니다.
+    """
+    rows: List[Tuple[Any, ...]] = []
+    # skip_empty_area=False: 앞쪽 빈 행/열을 건너뛰지 않아 행/열 번호가 엑셀과 일치
+    for row in sheet.to_python(skip_empty_area=False, nrows=SHEET_READ_MAX_ROW):
+        values = tuple(int(v) if type(v) is float and v.is_integer() and -1e15 < v < 1e15 else v for v in row)
+        if len(values) < SHEET_READ_MAX_COL:
+            values += (None,) * (SHEET_READ_MAX_COL - len(values))
+        rows.append(values)
+    return rows
+
+
+def _parse_workbook_rows(path: str, sheet_names: Tuple[str, ...]) -> Tuple[List[str], Dict[str, List[Tuple[Any, ...]]]]:
+    """워크북을 한 번 열어 요청한 시트들의 행 데이터(값 튜플 리스트)를 모두 읽습니다.
+
+    python-calamine(Rust)이 설치되어 있으면 시트 전체를 한 번에 파싱하고,
+    없으면 openpyxl read_only 모드로 필요한 범위만 읽습니다.
+    어느 쪽이든 각 행은 최소 SHEET_READ_MAX_COL(AW열) 길이로 맞춰 두므로 rows[r][c]로 바로 읽을 수 있습니다.
+    """
+    sheets: Dict[str, List[Tuple[Any, ...]]] = {}
+    if CalamineWorkbook is not None:
+        workbook = CalamineWorkbook.from_path(path)
+        available = list(workbook.sheet_names)
+        for name in sheet_names:
+            if name in available:
+                sheets[name] = _calamine_rows(workbook.get_sheet_by_name(name))
+        return available, sheets
+
+    # 파일은 한 번에 메모리로 읽고 바로 닫음: read_only 워크북이 시트를 읽는 동안 파일 핸들을 잡고
+    # 작은 read/seek를 반복하지 않으며, 그동안 OneDrive 동기화/Excel이 파일을 교체해도 충돌하지 않음
+    # (mmap은 매핑된 동안 Windows에서 파일 교체를 막으므로 사용하지 않음)
+    # read_only=True로 메모리 사용량 최소화, data_only=True로 계산된 값 읽기
+    workbook = openpyxl.load_workbook(io.BytesIO(Path(path).read_bytes()), data_only=True, read_only=True, keep_links=False, keep_vba=False)
+    try:
+        available = workbook.sheetnames
+        for name in sheet_names:
+            if name in available:
+                ws = workbook[name]
+                sheets[name] = list(ws.iter_rows(min_row=1, max_row=SHEET_READ_MAX_ROW, min_col=1, max_col=SHEET_READ_MAX_COL, values_only=True))
+        return available, sheets
+    finally:
+        workbook.close()
+
+
+def _read_sheet_rows(excel_path: Path, target_sheet: str) -> Tuple[List[str], Optional[List[Tuple[Any, ...]]]]:
+    """워크북에서 시트 목록과 대상 시트의 행 데이터를 반환합니다.
+    rows[0]이 엑셀 1행에 해당합니다. 대상 시트가 없으면 rows는 None입니다.
+
+    수량 기준/스타일수 기준은 함께 읽어 캐시하므로 두 번째 시트 요청은 워크북을 다시 열지 않습니다.
+    """
+    stat = _stat_memo(excel_path)
+    if stat is None:
+        raise FileNotFoundError(f"Excel file not found at {excel_path}")
+    wanted = SUMMARY_SHEETS if target_sheet in SUMMARY_SHEETS else (target_sheet,)
+    available, sheets = _read_workbook_rows(str(excel_path), stat.st_mtime_ns, stat.st_size, wanted)
+    return available, sheets.get(target_sheet)
+
+
+def _cell(rows: List[Tuple[Any, ...]], row: int, col: int) -> Any:
+    """행 데이터에서 (행, 열) 번호(1부터 시작)의 값을 반환합니다. 범위 밖이면 None."""
+    if row > len(rows):
+        return None
+    values = rows[row - 1]
+    return values[col - 1] if col <= len(values) else None
+
+
+def _iter_rows(rows: List[Tuple[Any, ...]], min_row: int, max_row: int, min_col: int, max_col: int):
+    """Worksheet.iter_rows(values_only=True)와 같은 방식으로 행 데이터를 잘라 반환합니다.
+    각 튜플은 항상 (max_col - min_col + 1) 길이로 맞춰집니다 (부족한 열은 None)."""
+    width = max_col - min_col + 1
+    for values in rows[min_row - 1:max_row]:
+        sliced = tuple(values[min_col - 1:max_col])
+        if len(sliced) < width:
+            sliced += (None,) * (width - len(sliced))
+        yield sliced
+
+
+def _last_filled_row(rows: List[Tuple[Any, ...]], col_idx: int, start_row: int, end_row: int) -> int:
+    """start_row~end_row 중 해당 열에 값이 있는 마지막 행 번호를 반환합니다 (없으면 start_row - 1).
+    뒤에서부터 빈 칸만 건너뛰므로, 데이터가 끝난 뒤의 빈 행들은 본 루프에서 아예 순회하지 않게 됩니다."""
+    row = min(end_row, len(rows))
+    while row >= start_row and rows[row - 1][col_idx] in (None, ""):
+        row -= 1
+    return row
+
+
+def _index_text(value: Any) -> Optional[str]:
+    """인덱스/항목명 셀 값을 문자열로 만듭니다 (정수로 떨어지는 숫자는 소수점 없이).
+    값이 없거나 무한대/NaN처럼 인덱스로 쓸 수 없는 숫자면 None."""
+    if value is None:
+        return None
+    t = type(value)
+    if t is str:
+        return value.strip()
+    if t is int:
+        return str(value)
+    if t is float:
+        if value.is_integer():
+            return f"{int(value)}"
+        return str(value) if math.isfinite(value) else None
+    if isinstance(value, (int, float)):
+        # bool 등 int/float 하위 타입
+        try:
+            return str(int(value)) if value == int(value) else str(value)
+        except (OverflowError, ValueError):
+            return None
+    return str(value).strip()
+
+
+def _numeric_values(values: Iterable[Any]) -> List[Any]:
+    """값들을 한 번에 숫자로 변환합니다 (숫자가 아니면 0)."""
+    return [float(v) if isinstance(v, (int, float)) else 0 for v in values]
+
+
+def _numeric_column(rows: List[Tuple[Any, ...]], col_idx: int) -> List[Any]:
+    """선택된 행들의 한 열을 한 번에 숫자로 변환합니다 (숫자가 아니면 0)."""
+    return _numeric_values(row[col_idx] for row in rows)
+
+
+def _text_column(rows: List[Tuple[Any, ...]], col_idx: int) -> List[str]:
+    """선택된 행들의 한 열을 한 번에 앞뒤 공백을 제거한 문자열로 변환합니다 (빈 값은 "")."""
+    return [str(v).strip() if v else "" for v in (row[col_idx] for row in rows)]
+
+
 def _build_value_columns(week1: int, week2: int, total_qty_col: str = "C", first_week_target_col: str = "D") -> Tuple[Tuple[str, str], ...]:
-    """주차 번호에 따라 VALUE_COLUMNS를 동적으로 생성합니다.
+    """주차 번호에 따라 값 컬럼 구성을 동적으로 생성합니다.
     
     Args:
         week1: 첫 번째 주차 번호 (금주)
@@ -180,39 +401,64 @@ def _build_value_columns(week1: int, week2: int, total_qty_col: str = "C", first
     """
     # 첫 번째 주차 target 컬럼의 열 번호
     base_col_num = _col_letter_to_num(first_week_target_col)
+    # target 컬럼부터 9개 열 문자 (변환 테이블 범위 안이면 슬라이스 한 번으로)
+    if base_col_num + 8 < len(_COL_LETTERS):
+        letters = _COL_LETTERS[base_col_num:base_col_num + 9]
+    else:
+        letters = [_col_num_to_letter(base_col_num + i) for i in range(9)]
     
     columns = [
         ("total_qty", total_qty_col),
-        (f"target_{week1}", _col_num_to_letter(base_col_num)),      # D 또는 Q
-        (f"actual_{week1}", _col_num_to_letter(base_col_num + 1)),  # E 또는 R
-        (f"diff_{week1}", _col_num_to_letter(base_col_num + 2)),    # F 또는 S
-        (f"target_{week1}_pct", _col_num_to_letter(base_col_num + 3)),  # G 또는 T
-        (f"actual_{week1}_pct", _col_num_to_letter(base_col_num + 4)),  # H 또는 U
-        (f"target_{week2}", _col_num_to_letter(base_col_num + 5)),      # I 또는 V
-        (f"actual_{week2}", _col_num_to_letter(base_col_num + 6)),      # J 또는 W
-        (f"target_{week2}_pct", _col_num_to_letter(base_col_num + 7)),  # K 또는 X
-        (f"actual_{week2}_pct", _col_num_to_letter(base_col_num + 8)),  # L 또는 Y
+        (f"target_{week1}", letters[0]),      # D 또는 Q
+        (f"actual_{week1}", letters[1]),  # E 또는 R
+        (f"diff_{week1}", letters[2]),    # F 또는 S
+        (f"target_{week1}_pct", letters[3]),  # G 또는 T
+        (f"actual_{week1}_pct", letters[4]),  # H 또는 U
+        (f"target_{week2}", letters[5]),      # I 또는 V
+        (f"actual_{week2}", letters[6]),      # J 또는 W
+        (f"target_{week2}_pct", letters[7]),  # K 또는 X
+        (f"actual_{week2}_pct", letters[8]),  # L 또는 Y
     ]
     
     return tuple(columns)
 
 
-# 동적으로 생성할 예정이므로 None으로 초기화
-VALUE_COLUMNS: Optional[Tuple[Tuple[str, str], ...]] = None
-DETAIL_VALUE_COLUMNS: Optional[Tuple[Tuple[str, str], ...]] = None
-WEEK1: Optional[int] = None
-WEEK2: Optional[int] = None
+# V2 국가별/아이템별 누적 및 차주 컬럼 (F열=누적 목표, G열=누적 실제, M열=차주 목표, N열=차주 실적)
+CUMULATIVE_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("target_cumulative", "F"),
+    ("actual_cumulative", "G"),
+    ("target_next", "M"),
+    ("actual_next", "N"),
+)
 
 # 데이터 캐시 시스템
 _data_cache: Optional[Dict[str, Any]] = None
 _cache_timestamp: Optional[datetime] = None
+# 캐시를 만든 엑셀 파일의 지문 (크기, 수정 시간 ns) - 파일이 바뀌면 캐시 무효
+_cache_fingerprint: Optional[Tuple[int, int]] = None
+# 시트별 캐시 스냅샷 (파일 지문, 데이터) 직접 참조 (요청마다 _data_cache.get() 및 유효성 검사를 하지 않도록 교체 시 함께 저장)
+# 튜플 하나를 통째로 교체하므로 읽는 쪽은 락 없이 참조 한 번으로 지문과 데이터를 같은 세대로 얻음
+_quantity_cache: Optional[Tuple[Optional[Tuple[int, int]], Dict[str, Any]]] = None
+_style_cache: Optional[Tuple[Optional[Tuple[int, int]], Dict[str, Any]]] = None
+# 캐시 업데이트끼리의 조정(진행 중 여부, 포인터 교체)만 보호. 읽기는 락을 잡지 않음
 _cache_lock = threading.Lock()
 
 # V2 데이터 캐시 시스템
 _data_cache_v2: Optional[Dict[str, Any]] = None
 _cache_timestamp_v2: Optional[datetime] = None
+# 캐시 교체 시 한 번만 만들어 두는 값 (요청마다 isoformat()/datetime.now() 하지 않음)
+_cache_timestamp_v2_iso: Optional[str] = None
+_cache_monotonic_v2: Optional[float] = None  # 캐시 교체 시점의 time.monotonic() (캐시 나이 계산용)
 _cache_file_mtime_v2: Optional[float] = None  # 캐시된 파일의 수정 시간
+_cache_fingerprint_v2: Optional[Tuple[int, int]] = None  # 캐시된 파일의 지문 (크기, 수정 시간 ns)
+# 시트별 V2 캐시 스냅샷 (파일 지문, 데이터) (_data_cache_v2 교체 시 함께 저장, 로드에 실패한 시트는 None)
+_quantity_cache_v2: Optional[Tuple[Optional[Tuple[int, int]], Dict[str, Any]]] = None
+_style_cache_v2: Optional[Tuple[Optional[Tuple[int, int]], Dict[str, Any]]] = None
 _cache_lock_v2 = threading.Lock()
+# V2 응답 본문 캐시: 시트명 -> (데이터 객체, JSON bytes, gzip bytes, ETag)
+_response_cache_v2: Dict[str, Tuple[Dict[str, Any], Dict[str, Tuple[bytes, Dict[str, str]]]]] = {}
+# V2 엑셀 로드 단일 실행 보장용 락 (동시 캐시 미스 시 중복 파싱 방지)
+_load_lock_v2 = threading.Lock()
 # V2 파일 경로 캐시 (성능 최적화: 파일 존재 확인 최소화)
 _cached_file_path_v2: Optional[Path] = None
 # 마지막 파일 수정 시간 체크 타임스탬프 (성능 최적화: 파일 체크 빈도 감소)
@@ -220,9 +466,24 @@ _last_file_check_v2: Optional[datetime] = None
 # 파일 체크 간격 (초) - 평소에는 5분, 월요일 오전에는 1분 (주차 변경 시점 감지)
 FILE_CHECK_INTERVAL_SECONDS = 300  # 기본 5분
 FILE_CHECK_INTERVAL_MONDAY_SECONDS = 60  # 월요일 오전 (0시~12시) 1분
-# 캐시 TTL (초) - 24시간간 캐시 유지 (엑셀 파일이 하루에 한 번만 업데이트되므로 긴 캐시로 성능 최적화)
+# 캐시 TTL (초) - 브라우저 Cache-Control max-age (서버 캐시는 파일 지문이 바뀔 때만 다시 로드)
 CACHE_TTL_SECONDS = 86400  # 24시간 (하루)
 
+# 시트명 -> 캐시 키
+_SHEET_CACHE_KEYS = {"수량 기준": "quantity", "스타일수 기준": "style_count"}
+
+# V2 summary_cells로 내려주는 18행 셀 (금주 D~G, 차주 K~P)
+SUMMARY_ROW_V2 = 18
+SUMMARY_CELLS_V2 = ("D18", "E18", "F18", "G18", "K18", "L18", "M18", "N18", "O18", "P18")
+# 18행 튜플에서 위 셀들을 한 번의 C 호출로 꺼내는 getter (열 위치는 모듈 로드 시 한 번만 계산)
+_SUMMARY_CELLS_V2_GETTER = itemgetter(*(_COL_NUMS[cell[:-len(str(SUMMARY_ROW_V2))]] - 1 for cell in SUMMARY_CELLS_V2))
+
+# V2 세부 복종별/협력사 블록에서 읽는 열의 행 튜플 인덱스 (0부터, 모듈 로드 시 한 번만 계산)
+# 세부 복종별: S=인덱스, O=복종명, W/X=누적 목표/실적, AD/AE=차주 목표/실적
+SUB_CATEGORY_COL_IDX_V2 = tuple(_COL_NUMS[col] - 1 for col in ("S", "O", "W", "X", "AD", "AE"))
+# 협력사: AK=항목명, AO/AP=누적 목표/실적, AV/AW=차주 목표/실적
+SUPPLIER_COL_IDX_V2 = tuple(_COL_NUMS[col] - 1 for col in ("AK", "AO", "AP", "AV", "AW"))
+
 # 업데이트 시간 설정 (오전 11시 - 엑셀 파일이 10시 30분~11시 사이에 업데이트됨)
 UPDATE_HOUR = 11
 UPDATE_MINUTE = 0
@@ -246,14 +507,21 @@ BLOCK_LAYOUT = (
             "rows": range(5, 100),  # 모든 항목 포함을 위해 범위 확대
             "label_key": "subcategory",
             "label_col": "O",
-            "use_detail_columns": True,  # DETAIL_VALUE_COLUMNS 사용 플래그
+            "use_detail_columns": True,  # 세부 컬럼(P~Y) 사용 플래그
             "stop_on_blank": True,
             "blank_tolerance": 10,  # 더 많은 빈 행 허용
         },
     ),
 )
 
-app = FastAPI(title="26SS Quantity Summary API")
+# _extract_block은 rows를 연속 구간(start~stop-1)으로 읽으므로 step 1인 range만 허용
+assert all(isinstance(cfg["rows"], range) and cfg["rows"].step == 1 for _, cfg in BLOCK_LAYOUT)
+
+# orjson(Rust)이 있으면 모든 JSON 응답을 orjson으로 직렬화
+app = FastAPI(
+    title="26SS Quantity Summary API",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+)
 
 # Gzip 압축 미들웨어 추가 (1KB 이상만 압축)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
@@ -267,176 +535,204 @@ app.add_middleware(
 )
 
 
-def _extract_block(ws: Worksheet, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+@lru_cache(maxsize=16)
+def _make_row_parser(col_plan: Tuple[Tuple[str, int], ...], cumulative_plan: Tuple[Tuple[str, int], ...] = ()):
+    """컬럼 구성 (키, 행 튜플 인덱스)에 맞춘 전용 행 파서를 생성합니다.
+
+    주차가 정해지면 키 이름과 열 위치가 고정되므로, 컬럼마다 도는 루프 대신
+    컬럼별 분기를 펼친 함수를 exec로 한 번 만들어 재사용합니다 (레이아웃별 캐시).
+    생성된 parse_row(row, entry)는 숫자/숫자 문자열 값을 entry에 채웁니다.
+    None/엑셀 오류(#VALUE! 등)/숫자가 아닌 문자열은 추가하지 않습니다.
+    값이 하나라도 채워졌으면 누적/차주 컬럼(cumulative_plan, 숫자가 아니면 0)까지 채우고 True를,
+    채워진 값이 없으면 False를 반환합니다.
+    """
+    lines = ["def parse_row(row, entry):"]
+    for key, col_idx in col_plan:
+        key_literal = repr(key)
+        lines += [
+            f"    v = row[{int(col_idx)}]",
+            "    t = type(v)",
+            "    if t is int or t is float:",
+            f"        entry[{key_literal}] = v",
+            "    elif t is str:",
+            "        if v not in _EXCEL_ERRORS:",
+            "            c = v.translate(_CLEAN_TRANS).strip()",
+            "            try:",
+            f"                entry[{key_literal}] = float(c) if '.' in c else int(c)",
+            "            except ValueError:",
+            "                pass",
+            "    elif isinstance(v, (int, float)):",
+            "        # bool 등 int/float 하위 타입",
+            f"        entry[{key_literal}] = v",
+        ]
+    lines.append("    if len(entry) == 1:")
+    lines.append("        return False")
+    for key, col_idx in cumulative_plan:
+        lines += [
+            f"    v = row[{int(col_idx)}]",
+            "    t = type(v)",
+            # 대부분 int/float이므로 type 비교로 먼저 가르고, bool 등 하위 타입만 isinstance로 확인
+            f"    entry[{repr(key)}] = float(v) if t is float or t is int or isinstance(v, (int, float)) else 0",
+        ]
+    lines.append("    return True")
+    namespace: Dict[str, Any] = {"_CLEAN_TRANS": _CLEAN_TRANS, "_EXCEL_ERRORS": _EXCEL_ERRORS}
+    exec("\n".join(lines), namespace)
+    return namespace["parse_row"]
+
+
+def _extract_block(rows_data: List[Tuple[Any, ...]], config: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Generic reader for a contiguous table that shares the same value columns.
-    최적화: iter_rows()를 사용하여 행 단위 배치 읽기로 성능 향상."""
+    최적화: 미리 읽어 둔 행 데이터(rows_data)를 잘라 쓰므로 셀 객체를 만들지 않음."""
 
     payload: List[Dict[str, Any]] = []
     blank_streak = 0
-    # 동적 컬럼이 설정되지 않은 경우 기본값 사용 (하위 호환성)
-    default_columns = _build_value_columns(DEFAULT_WEEK1, DEFAULT_WEEK2, "C", "D")
-    
-    # value_columns가 config에 명시적으로 설정되어 있으면 그것을 우선 사용
-    if "value_columns" in config and config["value_columns"] is not None:
-        columns = config["value_columns"]
-    else:
-        columns = VALUE_COLUMNS or default_columns
+    # 컬럼은 config의 value_columns만 사용 (설정되지 않은 경우 기본 주차 컬럼, 하위 호환성)
+    columns = config.get("value_columns") or _build_value_columns(DEFAULT_WEEK1, DEFAULT_WEEK2, "C", "D")
     
     label_col = config.get("label_col", "B")
     label_key = config.get("label_key", "label")
-    rows = config.get("rows", [])
+    rows = config.get("rows")
     
     if not rows:
         return payload
     
-    # 행 범위 계산
-    min_row = min(rows)
-    max_row = max(rows)
+    # 행 범위 계산 (rows는 항상 연속된 range - BLOCK_LAYOUT 정의 직후 검증)
+    min_row = rows.start
+    max_row = rows.stop - 1
+    
+    # 누적/차주 컬럼 (숫자가 아니면 0으로 채움, V2 국가별/아이템별 전용)
+    cumulative_columns = config.get("cumulative_columns") or ()
     
     # 열 인덱스 변환 (문자 -> 숫자)
     label_col_num = _col_letter_to_num(label_col)
     column_nums = {key: _col_letter_to_num(col) for key, col in columns}
+    cumulative_nums = {key: _col_letter_to_num(col) for key, col in cumulative_columns}
     
-    # 필요한 열 범위 계산 (label_col + 모든 value columns)
-    all_cols = [label_col_num] + list(column_nums.values())
+    # 필요한 열 범위 계산 (label_col + 모든 value columns + 누적 columns)
+    all_cols = [label_col_num] + list(column_nums.values()) + list(cumulative_nums.values())
     min_col = min(all_cols)
     max_col = max(all_cols)
     
-    # iter_rows로 배치 읽기 (values_only=True로 값만 가져오기)
-    try:
-        row_data = {}
-        for row_idx, row_values in enumerate(ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True), start=min_row):
-            if row_idx not in rows:
-                continue
-            
-            try:
-                # label_col 값 가져오기
-                label_idx = label_col_num - min_col
-                label = row_values[label_idx] if label_idx < len(row_values) else None
-                
-                # None이나 빈 문자열 처리
-                if label in (None, ""):
-                    if config.get("stop_on_blank"):
-                        blank_streak += 1
-                        if blank_streak >= config.get("blank_tolerance", 1):
-                            break
-                    continue
-                
-                blank_streak = 0
-                entry = {label_key: label}
-                
-                # 각 컬럼 값 가져오기
-                for key, col_letter in columns:
-                    try:
-                        col_num = column_nums[key]
-                        col_idx = col_num - min_col
-                        cell_value = row_values[col_idx] if col_idx < len(row_values) else None
-                        
-                        # 값 처리 및 최적화
-                        if isinstance(cell_value, str) and cell_value.startswith("#"):
-                            # 엑셀 오류는 None으로 처리하되 딕셔너리에 추가하지 않음
-                            continue
-                        elif cell_value is None:
-                            # None 값은 추가하지 않음 (데이터 구조 최적화)
-                            continue
-                        elif isinstance(cell_value, (int, float)):
-                            entry[key] = cell_value
-                        elif isinstance(cell_value, str):
-                            cleaned = cell_value.strip().replace(",", "").replace(" ", "")
-                            if cleaned and not cleaned.startswith("#"):
-                                try:
-                                    entry[key] = float(cleaned) if "." in cleaned else int(cleaned)
-                                except (ValueError, TypeError):
-                                    continue
-                    except Exception:
-                        continue
-                
-                # entry에 데이터가 있으면 추가 (빈 딕셔너리 제외)
-                if len(entry) > 1:  # label_key 외에 다른 키가 있으면
-                    payload.append(entry)
-            except Exception:
-                continue
-    except Exception:
-        # iter_rows 실패 시 기존 방식으로 fallback
-        for row in rows:
-            try:
-                label = ws[f"{label_col}{row}"].value
-                if label in (None, ""):
-                    if config.get("stop_on_blank"):
-                        blank_streak += 1
-                        if blank_streak >= config.get("blank_tolerance", 1):
-                            break
-                    continue
-                
-                blank_streak = 0
-                entry = {label_key: label}
-                
-                for key, column in columns:
-                    try:
-                        cell_value = ws[f"{column}{row}"].value
-                        if isinstance(cell_value, str) and cell_value.startswith("#"):
-                            continue
-                        elif cell_value is None:
-                            continue
-                        elif isinstance(cell_value, (int, float)):
-                            entry[key] = cell_value
-                        elif isinstance(cell_value, str):
-                            cleaned = cell_value.strip().replace(",", "").replace(" ", "")
-                            if cleaned and not cleaned.startswith("#"):
-                                try:
-                                    entry[key] = float(cleaned) if "." in cleaned else int(cleaned)
-                                except (ValueError, TypeError):
-                                    continue
-                    except Exception:
-                        continue
-                
-                if len(entry) > 1:
-                    payload.append(entry)
-            except Exception:
-                continue
+    # 행은 최소 SHEET_READ_MAX_COL 길이로 맞춰져 있으므로, 그 안의 열만 쓰면 행을 잘라 복사하지 않고
+    # 엑셀 열 위치(base_col=1 기준)로 바로 읽음. 범위를 넘는 열이 있으면 _iter_rows로 잘라서 읽기
+    # (_iter_rows는 항상 max_col - min_col + 1 길이의 튜플을 반환하므로 어느 쪽이든 인덱스 검사 불필요)
+    if max_col <= SHEET_READ_MAX_COL:
+        base_col = 1
+        block_rows = rows_data[min_row - 1:max_row]
+    else:
+        base_col = min_col
+        block_rows = _iter_rows(rows_data, min_row, max_row, min_col, max_col)
+    
+    # 행 튜플 내 인덱스와 블록 설정값을 루프 밖에서 한 번만 계산
+    label_idx = label_col_num - base_col
+    col_plan = tuple((key, column_nums[key] - base_col) for key, _ in columns)
+    cumulative_plan = tuple((key, cumulative_nums[key] - base_col) for key, _ in cumulative_columns)
+    parse_row = _make_row_parser(col_plan, cumulative_plan)
+    stop_on_blank = config.get("stop_on_blank")
+    blank_tolerance = config.get("blank_tolerance", 1)
+    
+    for row_values in block_rows:
+        label = row_values[label_idx]
+        
+        # None이나 빈 문자열 처리
+        if label in (None, ""):
+            if stop_on_blank:
+                blank_streak += 1
+                if blank_streak >= blank_tolerance:
+                    break
+            continue
+        
+        blank_streak = 0
+        entry = {label_key: label}
+        
+        # 각 컬럼 값과 누적/차주 컬럼을 한 번에 채우기 (레이아웃별로 생성된 전용 파서 사용)
+        # entry에 label_key 외의 데이터가 있을 때만 추가 (빈 딕셔너리 제외)
+        if parse_row(row_values, entry):
+            payload.append(entry)
 
     return payload
 
 
-def ensure_excel_file() -> Path:
-    """엑셀 파일이 존재하는지 확인하고, OneDrive에서 동기화합니다."""
+@lru_cache(maxsize=8)
+def _prepare_blocks(
+    value_columns: Tuple[Tuple[str, str], ...],
+    detail_value_columns: Tuple[Tuple[str, str], ...],
+    with_cumulative: bool = False,
+) -> Tuple[Tuple[str, Dict[str, Any]], ...]:
+    """BLOCK_LAYOUT에 주차별 컬럼을 채운 블록 설정을 만듭니다.
+    주차 구성이 같으면 캐시된 설정을 재사용하므로 로드마다 설정 dict를 복사하지 않습니다.
+    (반환된 설정은 공유되므로 호출 측에서 수정하지 않음)
+    
+    Args:
+        with_cumulative: True이면 국가별/아이템별에 누적/차주 컬럼(V2)을 함께 읽도록 설정
+    """
+    blocks = []
+    for name, config in BLOCK_LAYOUT:
+        prepared = {
+            **config,
+            "value_columns": detail_value_columns if config.get("use_detail_columns") else value_columns,
+        }
+        # 국가별/아이템별: 누적/차주 컬럼을 같은 행 순회에서 함께 읽음
+        if with_cumulative and name in ("nations", "items"):
+            prepared["cumulative_columns"] = CUMULATIVE_COLUMNS
+        blocks.append((name, prepared))
+    return tuple(blocks)
+
+
+def ensure_excel_file(allow_sync: bool = True) -> Path:
+    """엑셀 파일이 존재하는지 확인하고, OneDrive에서 동기화합니다.
+    
+    Args:
+        allow_sync: False이면 OneDrive 동기화 없이 로컬 파일만 확인합니다 (요청 처리 경로용).
+    """
+    # 존재 확인은 stat 1회 (동기화를 시도한 경우에만 다시 확인)
+    file_exists = _stat_memo(FILE_PATH) is not None
+    
     # OneDrive 링크가 설정되어 있고 파일이 없으면 동기화 시도
-    if ONEDRIVE_SHARE_LINK and not FILE_PATH.exists():
+    if not file_exists and allow_sync and ONEDRIVE_SHARE_LINK:
         sync_onedrive_file(ONEDRIVE_SHARE_LINK, FILE_PATH, sync_interval=SYNC_INTERVAL, force_download=False)
+        file_exists = _stat_memo(FILE_PATH, ttl=0) is not None
     
     # 파일이 여전히 없으면 에러
-    if not FILE_PATH.exists():
+    if not file_exists:
         raise FileNotFoundError(f"Excel file not found at {FILE_PATH}. OneDrive sync may have failed.")
     
     return FILE_PATH
 
 
-def ensure_excel_file_v2() -> Path:
+def ensure_excel_file_v2(allow_sync: bool = True) -> Path:
     """V2 엑셀 파일이 존재하는지 확인하고, 필요시 OneDrive에서 동기화합니다.
-    성능 최적화: 파일 경로를 캐시하여 불필요한 파일 시스템 접근을 최소화합니다."""
+    성능 최적화: 파일 경로를 캐시하여 불필요한 파일 시스템 접근을 최소화합니다.
+    
+    Args:
+        allow_sync: False이면 OneDrive 동기화 없이 로컬 파일만 확인합니다 (요청 처리 경로용).
+            동기화는 서버 시작 warm-up, 매일 업데이트, 수동 새로고침에서만 수행합니다.
+    """
     global _cached_file_path_v2
     
     # 캐시된 경로가 있고 파일이 존재하면 바로 반환 (성능 최적화)
-    if _cached_file_path_v2 is not None and _cached_file_path_v2.exists():
+    if _cached_file_path_v2 is not None and _stat_memo(_cached_file_path_v2) is not None:
         return _cached_file_path_v2
     
     # 기본 경로에서 파일 확인
-    if FILE_PATH_V2.exists():
+    if _stat_memo(FILE_PATH_V2) is not None:
         _cached_file_path_v2 = FILE_PATH_V2
         return FILE_PATH_V2
     
     # 상위 디렉토리에서도 찾기 (로컬 개발 환경 대응)
     parent_dir = BASE_DIR.parent
     parent_file_path = parent_dir / EXCEL_FILENAME_V2
-    if parent_file_path.exists():
+    if _stat_memo(parent_file_path) is not None:
         _cached_file_path_v2 = parent_file_path
         return parent_file_path
     
     # OneDrive 링크가 설정되어 있고 파일이 없으면 동기화 시도
-    if ONEDRIVE_SHARE_LINK_V2:
+    if not allow_sync:
+        print(f"V2 파일이 없습니다. 요청 처리 중에는 OneDrive 동기화를 하지 않습니다 (warm-up/새로고침에서 동기화).")
+    elif ONEDRIVE_SHARE_LINK_V2:
         print(f"V2 파일이 없습니다. OneDrive에서 동기화 시도 중... (링크: {ONEDRIVE_SHARE_LINK_V2[:50]}...)")
         sync_onedrive_file(ONEDRIVE_SHARE_LINK_V2, FILE_PATH_V2, sync_interval=SYNC_INTERVAL, force_download=True)
-        if FILE_PATH_V2.exists():
+        if _stat_memo(FILE_PATH_V2, ttl=0) is not None:
             _cached_file_path_v2 = FILE_PATH_V2
             return FILE_PATH_V2
         else:
@@ -493,168 +789,369 @@ def should_update_cache() -> bool:
     return False
 
 
+# update_cache 진행 중 여부 (_cache_lock으로 보호). 동시에 호출되면 진행 중인 로드 하나에 합류
+_cache_refreshing = False
+_cache_refresh_done: Optional[threading.Event] = None
+
+
 def update_cache(force_sync: bool = False) -> None:
     """캐시를 업데이트합니다. 매일 11시에만 실행됩니다.
     
+    엑셀 파싱은 락 없이 지역 변수로 수행하고, _cache_lock은 캐시 포인터를 교체할 때만 잡습니다.
+    이미 다른 스레드가 업데이트 중이면 새로 파싱하지 않고 그 결과를 기다립니다.
+    새 캐시는 완성된 뒤 (지문, 데이터) 스냅샷으로 한 번에 교체하므로, 읽는 쪽은 락 없이 읽습니다.
+    
     Args:
         force_sync: True이면 OneDrive에서 강제로 파일을 동기화합니다.
     """
-    global _data_cache, _cache_timestamp
-    
-    # 기존 캐시 백업 (에러 발생 시 복구용)
-    old_cache = _data_cache
-    old_timestamp = _cache_timestamp
+    global _data_cache, _cache_timestamp, _cache_fingerprint, _quantity_cache, _style_cache
+    global _cache_refreshing, _cache_refresh_done
     
     with _cache_lock:
-        try:
-            # OneDrive 동기화 (파일이 없거나 강제 동기화 요청 시)
-            if ONEDRIVE_SHARE_LINK:
-                if not FILE_PATH.exists() or force_sync:
-                    # 강제 다운로드로 최신 파일 가져오기
-                    sync_onedrive_file(ONEDRIVE_SHARE_LINK, FILE_PATH, sync_interval=0, force_download=True)
-            
-            # 데이터 로드
-            quantity_data = load_summary("수량 기준")
-            style_count_data = load_summary("스타일수 기준")
-            
-            # 데이터 유효성 검사
-            if not quantity_data or not isinstance(quantity_data, dict):
-                raise ValueError("Invalid quantity data")
-            if not style_count_data or not isinstance(style_count_data, dict):
-                raise ValueError("Invalid style_count data")
-            
-            # 필수 키 확인
-            required_keys = ["nations", "items", "categories", "week_info"]
-            if not all(key in quantity_data for key in required_keys):
-                raise ValueError("Missing required keys in quantity data")
-            if not all(key in style_count_data for key in required_keys):
-                raise ValueError("Missing required keys in style_count data")
-            
-            _data_cache = {
-                "quantity": quantity_data,
-                "style_count": style_count_data,
-            }
+        if _cache_refreshing:
+            refresh_done = _cache_refresh_done
+        else:
+            refresh_done = None
+            _cache_refreshing = True
+            _cache_refresh_done = threading.Event()
+    
+    if refresh_done is not None:
+        # 진행 중인 업데이트가 끝나면 그 결과(캐시)를 그대로 사용
+        refresh_done.wait()
+        return
+    
+    try:
+        # OneDrive 동기화 (파일이 없거나 강제 동기화 요청 시)
+        if ONEDRIVE_SHARE_LINK:
+            if force_sync or _stat_memo(FILE_PATH) is None:
+                # 강제 다운로드로 최신 파일 가져오기
+                sync_onedrive_file(ONEDRIVE_SHARE_LINK, FILE_PATH, sync_interval=0, force_download=True)
+                _stat_memo(FILE_PATH, ttl=0)  # 새로 받은 파일 기준으로 stat 갱신
+        
+        # 데이터 로드 (로드 전에 지문을 잡아 두어 로드 중 파일이 바뀌면 다음 요청에서 다시 로드)
+        # 파일 확인은 한 번만 하고, 두 시트는 같은 워크북 파싱 결과(_read_workbook_rows 캐시)에서 읽음
+        excel_path = ensure_excel_file()
+        fingerprint = _file_fingerprint(excel_path)
+        if fingerprint is not None and fingerprint == _cache_fingerprint and _data_cache is not None:
+            # 파일이 그대로면 (OneDrive에 새 버전이 없었던 경우 등) 다시 로드하지 않고 시각만 갱신
             _cache_timestamp = datetime.now()
-            
-        except Exception as e:
-            # 에러 발생 시 기존 캐시 복구
-            if old_cache is not None:
-                _data_cache = old_cache
-                _cache_timestamp = old_timestamp
-            else:
-                # 기존 캐시도 없으면 None 유지 (다음 요청 시 직접 로드)
-                pass
+            return
+        quantity_data = load_summary("수량 기준", excel_path)
+        style_count_data = load_summary("스타일수 기준", excel_path)
+        
+        # 데이터 유효성 검사
+        if not quantity_data or not isinstance(quantity_data, dict):
+            raise ValueError("Invalid quantity data")
+        if not style_count_data or not isinstance(style_count_data, dict):
+            raise ValueError("Invalid style_count data")
+        
+        # 필수 키 확인
+        required_keys = ["nations", "items", "categories", "week_info"]
+        if not all(key in quantity_data for key in required_keys):
+            raise ValueError("Missing required keys in quantity data")
+        if not all(key in style_count_data for key in required_keys):
+            raise ValueError("Missing required keys in style_count data")
+        
+        new_cache = {
+            "quantity": quantity_data,
+            "style_count": style_count_data,
+        }
+        new_timestamp = datetime.now()
+        
+        # 포인터 교체만 락 안에서 (에러 시에는 기존 캐시를 건드리지 않으므로 복구가 필요 없음)
+        with _cache_lock:
+            _data_cache = new_cache
+            _quantity_cache = (fingerprint, quantity_data)
+            _style_cache = (fingerprint, style_count_data)
+            _cache_timestamp = new_timestamp
+            _cache_fingerprint = fingerprint
+        
+    except Exception as e:
+        print(f"데이터 로드 오류: {e}")
+        traceback.print_exc()
+        # 기존 캐시는 그대로 유지 (기존 캐시도 없으면 다음 요청 시 직접 로드)
+    finally:
+        with _cache_lock:
+            _cache_refreshing = False
+            _cache_refresh_done.set()
 
 
 # 백그라운드 업데이트 플래그
 _updating_cache = False
 _update_lock = threading.Lock()
 
+# 경로별 (stat 시각, stat 결과). 동시 요청이 몰려도 STAT_MEMO_TTL 동안은 stat 1회만 수행
+_stat_memo_cache: Dict[str, Tuple[float, Optional[os.stat_result]]] = {}
+
+
+def _stat_memo(path: Path, ttl: float = STAT_MEMO_TTL) -> Optional[os.stat_result]:
+    """파일 stat 결과를 짧은 시간(ttl초) 동안 재사용합니다. 파일이 없거나 읽을 수 없으면 None.
+    ttl=0이면 항상 새로 stat 합니다 (파일을 새로 받은 직후 등)."""
+    key = str(path)
+    now = time.monotonic()
+    hit = _stat_memo_cache.get(key)
+    if hit is not None and now - hit[0] < ttl:
+        return hit[1]
+    try:
+        st = os.stat(path)
+    except OSError:
+        st = None
+    _stat_memo_cache[key] = (now, st)
+    return st
+
+
+def _file_fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    """파일 지문 (크기, 수정 시간 ns)을 반환합니다. 파일이 없으면 None."""
+    st = _stat_memo(path)
+    if st is None:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _get_fresh_cache(sheet_name: str) -> Optional[Dict[str, Any]]:
+    """엑셀 파일 지문이 캐시와 같으면 캐시된 데이터를 반환하고, 아니면 None을 반환합니다.
+    캐시 데이터는 update_cache에서 이미 검사했으므로 여기서는 다시 검사하지 않습니다."""
+    snapshot = _quantity_cache if sheet_name == "수량 기준" else _style_cache if sheet_name == "스타일수 기준" else None
+    if snapshot is None:
+        return None
+    fingerprint, cache = snapshot
+    if fingerprint is None:
+        return None
+    
+    # 파일이 바뀌었으면 캐시 무효 (파일을 잠시 읽을 수 없으면 기존 캐시 유지)
+    current = _file_fingerprint(FILE_PATH)
+    if current is not None and current != fingerprint:
+        return None
+    return cache
+
+
 def get_cached_data(sheet_name: str) -> Dict[str, Any]:
-    """캐시된 데이터를 반환합니다. TTL 기반 캐시를 사용합니다 (파일 수정 시간 체크 제거로 성능 향상)."""
-    global _data_cache, _updating_cache, _cache_timestamp
-    
-    # 캐시가 있고 TTL 내에 있으면 캐시 반환 (파일 수정 시간 체크 제거로 성능 향상)
-    if _data_cache is not None and _cache_timestamp is not None:
-        cache_age = (datetime.now() - _cache_timestamp).total_seconds()
-        if cache_age < CACHE_TTL_SECONDS:
-            if sheet_name == "수량 기준":
-                cached = _data_cache.get("quantity")
-                if cached and isinstance(cached, dict) and len(cached) > 0:
-                    return cached
-            elif sheet_name == "스타일수 기준":
-                cached = _data_cache.get("style_count")
-                if cached and isinstance(cached, dict) and len(cached) > 0:
-                    return cached
-    
-    # 캐시가 없거나 TTL이 지났으면 새로 로드
+    """캐시된 데이터를 반환합니다. 엑셀 파일 지문(크기, 수정 시간)이 같으면 워크북을 열지 않습니다."""
+    cached = _get_fresh_cache(sheet_name)
+    if cached is not None:
+        return cached
+    
+    # 캐시가 없거나 파일이 바뀌었으면 두 시트를 한 번에 새로 로드
     print(f"데이터 새로 로드: sheet_name={sheet_name}")
-    try:
-        data = load_summary(sheet_name)
-        # 캐시 업데이트
-        if _data_cache is None:
-            _data_cache = {}
-        if sheet_name == "수량 기준":
-            _data_cache["quantity"] = data
-        elif sheet_name == "스타일수 기준":
-            _data_cache["style_count"] = data
-        _cache_timestamp = datetime.now()
-        return data
-    except Exception as e:
-        print(f"데이터 로드 오류: {e}")
-        import traceback
-        traceback.print_exc()
-        # 최소한의 구조라도 반환하여 프론트엔드 에러 방지
-        return {
-            "nations": [],
-            "items": [],
-            "categories": [],
-            "sub_categories": [],
-            "week_info": {
-                "current_week": DEFAULT_WEEK1,
-                "next_week": DEFAULT_WEEK2,
-            },
-            "sheet_name": sheet_name,
-        }
+    update_cache()
+    cached = _get_fresh_cache(sheet_name)
+    if cached is not None:
+        return cached
+    
+    # 최소한의 구조라도 반환하여 프론트엔드 에러 방지
+    return {
+        "nations": [],
+        "items": [],
+        "categories": [],
+        "sub_categories": [],
+        "week_info": {
+            "current_week": DEFAULT_WEEK1,
+            "next_week": DEFAULT_WEEK2,
+        },
+        "sheet_name": sheet_name,
+    }
+
+
+def _get_fresh_cache_v2(sheet_name: str) -> Optional[Dict[str, Any]]:
+    """V2 엑셀 파일 지문이 캐시와 같으면 캐시된 데이터를 반환하고, 아니면 None을 반환합니다.
+    stat 1회만 수행하므로 이벤트 루프에서 직접 호출해도 될 만큼 가볍습니다.
+    캐시 데이터는 _load_sheet_v2에서 이미 검사했으므로 여기서는 다시 검사하지 않습니다."""
+    snapshot = _quantity_cache_v2 if sheet_name == "수량 기준" else _style_cache_v2 if sheet_name == "스타일수 기준" else None
+    if snapshot is None:
+        return None
+    fingerprint, cache = snapshot
+    if fingerprint is None:
+        return None
+    
+    # 파일이 바뀌었으면 캐시 무효 (파일을 잠시 읽을 수 없으면 기존 캐시 유지)
+    current = _file_fingerprint(_cached_file_path_v2 or FILE_PATH_V2)
+    if current is not None and current != fingerprint:
+        return None
+    return cache
+
+
+def _get_response_body_v2(sheet_name: str, data: Dict[str, Any]) -> Dict[str, Tuple[bytes, Dict[str, str]]]:
+    """V2 데이터의 인코딩별 응답 본문과 응답 헤더(ETag 포함)를 반환합니다.
+    키는 Content-Encoding 값 ("identity", "gzip", brotli가 있으면 "br")입니다.
+    캐시된 데이터 객체가 바뀌었을 때만 다시 직렬화/압축하고 헤더를 만듭니다."""
+    entry = _response_cache_v2.get(sheet_name)
+    if entry is not None and entry[0] is data:
+        return entry[1]
+    
+    # orjson은 공백 없는 UTF-8 bytes를 바로 반환, mtime=0으로 같은 데이터는 같은 gzip 바이트
+    # 날짜/기간 셀 값(라벨 등)은 FastAPI 기본 응답과 같게 jsonable_encoder로 변환
+    if orjson is not None:
+        body = orjson.dumps(data, default=jsonable_encoder)
+    else:
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=jsonable_encoder).encode("utf-8")
+    # ETag는 본문 내용 해시 (서버 재시작/워커가 달라도 같은 데이터면 같은 값)
+    # 강한 ETag는 표현(바이트)마다 달라야 하므로 압축 본문은 "<해시>-gzip", "<해시>-br"를 사용
+    if xxhash is not None:
+        digest = xxhash.xxh3_64_hexdigest(body)
+    else:
+        digest = hashlib.blake2s(body, digest_size=8).hexdigest()
+    etag = f'"{digest}"'
+    # no-cache: 브라우저는 매번 ETag로 재검증 (파일이 바뀌면 바로 반영, 안 바뀌었으면 304로 헤더만 전송)
+    headers = {
+        "Cache-Control": "no-cache",
+        "ETag": etag,
+        "X-Cache-Timestamp": _cache_timestamp_v2_iso or "",
+        "Vary": "Accept-Encoding",
+    }
+    # 압축 본문도 캐시 갱신 시 한 번만 만들어 둠
+    # (GZipMiddleware는 Content-Encoding이 있으면 다시 압축하지 않음)
+    variants = {
+        "identity": (body, headers),
+        "gzip": (
+            gzip.compress(body, compresslevel=6, mtime=0),
+            {**headers, "ETag": f'"{digest}-gzip"', "Content-Encoding": "gzip"},
+        ),
+    }
+    if brotli is not None:
+        variants["br"] = (brotli.compress(body, quality=5), {**headers, "ETag": f'"{digest}-br"', "Content-Encoding": "br"})
+    _response_cache_v2[sheet_name] = (data, variants)
+    return variants
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Accept-Encoding 헤더에서 받을 수 있는 인코딩 이름들을 반환합니다 (q=0은 제외)."""
+    encodings = set()
+    for token in accept_encoding.split(","):
+        name, _, params = token.partition(";")
+        name = name.strip().lower()
+        if name and params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            encodings.add(name)
+    return encodings
+
+
+def _etag_matches(if_none_match: str, *etags: str) -> bool:
+    """If-None-Match 헤더 값이 ETag 중 하나와 일치하는지 확인합니다 (여러 값, W/ 접두사, * 지원)."""
+    if not if_none_match:
+        return False
+    tags = {etag.strip('"') for etag in etags}
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') in tags:
+            return True
+    return False
+
+
+def _summary_response_v2(request: Request, sheet_name: str, data: Dict[str, Any]) -> Response:
+    """V2 요약 데이터 응답을 만듭니다. ETag가 같으면 본문 없이 304를 반환합니다."""
+    variants = _get_response_body_v2(sheet_name, data)
+    body, headers = variants["identity"]
+    
+    # 캐시 갱신 시 미리 직렬화/압축해 둔 본문과 헤더를 그대로 전송 (요청마다 직렬화·압축·헤더 생성하지 않음)
+    # brotli(더 작음) > gzip > 무압축 순으로 클라이언트가 받을 수 있는 것을 선택
+    accepted = _accepted_encodings(request.headers.get("Accept-Encoding", ""))
+    for encoding in ("br", "gzip"):
+        if encoding in accepted and encoding in variants:
+            body, headers = variants[encoding]
+            break
+    
+    # If-None-Match 헤더 확인 (조건부 요청 지원)
+    # 인코딩별 ETag가 다르므로 클라이언트가 어느 표현을 캐시했든 같은 데이터면 304
+    if _etag_matches(
+        request.headers.get("If-None-Match", ""),
+        *(variant_headers["ETag"] for _, variant_headers in variants.values()),
+    ):
+        # 데이터가 변경되지 않았으면 304 Not Modified 반환 (매우 빠름, 선택한 표현의 ETag 전송)
+        return Response(
+            status_code=304,
+            headers={key: value for key, value in headers.items() if key != "Content-Encoding"},
+        )
+    
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers=headers
+    )
+
+
+def get_cached_data_v2(sheet_name: str, allow_sync: bool = True) -> Dict[str, Any]:
+    """V2 캐시된 데이터를 반환합니다. 엑셀 파일 지문(크기, 수정 시간)이 같으면 워크북을 열지 않습니다.
+    동시에 여러 요청이 캐시 미스를 만나도 엑셀 파싱은 한 번만 수행하고, 나머지는 대기 후 캐시를 재사용합니다.
+    allow_sync=False이면 파일이 없어도 OneDrive 동기화를 하지 않습니다 (요청 처리 경로용)."""
+    cached = _get_fresh_cache_v2(sheet_name)
+    if cached is not None:
+        return cached
+    
+    with _load_lock_v2:
+        # 락을 기다리는 동안 다른 요청이 이미 로드했으면 그 결과 사용
+        cached = _get_fresh_cache_v2(sheet_name)
+        if cached is not None:
+            return cached
+        return _load_data_v2(sheet_name, allow_sync)
 
 
-def get_cached_data_v2(sheet_name: str) -> Dict[str, Any]:
-    """V2 캐시된 데이터를 반환합니다. TTL 기반 캐시를 사용합니다 (파일 수정 시간 체크 제거로 성능 향상)."""
-    global _data_cache_v2, _cache_timestamp_v2, _cache_file_mtime_v2, _cached_file_path_v2, _last_file_check_v2
-    
-    # 캐시가 있고 TTL 내에 있으면 캐시 반환 (파일 수정 시간 체크 제거로 성능 향상)
-    if _data_cache_v2 is not None and _cache_timestamp_v2 is not None:
-        cache_age = (datetime.now() - _cache_timestamp_v2).total_seconds()
-        if cache_age < CACHE_TTL_SECONDS:
-            # 파일 체크 없이 바로 캐시 반환
-            if sheet_name == "수량 기준":
-                cached = _data_cache_v2.get("quantity")
-                if cached and isinstance(cached, dict) and len(cached) > 0:
-                    return cached
-            elif sheet_name == "스타일수 기준":
-                cached = _data_cache_v2.get("style_count")
-                if cached and isinstance(cached, dict) and len(cached) > 0:
-                    return cached
-    
-    # 캐시가 없거나 TTL이 지났으면 새로 로드
-    # 성능 최적화: load_summary_v2 내부에서 파일 경로 확인하므로 여기서는 호출만
+def _load_sheet_v2(sheet_name: str, excel_path: Optional[Path] = None) -> Dict[str, Any]:
+    """V2 시트 하나를 로드하고 유효성을 검사합니다."""
     load_start_time = time.time()
     print(f"[데이터 로드 시작] V2 {sheet_name} 데이터 로드 시작...")
+    data = load_summary_v2(sheet_name, excel_path)
+    load_time = time.time() - load_start_time
+    print(f"[데이터 로드 완료] V2 {sheet_name} 데이터 로드 완료 ({load_time:.2f}초)")
+    
+    # 데이터 유효성 검사 - V2 데이터가 비어있으면 에러
+    if not data or len(data.get("nations", [])) == 0:
+        error_msg = f"V2 데이터가 비어있습니다. V2 파일이 올바르게 로드되었는지 확인하세요. (sheet_name={sheet_name})"
+        print(f"Error: {error_msg}")
+        raise ValueError(error_msg)
+    return data
+
+
+def _load_data_v2(sheet_name: str, allow_sync: bool = True) -> Dict[str, Any]:
+    """V2 데이터를 엑셀에서 새로 로드하고 캐시를 갱신합니다. (_load_lock_v2 안에서 호출)
+    수량 기준/스타일수 기준은 같은 파일이므로 함께 로드해 다른 시트의 캐시 미스도 없앱니다."""
+    global _data_cache_v2, _cache_timestamp_v2, _cache_file_mtime_v2, _cache_fingerprint_v2
+    global _cache_timestamp_v2_iso, _cache_monotonic_v2, _quantity_cache_v2, _style_cache_v2
+    
     try:
-        data = load_summary_v2(sheet_name)
-        load_time = time.time() - load_start_time
-        print(f"[데이터 로드 완료] V2 {sheet_name} 데이터 로드 완료 ({load_time:.2f}초)")
+        # 로드 전에 지문을 잡아 두어 로드 중 파일이 바뀌면 다음 요청에서 다시 로드
+        # 파일 확인/유효성 검사는 두 시트 로드 전에 한 번만 (워크북 파싱도 _read_workbook_rows에서 한 번만)
+        excel_path = ensure_excel_file_v2(allow_sync)
+        fingerprint = _file_fingerprint(excel_path)
+        _validate_excel_file_v2(excel_path)
         
-        # 데이터 유효성 검사 - V2 데이터가 비어있으면 에러
-        if not data or len(data.get("nations", [])) == 0:
-            error_msg = f"V2 데이터가 비어있습니다. V2 파일이 올바르게 로드되었는지 확인하세요. (sheet_name={sheet_name})"
-            print(f"Error: {error_msg}")
-            raise ValueError(error_msg)
+        data = _load_sheet_v2(sheet_name, excel_path)
+        if sheet_name not in _SHEET_CACHE_KEYS:
+            return data
         
-        # 캐시 업데이트 (파일 수정 시간도 함께 저장)
+        new_cache = {_SHEET_CACHE_KEYS[sheet_name]: data}
+        for other_sheet, cache_key in _SHEET_CACHE_KEYS.items():
+            if other_sheet == sheet_name:
+                continue
+            try:
+                new_cache[cache_key] = _load_sheet_v2(other_sheet, excel_path)
+            except Exception as e:
+                # 다른 시트 실패는 요청한 시트 응답에 영향 주지 않음 (해당 시트 요청 시 다시 시도)
+                print(f"Warning: V2 {other_sheet} 데이터 로드 실패: {e}")
+        
+        # 캐시 교체 (파일 지문도 함께 저장)
         with _cache_lock_v2:
-            if _data_cache_v2 is None:
-                _data_cache_v2 = {}
-            if sheet_name == "수량 기준":
-                _data_cache_v2["quantity"] = data
-            elif sheet_name == "스타일수 기준":
-                _data_cache_v2["style_count"] = data
+            _data_cache_v2 = new_cache
+            _quantity_cache_v2 = (fingerprint, new_cache["quantity"]) if "quantity" in new_cache else None
+            _style_cache_v2 = (fingerprint, new_cache["style_count"]) if "style_count" in new_cache else None
             _cache_timestamp_v2 = datetime.now()
+            _cache_timestamp_v2_iso = _cache_timestamp_v2.isoformat()
+            _cache_monotonic_v2 = time.monotonic()
+            _cache_fingerprint_v2 = fingerprint
             # 파일 수정 시간도 저장 (수동 새로고침 시 참조용)
-            try:
-                if _cached_file_path_v2 is not None and _cached_file_path_v2.exists():
-                    _cache_file_mtime_v2 = _cached_file_path_v2.stat().st_mtime
-                else:
-                    excel_path = ensure_excel_file_v2()
-                    _cache_file_mtime_v2 = excel_path.stat().st_mtime if excel_path.exists() else None
-            except Exception:
-                _cache_file_mtime_v2 = None
+            _cache_file_mtime_v2 = fingerprint[1] / 1e9 if fingerprint is not None else None
+        
+        # 응답 본문도 미리 만들어 두어 첫 요청부터 직렬화 비용 없이 응답
+        for name, cache_key in _SHEET_CACHE_KEYS.items():
+            if cache_key in new_cache:
+                _get_response_body_v2(name, new_cache[cache_key])
         
         return data
     except FileNotFoundError as fnf_e:
         # V2 파일이 없는 경우 - 404로 변환
         print(f"V2 파일을 찾을 수 없음: {fnf_e}")
-        import traceback
         traceback.print_exc()
         raise
     except ValueError as ve:
@@ -662,7 +1159,6 @@ def get_cached_data_v2(sheet_name: str) -> Dict[str, Any]:
         raise
     except Exception as e:
         print(f"V2 데이터 로드 오류: {e}")
-        import traceback
         traceback.print_exc()
         
         # V2 파일이 필수이므로 에러 발생 (V1 폴백 제거)
@@ -670,19 +1166,17 @@ def get_cached_data_v2(sheet_name: str) -> Dict[str, Any]:
         raise RuntimeError(error_msg) from e
 
 
-def load_summary(sheet_name: Optional[str] = None) -> Dict[str, Any]:
-    """엑셀 파일에서 데이터를 로드하고 주차 정보를 포함하여 반환합니다."""
-    global VALUE_COLUMNS, DETAIL_VALUE_COLUMNS, WEEK1, WEEK2
-    
+def load_summary(sheet_name: Optional[str] = None, excel_path: Optional[Path] = None) -> Dict[str, Any]:
+    """엑셀 파일에서 데이터를 로드하고 주차 정보를 포함하여 반환합니다.
+    excel_path를 넘기면 파일 확인을 건너뜁니다 (update_cache처럼 두 시트를 연달아 읽을 때)."""
     target_sheet = sheet_name or SHEET_NAME
     
     # 파일 존재 확인 및 동기화
-    excel_path = ensure_excel_file()
+    if excel_path is None:
+        excel_path = ensure_excel_file()
     
-    workbook = None
     try:
-        # read_only=True로 메모리 사용량 최소화
-        workbook = openpyxl.load_workbook(excel_path, data_only=True, read_only=True, keep_links=False, keep_vba=False)
+        available_sheets, sheet_rows = _read_sheet_rows(excel_path, target_sheet)
     except PermissionError as exc:
         error_msg = (
             f"엑셀 파일에 접근할 수 없습니다. 파일이 다른 프로그램에서 열려있거나 "
@@ -692,39 +1186,23 @@ def load_summary(sheet_name: Optional[str] = None) -> Dict[str, Any]:
     except Exception as exc:
         raise RuntimeError(f"Failed to open workbook: {exc}") from exc
 
-    try:
-        available_sheets = workbook.sheetnames
-        
-        if target_sheet not in available_sheets:
-            raise RuntimeError(
-                f"Worksheet '{target_sheet}' not found. Available sheets: {', '.join(available_sheets)}"
-            )
-        
-        sheet = workbook[target_sheet]
-        
-    except KeyError as exc:
-        if workbook:
-            workbook.close()
-        raise RuntimeError(f"Worksheet '{target_sheet}' not found in workbook") from exc
+    if sheet_rows is None:
+        raise RuntimeError(
+            f"Worksheet '{target_sheet}' not found. Available sheets: {', '.join(available_sheets)}"
+        )
 
     try:
         # 헤더에서 주차 정보 추출
-        WEEK1, WEEK2 = _find_week_numbers(sheet)
+        week1, week2 = _find_week_numbers(sheet_rows)
         
         # 주차 정보에 따라 동적으로 컬럼 생성
-        VALUE_COLUMNS = _build_value_columns(WEEK1, WEEK2, "C", "D")
-        DETAIL_VALUE_COLUMNS = _build_value_columns(WEEK1, WEEK2, "P", "Q")
+        value_columns = _build_value_columns(week1, week2, "C", "D")
+        detail_value_columns = _build_value_columns(week1, week2, "P", "Q")
         
         data = {}
-        for name, config in BLOCK_LAYOUT:
+        for name, block_config in _prepare_blocks(value_columns, detail_value_columns):
             try:
-                current_config = config.copy()
-                if config.get("use_detail_columns"):
-                    current_config["value_columns"] = DETAIL_VALUE_COLUMNS
-                elif "value_columns" not in current_config:
-                    current_config["value_columns"] = VALUE_COLUMNS
-                
-                extracted = _extract_block(sheet, current_config)
+                extracted = _extract_block(sheet_rows, block_config)
                 data[name] = extracted
             except Exception as e:
                 data[name] = []
@@ -732,8 +1210,8 @@ def load_summary(sheet_name: Optional[str] = None) -> Dict[str, Any]:
         result = {
             **data,
             "week_info": {
-                "current_week": WEEK1,
-                "next_week": WEEK2,
+                "current_week": week1,
+                "next_week": week2,
             },
             "sheet_name": target_sheet,
         }
@@ -742,38 +1220,15 @@ def load_summary(sheet_name: Optional[str] = None) -> Dict[str, Any]:
     except Exception as e:
         error_msg = f"Unexpected error in load_summary: {str(e)}"
         raise RuntimeError(error_msg) from e
-    finally:
-        if workbook:
-            try:
-                workbook.close()
-            except Exception:
-                pass
 
 
-def load_summary_v2(sheet_name: Optional[str] = None) -> Dict[str, Any]:
-    """V2 엑셀 파일에서 데이터를 로드하고 주차 정보를 포함하여 반환합니다.
-    성능 최적화: 파일 경로 캐싱으로 불필요한 파일 시스템 접근을 최소화합니다."""
-    global VALUE_COLUMNS, DETAIL_VALUE_COLUMNS, WEEK1, WEEK2
-    
-    target_sheet = sheet_name or SHEET_NAME
-    
-    # V2 파일 존재 확인 및 동기화 (캐시된 경로 우선 사용)
-    file_check_start = time.time()
-    excel_path = ensure_excel_file_v2()
-    file_check_time = time.time() - file_check_start
-    if file_check_time > 1.0:
-        print(f"[파일 확인] V2 파일 확인 완료 ({file_check_time:.2f}초) - 경로: {excel_path}")
-    
-    # 파일 존재 확인 (캐시된 경로가 있으면 이미 확인됨)
-    if not excel_path.exists():
-        # 파일이 없으면 캐시 초기화하고 다시 시도
-        global _cached_file_path_v2
-        _cached_file_path_v2 = None
-        excel_path = ensure_excel_file_v2()
-        if not excel_path.exists():
-            raise FileNotFoundError(f"V2 Excel file not found: {excel_path}")
+def _validate_excel_file_v2(excel_path: Path) -> None:
+    """V2 파일이 실제 Excel(ZIP) 파일인지 시그니처로 확인합니다.
+    OneDrive 다운로드가 HTML 에러 페이지를 받아 온 경우 ValueError를 발생시킵니다."""
+    global _cached_file_path_v2
     
     # 파일 유효성 검사 (ZIP 시그니처 확인)
+    # 존재 여부는 ensure_excel_file_v2에서 이미 확인했으므로 별도 exists() 없이 바로 열기
     try:
         with open(excel_path, "rb") as f:
             file_header = f.read(4)
@@ -784,25 +1239,44 @@ def load_summary_v2(sheet_name: Optional[str] = None) -> Dict[str, Any]:
                 error_msg = (
                     f"V2 파일이 유효한 Excel 파일이 아닙니다. "
                     f"다운로드된 파일이 HTML 에러 페이지일 수 있습니다. "
-                    f"파일 크기: {excel_path.stat().st_size} bytes"
+                    f"파일 크기: {os.fstat(f.fileno()).st_size} bytes"
                 )
                 print(f"ERROR: {error_msg}")
                 print(f"File preview: {preview[:200]}")
                 raise ValueError(error_msg)
     except ValueError:
         raise
+    except FileNotFoundError as exc:
+        # 확인 직후 파일이 사라졌으면 경로 캐시를 초기화 (다음 요청에서 다시 찾거나 동기화)
+        _cached_file_path_v2 = None
+        raise FileNotFoundError(f"V2 Excel file not found: {excel_path}") from exc
     except Exception as e:
         print(f"Warning: Could not validate file format: {e}")
+
+
+def load_summary_v2(sheet_name: Optional[str] = None, excel_path: Optional[Path] = None) -> Dict[str, Any]:
+    """V2 엑셀 파일에서 데이터를 로드하고 주차 정보를 포함하여 반환합니다.
+    성능 최적화: 파일 경로 캐싱으로 불필요한 파일 시스템 접근을 최소화합니다.
+    excel_path를 넘기면 호출한 쪽에서 이미 파일 확인/유효성 검사를 마친 것으로 보고 바로 읽습니다
+    (두 시트를 함께 로드할 때 파일 확인·검사를 한 번만 하도록)."""
+    target_sheet = sheet_name or SHEET_NAME
+    
+    if excel_path is None:
+        # V2 파일 존재 확인 및 동기화 (캐시된 경로 우선 사용)
+        file_check_start = time.time()
+        excel_path = ensure_excel_file_v2()
+        file_check_time = time.time() - file_check_start
+        if file_check_time > 1.0:
+            print(f"[파일 확인] V2 파일 확인 완료 ({file_check_time:.2f}초) - 경로: {excel_path}")
+        
+        _validate_excel_file_v2(excel_path)
     
-    workbook = None
     try:
-        # read_only=True로 메모리 사용량 최소화
-        # data_only=True로 먼저 시도 (계산된 값 읽기)
         workbook_load_start = time.time()
         print(f"[엑셀 파일 열기] 엑셀 파일 로드 시작... (경로: {excel_path})")
-        workbook = openpyxl.load_workbook(excel_path, data_only=True, read_only=True, keep_links=False)
+        available_sheets, sheet_rows = _read_sheet_rows(excel_path, target_sheet)
         workbook_load_time = time.time() - workbook_load_start
-        print(f"[엑셀 파일 열기] 엑셀 파일 로드 완료 ({workbook_load_time:.2f}초)")
+        print(f"[엑셀 파일 열기] 엑셀 파일 로드 완료 ({workbook_load_time:.2f}초, {'calamine' if CalamineWorkbook is not None else 'openpyxl'})")
     except PermissionError as exc:
         error_msg = (
             f"엑셀 파일 V2에 접근할 수 없습니다. 파일이 다른 프로그램에서 열려있거나 "
@@ -812,294 +1286,170 @@ def load_summary_v2(sheet_name: Optional[str] = None) -> Dict[str, Any]:
     except Exception as exc:
         raise RuntimeError(f"Failed to open workbook V2: {exc}") from exc
 
-    try:
-        available_sheets = workbook.sheetnames
-        if target_sheet not in available_sheets:
-            raise RuntimeError(
-                f"Worksheet '{target_sheet}' not found in V2 file. Available sheets: {', '.join(available_sheets)}"
-            )
-        sheet = workbook[target_sheet]
-    except KeyError as exc:
-        if workbook:
-            workbook.close()
-        raise RuntimeError(f"Worksheet '{target_sheet}' not found in workbook V2") from exc
+    if sheet_rows is None:
+        raise RuntimeError(
+            f"Worksheet '{target_sheet}' not found in V2 file. Available sheets: {', '.join(available_sheets)}"
+        )
 
     try:
         # 헤더에서 주차 정보 추출
-        WEEK1, WEEK2 = _find_week_numbers(sheet)
+        week1, week2 = _find_week_numbers(sheet_rows)
         
         # 주차 정보에 따라 동적으로 컬럼 생성
-        VALUE_COLUMNS = _build_value_columns(WEEK1, WEEK2, "C", "D")
-        DETAIL_VALUE_COLUMNS = _build_value_columns(WEEK1, WEEK2, "P", "Q")
+        value_columns = _build_value_columns(week1, week2, "C", "D")
+        detail_value_columns = _build_value_columns(week1, week2, "P", "Q")
         
         data = {}
-        for name, config in BLOCK_LAYOUT:
+        for name, block_config in _prepare_blocks(value_columns, detail_value_columns, with_cumulative=True):
             try:
-                current_config = config.copy()
-                if config.get("use_detail_columns"):
-                    current_config["value_columns"] = DETAIL_VALUE_COLUMNS
-                elif "value_columns" not in current_config:
-                    current_config["value_columns"] = VALUE_COLUMNS
-                
-                extracted = _extract_block(sheet, current_config)
-                
-                # 국가별/아이템별에 누적값 추가 (F열=누적 목표, G열=누적 실제)
-                # 차주 데이터도 추가 (M열=차주 목표, N열=차주 실적)
-                # 최적화: 배치 읽기로 성능 향상
-                if name in ["nations", "items"]:
-                    label_col = config.get("label_col", "B")
-                    label_key = config.get("label_key", "label")
-                    rows = config.get("rows", [])
-                    
-                    if not rows:
-                        continue
-                    
-                    # 배치 읽기: B, F, G, M, N 열을 한 번에 읽기
-                    min_row = min(rows)
-                    max_row = max(rows)
-                    cols_to_read = [label_col, "F", "G", "M", "N"]
-                    col_nums = {col: _col_letter_to_num(col) for col in cols_to_read}
-                    min_col = min(col_nums.values())
-                    max_col = max(col_nums.values())
-                    
-                    # 배치 읽기로 행 데이터 매핑 생성
-                    row_data_map = {}
-                    for row_idx, row_values in enumerate(sheet.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True), start=min_row):
-                        if row_idx not in rows:
-                            continue
-                        try:
-                            label_idx = col_nums[label_col] - min_col
-                            f_idx = col_nums["F"] - min_col
-                            g_idx = col_nums["G"] - min_col
-                            m_idx = col_nums["M"] - min_col
-                            n_idx = col_nums["N"] - min_col
-                            
-                            label_val = row_values[label_idx] if label_idx < len(row_values) else None
-                            if label_val:
-                                label_str = str(label_val).strip()
-                                row_data_map[label_str] = {
-                                    "target_cumulative": float(row_values[f_idx]) if f_idx < len(row_values) and isinstance(row_values[f_idx], (int, float)) else 0,
-                                    "actual_cumulative": float(row_values[g_idx]) if g_idx < len(row_values) and isinstance(row_values[g_idx], (int, float)) else 0,
-                                    "target_next": float(row_values[m_idx]) if m_idx < len(row_values) and isinstance(row_values[m_idx], (int, float)) else 0,
-                                    "actual_next": float(row_values[n_idx]) if n_idx < len(row_values) and isinstance(row_values[n_idx], (int, float)) else 0,
-                                }
-                        except Exception:
-                            continue
-                    
-                    # 추출된 데이터에 누적값 추가
-                    for row_data in extracted:
-                        label = str(row_data.get(label_key, "")).strip()
-                        if label in row_data_map:
-                            row_data.update(row_data_map[label])
-                        else:
-                            # 기본값 설정
-                            row_data["target_cumulative"] = 0
-                            row_data["actual_cumulative"] = 0
-                            row_data["target_next"] = 0
-                            row_data["actual_next"] = 0
-                
-                # 세부 복종별: S열을 직접 읽어서 모든 항목을 순서대로 추출 (최적화: 배치 읽기)
+                # 세부 복종별: S열을 직접 읽어서 모든 항목을 순서대로 추출 (블록 설정은 사용하지 않음)
                 if name == "sub_categories":
-                    sub_categories_data = []
                     start_row = 5
                     end_row = 150
                     seen_indices = set()
                     
-                    # 배치 읽기: S, O, W, X, AD, AE 열을 한 번에 읽기
-                    cols_to_read = ["S", "O", "W", "X", "AD", "AE"]
-                    col_nums = {col: _col_letter_to_num(col) for col in cols_to_read}
-                    min_col = min(col_nums.values())
-                    max_col = max(col_nums.values())
+                    # 행 데이터에서 S, O, W, X, AD, AE 열을 바로 읽기 (열 인덱스는 모듈 상수)
+                    s_idx, o_idx, w_idx, x_idx, ad_idx, ae_idx = SUB_CATEGORY_COL_IDX_V2
                     
-                    # iter_rows로 배치 읽기
-                    for row_idx, row_values in enumerate(sheet.iter_rows(min_row=start_row, max_row=end_row, min_col=min_col, max_col=max_col, values_only=True), start=start_row):
-                        try:
-                            # S열 인덱스 (상대 위치 계산)
-                            s_idx = col_nums["S"] - min_col
-                            s_val = row_values[s_idx] if s_idx < len(row_values) else None
-                            
-                            if s_val is None:
-                                continue
-                            
-                            # 인덱스 값 처리
-                            if isinstance(s_val, str):
-                                index_val = s_val.strip()
-                            elif isinstance(s_val, (int, float)):
-                                index_val = str(int(s_val)) if s_val == int(s_val) else str(s_val)
-                            else:
-                                index_val = str(s_val).strip()
-                            
-                            if not index_val or index_val.lower() == "none" or index_val in seen_indices:
-                                continue
-                            
-                            seen_indices.add(index_val)
-                            
-                            # 다른 열 값 읽기 (상대 위치)
-                            o_idx = col_nums["O"] - min_col
-                            w_idx = col_nums["W"] - min_col
-                            x_idx = col_nums["X"] - min_col
-                            ad_idx = col_nums["AD"] - min_col
-                            ae_idx = col_nums["AE"] - min_col
-                            
-                            o_val = row_values[o_idx] if o_idx < len(row_values) else None
-                            w_val = row_values[w_idx] if w_idx < len(row_values) else None
-                            x_val = row_values[x_idx] if x_idx < len(row_values) else None
-                            ad_val = row_values[ad_idx] if ad_idx < len(row_values) else None
-                            ae_val = row_values[ae_idx] if ae_idx < len(row_values) else None
-                            
-                            sub_categories_data.append({
-                                "index": index_val,
-                                "subcategory": str(o_val).strip() if o_val else "",
-                                "target_cumulative": float(w_val) if isinstance(w_val, (int, float)) else 0,
-                                "actual_cumulative": float(x_val) if isinstance(x_val, (int, float)) else 0,
-                                "target_next": float(ad_val) if isinstance(ad_val, (int, float)) else 0,
-                                "actual_next": float(ae_val) if isinstance(ae_val, (int, float)) else 0,
-                            })
-                        except Exception:
+                    # 1단계: S열(인덱스)이 유효한 행만 고르기
+                    index_values = []
+                    selected_rows = []
+                    # S열이 비어 있는 마지막 구간은 건너뛰기
+                    end_row = _last_filled_row(sheet_rows, s_idx, start_row, end_row)
+                    for row_values in sheet_rows[start_row - 1:end_row]:
+                        # 인덱스 값 처리
+                        index_val = _index_text(row_values[s_idx])
+                        if not index_val or index_val.lower() == "none" or index_val in seen_indices:
                             continue
+                        
+                        seen_indices.add(index_val)
+                        index_values.append(index_val)
+                        selected_rows.append(row_values)
+                    
+                    # 2단계: 모든 열을 열 단위(리스트)로 한 번에 변환한 뒤, 마지막에 zip으로 한 번만 행 단위로 묶기
+                    sub_categories_data = [
+                        {
+                            "index": index_val,
+                            "subcategory": subcategory,
+                            "target_cumulative": w_num,
+                            "actual_cumulative": x_num,
+                            "target_next": ad_num,
+                            "actual_next": ae_num,
+                        }
+                        for index_val, subcategory, w_num, x_num, ad_num, ae_num in zip(
+                            index_values,
+                            _text_column(selected_rows, o_idx),
+                            _numeric_column(selected_rows, w_idx),
+                            _numeric_column(selected_rows, x_idx),
+                            _numeric_column(selected_rows, ad_idx),
+                            _numeric_column(selected_rows, ae_idx),
+                        )
+                    ]
                     
                     data[name] = sub_categories_data
                 else:
-                    data[name] = extracted
+                    data[name] = _extract_block(sheet_rows, block_config)
             except Exception as e:
                 data[name] = []
         
-        # V2 특화: 금주 및 차주 summary_cells 값 추출 (배치 읽기로 최적화)
+        # V2 특화: 금주 및 차주 summary_cells 값 추출 (18행을 바로 읽기)
         summary_cells = {}
         try:
-            # 18행의 D~P 열을 한 번에 읽기
-            row_values = list(sheet.iter_rows(min_row=18, max_row=18, min_col=4, max_col=16, values_only=True))[0]
-            cell_mapping = {
-                "D18": 0, "E18": 1, "F18": 2, "G18": 3,
-                "K18": 7, "L18": 8, "M18": 9, "N18": 10, "O18": 11, "P18": 12
-            }
-            
-            for cell_name, idx in cell_mapping.items():
-                val = row_values[idx] if idx < len(row_values) else None
-                summary_cells[cell_name] = float(val) if val is not None and isinstance(val, (int, float)) else 0
+            row_values = sheet_rows[SUMMARY_ROW_V2 - 1]
+            summary_cells = dict(zip(SUMMARY_CELLS_V2, _numeric_values(_SUMMARY_CELLS_V2_GETTER(row_values))))
             
         except Exception as e:
-            summary_cells = {
-                "D18": 0, "E18": 0, "F18": 0, "G18": 0,
-                "K18": 0, "L18": 0, "M18": 0, "N18": 0, "O18": 0, "P18": 0
-            }
+            summary_cells = dict.fromkeys(SUMMARY_CELLS_V2, 0)
         
         # V2 특화: 협력사 데이터 추출 (AK열=항목명, AO열=누적 목표, AP열=누적 실제)
         # 협력사 데이터는 여러 행에 있을 수 있으므로 행을 순회
         suppliers_data = []
         try:
             # 협력사 데이터가 있는 행 범위 확인 (보통 18행 근처, 더 넓은 범위로 확장)
-            # 최적화: 배치 읽기로 변경 (AK, AO, AP, AV, AW 열)
-            cols_to_read = ["AK", "AO", "AP", "AV", "AW"]
-            col_nums = {col: _col_letter_to_num(col) for col in cols_to_read}
-            min_col = min(col_nums.values())
-            max_col = max(col_nums.values())
+            # 행 데이터에서 AK, AO, AP, AV, AW 열을 바로 읽기
+            ak_idx, ao_idx, ap_idx, av_idx, aw_idx = SUPPLIER_COL_IDX_V2
             
-            for row_idx, row_values in enumerate(sheet.iter_rows(min_row=5, max_row=50, min_col=min_col, max_col=max_col, values_only=True), start=5):
-                try:
-                    # AK열 값 (상대 위치)
-                    ak_idx = col_nums["AK"] - min_col
-                    ak_val = row_values[ak_idx] if ak_idx < len(row_values) else None
-                    
-                    if ak_val is None:
-                        continue
-                    
-                    # 인덱스 값 처리
-                    if isinstance(ak_val, (int, float)):
-                        index_val = str(int(ak_val)) if ak_val == int(ak_val) else str(ak_val)
-                    else:
-                        index_val = str(ak_val).strip() if ak_val else ""
-                    
-                    if not index_val or index_val.lower() == "none":
-                        continue
-                    
-                    # 14행 특수 처리
-                    if row_idx == 14 and ("(주)노브랜드" in index_val or "노브랜드" in index_val):
-                        index_val = "(주)노브랜드_WOVEN"
-                    
-                    # 다른 열 값 읽기 (상대 위치)
-                    ao_idx = col_nums["AO"] - min_col
-                    ap_idx = col_nums["AP"] - min_col
-                    av_idx = col_nums["AV"] - min_col
-                    aw_idx = col_nums["AW"] - min_col
-                    
-                    ao_val = row_values[ao_idx] if ao_idx < len(row_values) else None
-                    ap_val = row_values[ap_idx] if ap_idx < len(row_values) else None
-                    av_val = row_values[av_idx] if av_idx < len(row_values) else None
-                    aw_val = row_values[aw_idx] if aw_idx < len(row_values) else None
-                    
-                    suppliers_data.append({
-                        "name": index_val,
-                        "index": index_val,
-                        "target_cumulative": float(ao_val) if isinstance(ao_val, (int, float)) else 0,
-                        "actual_cumulative": float(ap_val) if isinstance(ap_val, (int, float)) else 0,
-                        "target_next": float(av_val) if isinstance(av_val, (int, float)) else 0,
-                        "actual_next": float(aw_val) if isinstance(aw_val, (int, float)) else 0,
-                        "value": float(ap_val) if isinstance(ap_val, (int, float)) else 0
-                    })
-                except Exception:
-                    continue
-            
-            # 중복 제거 및 정리 (주)노브랜드 처리 포함
+            # 1단계: AK열(항목명)이 유효한 행만 고르기 (항목명 기준 중복은 첫 행만 사용)
             seen = set()
-            unique_suppliers = []
-            노브랜드_count = 0
-            for supplier in suppliers_data:
-                supplier_name = supplier["name"]
-                supplier_index = supplier["index"]
-                
-                # (주)노브랜드 중복 처리
-                # 이미 14행은 WOVEN으로 처리되었으므로, 나머지 (주)노브랜드만 카운트
-                if "(주)노브랜드" in str(supplier_index) or "(주)노브랜드" in supplier_name:
-                    if "(주)노브랜드_WOVEN" not in str(supplier_index) and "(주)노브랜드_WOVEN" not in supplier_name:
-                        노브랜드_count += 1
-                        # 첫 번째 (주)노브랜드는 그대로, 두 번째부터는 WOVEN으로 변경
-                        # 하지만 14행은 이미 WOVEN으로 처리되었으므로 추가 처리 불필요
+            index_values = []
+            selected_rows = []
+            # AK열이 비어 있는 마지막 구간은 건너뛰기
+            last_row = _last_filled_row(sheet_rows, ak_idx, 5, 50)
+            for row_idx, row_values in enumerate(sheet_rows[5 - 1:last_row], start=5):
+                # 인덱스 값 처리
+                index_val = _index_text(row_values[ak_idx])
+                if not index_val or index_val.lower() == "none":
+                    continue
                 
-                # index를 기준으로 중복 체크
-                index_key = str(supplier_index) if supplier_index else supplier_name
-                if index_key not in seen:
-                    seen.add(index_key)
-                    unique_suppliers.append(supplier)
-            suppliers_data = unique_suppliers
+                # 14행 특수 처리 ("(주)노브랜드"도 "노브랜드"를 포함하므로 한 번만 검사)
+                if row_idx == 14 and "노브랜드" in index_val:
+                    index_val = "(주)노브랜드_WOVEN"
                 
+                if index_val in seen:
+                    continue
+                seen.add(index_val)
+                index_values.append(index_val)
+                selected_rows.append(row_values)
+            
+            # 2단계: 모든 열을 열 단위(리스트)로 한 번에 변환한 뒤, 마지막에 zip으로 한 번만 행 단위로 묶기
+            suppliers_data = [
+                {
+                    "name": index_val,
+                    "index": index_val,
+                    "target_cumulative": ao_num,
+                    "actual_cumulative": ap_num,
+                    "target_next": av_num,
+                    "actual_next": aw_num,
+                    "value": ap_num
+                }
+                for index_val, ao_num, ap_num, av_num, aw_num in zip(
+                    index_values,
+                    _numeric_column(selected_rows, ao_idx),
+                    _numeric_column(selected_rows, ap_idx),
+                    _numeric_column(selected_rows, av_idx),
+                    _numeric_column(selected_rows, aw_idx),
+                )
+            ]
         except Exception as e:
             suppliers_data = []
         
         result = {
             **data,
             "week_info": {
-                "current_week": WEEK1,
-                "next_week": WEEK2,
+                "current_week": week1,
+                "next_week": week2,
             },
             "sheet_name": target_sheet,
             "summary_cells": summary_cells,  # E18, F18, G18
             "suppliers": suppliers_data,  # 협력사 데이터
         }
         
-        # 최종 데이터 유효성 검사
-        print(f"DEBUG: 최종 데이터 요약:")
-        print(f"  - nations: {len(result.get('nations', []))}개")
-        print(f"  - items: {len(result.get('items', []))}개")
-        print(f"  - sub_categories: {len(result.get('sub_categories', []))}개")
-        print(f"  - suppliers: {len(result.get('suppliers', []))}개")
-        print(f"  - summary_cells 샘플: D18={summary_cells.get('D18')}, F18={summary_cells.get('F18')}, G18={summary_cells.get('G18')}")
+        # 최종 데이터 요약 (디버그 레벨일 때만 문자열을 만듦)
+        logger.debug(
+            "최종 데이터 요약: nations=%d items=%d sub_categories=%d suppliers=%d D18=%s F18=%s G18=%s",
+            len(result.get("nations", [])),
+            len(result.get("items", [])),
+            len(result.get("sub_categories", [])),
+            len(result.get("suppliers", [])),
+            summary_cells.get("D18"),
+            summary_cells.get("F18"),
+            summary_cells.get("G18"),
+        )
         
         return result
     except Exception as e:
         error_msg = f"Unexpected error in load_summary_v2: {str(e)}"
         raise RuntimeError(error_msg) from e
-    finally:
-        if workbook:
-            try:
-                workbook.close()
-            except Exception:
-                pass
+
+
+# 헬스 체크 응답 본문 (요청마다 dict 생성/JSON 직렬화 없이 그대로 전송)
+_HEALTH_BODY = b'{"status":"ok"}'
 
 
 @app.get("/health")
-def healthcheck() -> Dict[str, str]:
-    return {"status": "ok"}
+def healthcheck() -> Response:
+    # Response 객체는 미들웨어가 헤더를 덧붙일 수 있어 공유하지 않고 요청마다 새로 만듦
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/api/v2/auth/verify")
@@ -1125,11 +1475,11 @@ def get_cache_status(_: bool = Depends(verify_password)) -> Dict[str, Any]:
     """캐시 상태 정보를 반환합니다."""
     # V2 캐시 정보 반환 (성능 향상을 위해 파일 stat() 호출 제거)
     return {
-        "cache_timestamp": _cache_timestamp_v2.isoformat() if _cache_timestamp_v2 else None,
-        "cache_age_seconds": (datetime.now() - _cache_timestamp_v2).total_seconds() if _cache_timestamp_v2 else None,
+        "cache_timestamp": _cache_timestamp_v2_iso,
+        "cache_age_seconds": time.monotonic() - _cache_monotonic_v2 if _cache_monotonic_v2 is not None else None,
         "cache_ttl_seconds": CACHE_TTL_SECONDS,
         "has_cache": _data_cache_v2 is not None,
-        "file_exists": FILE_PATH_V2.exists() if FILE_PATH_V2 else False,
+        "file_exists": _stat_memo(FILE_PATH_V2) is not None if FILE_PATH_V2 else False,
     }
 
 
@@ -1139,9 +1489,8 @@ def list_sheets() -> Dict[str, Any]:
     try:
         excel_path = ensure_excel_file()
         
-        workbook = openpyxl.load_workbook(excel_path, read_only=True, keep_vba=False)
-        sheets = workbook.sheetnames
-        workbook.close()
+        # 요약 데이터 로드와 같은 (경로, 수정 시간) 기준 캐시를 사용하므로 파일이 그대로면 워크북을 다시 열지 않음
+        sheets, _ = _read_sheet_rows(excel_path, SHEET_NAME)
         
         return {
             "file_path": str(excel_path),
@@ -1159,145 +1508,69 @@ def list_sheets() -> Dict[str, Any]:
         }
 
 
-@app.get("/api/quantity")
-def get_quantity_summary(_: bool = Depends(verify_password)) -> Response:
-    """V1 API - V2로 리다이렉트"""
-    # V2 엔드포인트로 리다이렉트
-    return get_quantity_summary_v2(_)
-
-
-@app.get("/api/v2/quantity")
-def get_quantity_summary_v2(request: Request, _: bool = Depends(verify_password)) -> Response:
-    """V2 수량 기준 데이터를 주차 정보와 함께 반환합니다. (캐시 사용)"""
+async def _serve_summary_v2(request: Request, sheet_name: str, endpoint: str) -> Response:
+    """V2 요약 데이터 엔드포인트 공통 처리 (수량 기준/스타일수 기준, V1 별칭 포함). 에러는 HTTP 에러로 변환합니다.
+    요청 처리 중에는 OneDrive 동기화를 하지 않습니다 (파일 다운로드는 warm-up/매일 업데이트/새로고침에서만)."""
+    data = _get_fresh_cache_v2(sheet_name)
+    if data is None and _data_cache_v2 is None and _warming_up.is_set():
+        # 서버 시작 직후 warm-up(다운로드/파싱)이 아직 끝나지 않았으면 기다리게 하지 않고 재시도 안내
+        raise HTTPException(
+            status_code=503,
+            detail="서버 캐시를 준비 중입니다. 잠시 후 다시 시도하세요.",
+            headers={"Retry-After": "5"},
+        )
+    
     try:
-        data = get_cached_data_v2("수량 기준")
-        
-        # 캐시 타임스탬프 추가 (V2 버전) - 파일 수정 시간 체크 제거로 성능 향상
-        cache_timestamp = _cache_timestamp_v2.isoformat() if _cache_timestamp_v2 else None
+        # 캐시 히트는 이벤트 루프에서 바로 응답하고, 미스(파일 변경 등)일 때만 로컬 파일 파싱을 스레드 풀에서 실행
+        if data is None:
+            data = await run_in_threadpool(get_cached_data_v2, sheet_name, allow_sync=False)
         
-        # 캐시 헤더 추가 (5분 캐시, ETag 기반)
-        cache_timestamp_str = cache_timestamp or ""
-        # ETag 생성 최적화: week_info만 사용하여 해시 계산
-        week_info_str = json.dumps(data.get("week_info", {}), sort_keys=True, ensure_ascii=False)
-        etag = f'"{hash(week_info_str + cache_timestamp_str)}"'
-        
-        # If-None-Match 헤더 확인 (조건부 요청 지원)
-        if_none_match = request.headers.get("If-None-Match", "").strip('"')
-        if if_none_match and if_none_match == etag.strip('"'):
-            # 데이터가 변경되지 않았으면 304 Not Modified 반환 (매우 빠름)
-            return Response(
-                status_code=304,
-                headers={
-                    "ETag": etag,
-                    "Cache-Control": f"public, max-age={CACHE_TTL_SECONDS}, stale-while-revalidate=60",
-                }
-            )
-        
-        headers = {
-            "Cache-Control": f"public, max-age={CACHE_TTL_SECONDS}, stale-while-revalidate=60",
-            "ETag": etag,
-            "X-Cache-Timestamp": cache_timestamp_str,
-        }
-        # JSON 직렬화 최적화 (separators로 공백 제거하여 크기 감소)
-        return Response(
-            content=json.dumps(data, ensure_ascii=False, separators=(',', ':')),
-            media_type="application/json",
-            headers=headers
-        )
+        return _summary_response_v2(request, sheet_name, data)
     except FileNotFoundError as fnf_exc:
         # V2 파일이 없는 경우 명확한 에러 메시지
         error_detail = f"V2 Excel file not found. Please check Render environment variables (ONEDRIVE_SHARE_LINK_V2) and logs."
-        print(f"ERROR: FileNotFoundError in /api/v2/quantity: {fnf_exc}")
-        import traceback
-        print("Full traceback:")
-        traceback.print_exc()
+        logger.exception("FileNotFoundError in %s: %s", endpoint, fnf_exc)
         raise HTTPException(status_code=404, detail=error_detail) from fnf_exc
     except ValueError as ve:
         # 데이터 유효성 검사 실패
         error_detail = f"Data validation failed: {str(ve)}"
-        print(f"ERROR: ValueError in /api/v2/quantity: {ve}")
-        import traceback
-        print("Full traceback:")
-        traceback.print_exc()
+        logger.exception("ValueError in %s: %s", endpoint, ve)
         raise HTTPException(status_code=500, detail=error_detail) from ve
     except RuntimeError as re:
         # V2 데이터 로드 실패
         error_detail = f"Failed to load V2 data: {str(re)}"
-        print(f"ERROR: RuntimeError in /api/v2/quantity: {re}")
-        import traceback
-        print("Full traceback:")
-        traceback.print_exc()
+        logger.exception("RuntimeError in %s: %s", endpoint, re)
         raise HTTPException(status_code=500, detail=error_detail) from re
     except Exception as exc:
         error_detail = f"Unexpected error: {str(exc)}"
-        print(f"ERROR: Unexpected error in /api/v2/quantity: {error_detail}")
-        print(f"Error type: {type(exc).__name__}")
-        import traceback
-        print("Full traceback:")
-        traceback.print_exc()
+        logger.exception("Unexpected error in %s (%s): %s", endpoint, type(exc).__name__, error_detail)
         raise HTTPException(status_code=500, detail=error_detail) from exc
 
 
+@app.get("/api/quantity")
+async def get_quantity_summary(request: Request, _: bool = Depends(verify_password)) -> Response:
+    """V1 API - V2로 리다이렉트"""
+    # V2 엔드포인트로 리다이렉트
+    return await _serve_summary_v2(request, "수량 기준", "/api/v2/quantity")
+
+
+@app.get("/api/v2/quantity")
+async def get_quantity_summary_v2(request: Request, _: bool = Depends(verify_password)) -> Response:
+    """V2 수량 기준 데이터를 주차 정보와 함께 반환합니다. (캐시 사용)"""
+    return await _serve_summary_v2(request, "수량 기준", "/api/v2/quantity")
+
+
 @app.get("/api/style-count")
-def get_style_count_summary(_: bool = Depends(verify_password)) -> Response:
+async def get_style_count_summary(request: Request, _: bool = Depends(verify_password)) -> Response:
     """V1 API - V2로 리다이렉트"""
     # V2 엔드포인트로 리다이렉트
-    return get_style_count_summary_v2(_)
+    return await _serve_summary_v2(request, "스타일수 기준", "/api/v2/style-count")
 
 
 @app.get("/api/v2/style-count")
-def get_style_count_summary_v2(request: Request, _: bool = Depends(verify_password)) -> Response:
+async def get_style_count_summary_v2(request: Request, _: bool = Depends(verify_password)) -> Response:
     """V2 스타일수 기준 데이터를 주차 정보와 함께 반환합니다. (캐시 사용)"""
-    try:
-        data = get_cached_data_v2("스타일수 기준")
-        
-        # 캐시 타임스탬프 추가 (V2 버전) - 파일 수정 시간 체크 제거로 성능 향상
-        cache_timestamp = _cache_timestamp_v2.isoformat() if _cache_timestamp_v2 else None
-        
-        # 캐시 헤더 추가 (5분 캐시, ETag 기반)
-        cache_timestamp_str = cache_timestamp or ""
-        # ETag 생성 최적화: week_info만 사용하여 해시 계산
-        week_info_str = json.dumps(data.get("week_info", {}), sort_keys=True, ensure_ascii=False)
-        etag = f'"{hash(week_info_str + cache_timestamp_str)}"'
-        
-        # If-None-Match 헤더 확인 (조건부 요청 지원)
-        if_none_match = request.headers.get("If-None-Match", "").strip('"')
-        if if_none_match and if_none_match == etag.strip('"'):
-            # 데이터가 변경되지 않았으면 304 Not Modified 반환 (매우 빠름)
-            return Response(
-                status_code=304,
-                headers={
-                    "ETag": etag,
-                    "Cache-Control": f"public, max-age={CACHE_TTL_SECONDS}, stale-while-revalidate=60",
-                }
-            )
-        
-        headers = {
-            "Cache-Control": f"public, max-age={CACHE_TTL_SECONDS}, stale-while-revalidate=60",
-            "ETag": etag,
-            "X-Cache-Timestamp": cache_timestamp_str,
-        }
-        # JSON 직렬화 최적화 (separators로 공백 제거하여 크기 감소)
-        return Response(
-            content=json.dumps(data, ensure_ascii=False, separators=(',', ':')),
-            media_type="application/json",
-            headers=headers
-        )
-    except FileNotFoundError as fnf_exc:
-        # V2 파일이 없는 경우 명확한 에러 메시지
-        error_detail = f"V2 Excel file not found. Please check Render environment variables (ONEDRIVE_SHARE_LINK_V2) and logs."
-        print(f"FileNotFoundError in /api/v2/style-count: {fnf_exc}")
-        print(traceback.format_exc())
-        raise HTTPException(status_code=404, detail=error_detail) from fnf_exc
-    except Exception as exc:
-        error_detail = f"Unexpected error: {str(exc)}"
-        print(f"Unexpected error in /api/v2/style-count: {error_detail}")
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=error_detail) from exc
-        error_detail = f"Unexpected error: {str(exc)}"
-        print(f"Unexpected error in /api/v2/style-count: {error_detail}")
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=error_detail) from exc
+    return await _serve_summary_v2(request, "스타일수 기준", "/api/v2/style-count")
 
 
 @app.post("/api/refresh")
@@ -1309,15 +1582,23 @@ def refresh_cache(_: bool = Depends(verify_password)) -> Dict[str, Any]:
 @app.post("/api/v2/refresh")
 def refresh_cache_v2(_: bool = Depends(verify_password)) -> Dict[str, Any]:
     """V2 캐시를 강제로 업데이트합니다. OneDrive에서 최신 파일을 가져와서 캐시를 갱신합니다."""
-    global _data_cache_v2, _cache_timestamp_v2, _cache_file_mtime_v2, _cached_file_path_v2
+    global _data_cache_v2, _cache_timestamp_v2, _cache_file_mtime_v2, _cache_fingerprint_v2, _cached_file_path_v2
+    global _cache_timestamp_v2_iso, _cache_monotonic_v2, _quantity_cache_v2, _style_cache_v2
     
     try:
         # V2 캐시 강제 초기화 및 재로드
         _data_cache_v2 = None
+        _quantity_cache_v2 = None
+        _style_cache_v2 = None
         _cache_timestamp_v2 = None
+        _cache_timestamp_v2_iso = None
+        _cache_monotonic_v2 = None
         _cache_file_mtime_v2 = None  # 파일 수정 시간 캐시도 초기화
+        _cache_fingerprint_v2 = None  # 파일 지문도 초기화
         _cached_file_path_v2 = None  # 파일 경로 캐시도 초기화
         _last_file_check_v2 = None  # 마지막 파일 체크 시간도 초기화
+        _response_cache_v2.clear()  # 직렬화된 응답 본문 캐시도 초기화
+        _stat_memo_cache.clear()  # 파일 stat 결과도 새로 확인
         
         # 강제 동기화
         if ONEDRIVE_SHARE_LINK_V2:
@@ -1330,7 +1611,7 @@ def refresh_cache_v2(_: bool = Depends(verify_password)) -> Dict[str, Any]:
         return {
             "status": "success",
             "message": "V2 캐시가 성공적으로 업데이트되었습니다.",
-            "timestamp": _cache_timestamp_v2.isoformat() if _cache_timestamp_v2 else None
+            "timestamp": _cache_timestamp_v2_iso
         }
     except Exception as exc:
         error_detail = f"V2 캐시 업데이트 실패: {str(exc)}"
@@ -1339,33 +1620,61 @@ def refresh_cache_v2(_: bool = Depends(verify_password)) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=error_detail) from exc
 
 
+def _is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """조건부 요청 헤더(If-None-Match 우선, 없으면 If-Modified-Since)로 클라이언트 사본이 최신인지 확인합니다."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _excel_download_response(request: Request, excel_path: Path, fallback_filename: str) -> Response:
+    """엑셀 파일 다운로드 응답을 만듭니다. 파일이 바뀌지 않았으면 본문 없이 304를 반환합니다."""
+    # stat 결과를 FileResponse에 넘겨 응답 시 다시 stat 하지 않음 (ETag/Last-Modified/Content-Length도 여기서 계산)
+    stat_result = _stat_memo(excel_path)
+    if stat_result is None:
+        raise FileNotFoundError(f"Excel file not found at {excel_path}")
+    
+    # 파일명 인코딩 처리 (한글 및 특수문자 파일명 지원)
+    filename = excel_path.name
+    # RFC 5987 형식으로 인코딩 (UTF-8)
+    filename_encoded = quote(filename, safe='')
+    # ASCII 호환 파일명 (fallback)
+    filename_ascii = filename.encode('ascii', 'ignore').decode('ascii') or fallback_filename
+    
+    # Content-Disposition 헤더를 RFC 5987 형식으로 설정
+    content_disposition = f"attachment; filename=\"{filename_ascii}\"; filename*=UTF-8''{filename_encoded}"
+    
+    response = FileResponse(
+        path=str(excel_path),
+        filename=filename_ascii,  # ASCII 파일명 사용
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={
+            "Content-Disposition": content_disposition
+        },
+        stat_result=stat_result,
+    )
+    
+    # 같은 파일을 다시 받으려는 요청이면 파일을 보내지 않고 304 반환
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+    if _is_not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers={"ETag": etag, "Last-Modified": last_modified})
+    return response
+
+
 @app.get("/api/export/excel")
-def export_excel(_: bool = Depends(verify_password)) -> FileResponse:
+def export_excel(request: Request, _: bool = Depends(verify_password)) -> Response:
     """SUMMARY 엑셀 파일을 다운로드합니다."""
     try:
-        excel_path = ensure_excel_file()
-        
-        if not excel_path.exists():
-            raise HTTPException(status_code=404, detail="엑셀 파일을 찾을 수 없습니다.")
-        
-        # 파일명 인코딩 처리 (한글 및 특수문자 파일명 지원)
-        filename = excel_path.name
-        # RFC 5987 형식으로 인코딩 (UTF-8)
-        filename_encoded = quote(filename, safe='')
-        # ASCII 호환 파일명 (fallback)
-        filename_ascii = filename.encode('ascii', 'ignore').decode('ascii') or "26SS_MLB_DASHBOARD.xlsx"
-        
-        # Content-Disposition 헤더를 RFC 5987 형식으로 설정
-        content_disposition = f"attachment; filename=\"{filename_ascii}\"; filename*=UTF-8''{filename_encoded}"
-        
-        return FileResponse(
-            path=str(excel_path),
-            filename=filename_ascii,  # ASCII 파일명 사용
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": content_disposition
-            }
-        )
+        excel_path = ensure_excel_file(allow_sync=False)
+        return _excel_download_response(request, excel_path, "26SS_MLB_DASHBOARD.xlsx")
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=f"엑셀 파일을 찾을 수 없습니다: {str(exc)}")
     except Exception as exc:
@@ -1376,32 +1685,11 @@ def export_excel(_: bool = Depends(verify_password)) -> FileResponse:
 
 
 @app.get("/api/v2/export/excel")
-def export_excel_v2(_: bool = Depends(verify_password)) -> FileResponse:
+def export_excel_v2(request: Request, _: bool = Depends(verify_password)) -> Response:
     """V2 SUMMARY 엑셀 파일을 다운로드합니다."""
     try:
-        excel_path = ensure_excel_file_v2()
-        
-        if not excel_path.exists():
-            raise HTTPException(status_code=404, detail="V2 엑셀 파일을 찾을 수 없습니다.")
-        
-        # 파일명 인코딩 처리 (한글 및 특수문자 파일명 지원)
-        filename = excel_path.name
-        # RFC 5987 형식으로 인코딩 (UTF-8)
-        filename_encoded = quote(filename, safe='')
-        # ASCII 호환 파일명 (fallback)
-        filename_ascii = filename.encode('ascii', 'ignore').decode('ascii') or "26SS_MLB_DASHBOARD_V2.xlsx"
-        
-        # Content-Disposition 헤더를 RFC 5987 형식으로 설정
-        content_disposition = f"attachment; filename=\"{filename_ascii}\"; filename*=UTF-8''{filename_encoded}"
-        
-        return FileResponse(
-            path=str(excel_path),
-            filename=filename_ascii,  # ASCII 파일명 사용
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": content_disposition
-            }
-        )
+        excel_path = ensure_excel_file_v2(allow_sync=False)
+        return _excel_download_response(request, excel_path, "26SS_MLB_DASHBOARD_V2.xlsx")
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=f"V2 엑셀 파일을 찾을 수 없습니다: {str(exc)}")
     except Exception as exc:
@@ -1411,16 +1699,33 @@ def export_excel_v2(_: bool = Depends(verify_password)) -> FileResponse:
         raise HTTPException(status_code=500, detail=error_detail) from exc
 
 
-@app.on_event("startup")
-async def startup_event():
-    """서버 시작 시 초기 캐시 업데이트 및 백그라운드 스레드 시작"""
-    # 비밀번호 설정 확인 (디버깅용)
-    password_set = os.getenv("DASHBOARD_PASSWORD")
-    if password_set:
-        print(f"[서버 시작] 환경 변수에서 비밀번호를 사용합니다. (길이: {len(password_set)})")
-    else:
-        print(f"[서버 시작] 기본 비밀번호 사용: MLB123")
-    
+# 서버 시작 warm-up 진행 중 표시 (진행 중에 캐시가 비어 있으면 요청은 503 + Retry-After)
+_warming_up = threading.Event()
+
+
+def _warm_up_caches() -> None:
+    """V2 파일을 확인하고 V1/V2 캐시를 미리 채웁니다 (서버 시작 시 백그라운드 스레드에서 실행).
+    파일 다운로드/파싱은 여기서만 하고, 진행 중에 캐시가 없는 요청은 기다리지 않고 503을 받습니다."""
+    try:
+        _warm_up_caches_once()
+    finally:
+        _warming_up.clear()
+
+
+def _warm_up_caches_once() -> None:
+    """_warm_up_caches의 실제 작업 (V2 파일 확인/동기화, V1/V2 캐시 로드).
+    V1 캐시(OneDrive 다운로드 + 로드)는 별도 스레드에서 함께 진행해, 요청이 쓰는 V2 캐시가
+    V1 작업을 기다리지 않고 준비되고 두 파일의 다운로드(네트워크 대기)도 겹쳐서 진행됩니다."""
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-warm-up-v1") as executor:
+        # 초기 캐시 업데이트 (캐시가 없으면). update_cache는 에러를 스스로 로그로 남기고 기존 캐시를 유지
+        v1_future = executor.submit(update_cache) if _data_cache is None else None
+        _warm_up_cache_v2()
+        if v1_future is not None:
+            v1_future.result()
+
+
+def _warm_up_cache_v2() -> None:
+    """V2 파일을 확인/동기화하고 V2 캐시를 미리 로드합니다."""
     # V2 파일 확인 (서버 시작 시점에 체크, 없어도 서버는 시작)
     try:
         if ONEDRIVE_SHARE_LINK_V2:
@@ -1429,86 +1734,106 @@ async def startup_event():
             print(f"[서버 시작] V2 파일 확인 완료")
         else:
             print(f"[서버 시작] 경고: ONEDRIVE_SHARE_LINK_V2 환경 변수가 설정되지 않았습니다.")
-            if FILE_PATH_V2.exists():
+            if _stat_memo(FILE_PATH_V2) is not None:
                 print(f"[서버 시작] 로컬에 V2 파일이 있습니다: {FILE_PATH_V2}")
             else:
                 print(f"[서버 시작] 경고: V2 파일을 찾을 수 없습니다: {FILE_PATH_V2}")
     except Exception as e:
         print(f"[서버 시작] 경고: V2 파일을 확인할 수 없습니다 (서버는 계속 시작됩니다): {e}")
     
-    # 초기 캐시 업데이트 (캐시가 없으면)
-    if _data_cache is None:
-        update_cache()
-    
-    # V2 캐시 미리 로드 (서버 시작 시 동기적으로 로드하여 첫 요청 속도 개선)
+    # V2 캐시 미리 로드 (첫 요청 전에 캐시가 준비되도록)
     print(f"[서버 시작] V2 캐시 미리 로드 중...")
     try:
-        # 동기적으로 로드하여 첫 요청 전에 캐시가 준비되도록 보장
         # V2 파일이 있으면 캐시 미리 로드
-        if FILE_PATH_V2.exists() or (ONEDRIVE_SHARE_LINK_V2 and ensure_excel_file_v2()):
+        if _stat_memo(FILE_PATH_V2) is not None or (ONEDRIVE_SHARE_LINK_V2 and ensure_excel_file_v2()):
             print(f"[서버 시작] V2 캐시 warm-up 시작...")
             start_time = time.time()
             # 수량 기준과 스타일수 기준 모두 미리 로드
             get_cached_data_v2("수량 기준")
             get_cached_data_v2("스타일수 기준")
             elapsed = time.time() - start_time
-            print(f"[서버 시작] V2 캐시 warm-up 완료 ({elapsed:.2f}초) - 서버가 준비되었습니다.")
+            print(f"[서버 시작] V2 캐시 warm-up 완료 ({elapsed:.2f}초) - 캐시가 준비되었습니다.")
         else:
             print(f"[서버 시작] V2 파일이 없어 캐시 warm-up을 건너뜁니다.")
     except Exception as e:
         print(f"[서버 시작] V2 캐시 warm-up 실패 (첫 요청 시 로드됨): {e}")
-        import traceback
         traceback.print_exc()
+
+
+def _seconds_until_next_update(now: datetime) -> float:
+    """다음 업데이트 시각(오늘 또는 내일 오전 11시)까지 남은 초를 반환합니다."""
+    next_update = now.replace(hour=UPDATE_HOUR, minute=UPDATE_MINUTE, second=0, microsecond=0)
+    if now >= next_update:
+        next_update += timedelta(days=1)
+    return (next_update - now).total_seconds()
+
+
+def _run_daily_update() -> None:
+    """업데이트 시간이 되었으면 V2 캐시를 강제로 다시 로드합니다 (스레드 풀에서 실행)."""
+    global _updating_cache
     
-    # 백그라운드 스레드에서 매일 11시에 업데이트 체크 (엑셀 파일이 10시 30분~11시 사이에 업데이트됨)
-    def background_update_check():
-        """백그라운드에서 매일 11시에 업데이트를 수행합니다."""
-        global _updating_cache
-        
-        while True:
-            now = datetime.now()
-            
-            # 다음 업데이트 시간 계산 (오늘 오전 11시 또는 내일 오전 11시)
-            if now.hour < UPDATE_HOUR:
-                # 오늘 오전 11시까지 대기
-                next_update = now.replace(hour=UPDATE_HOUR, minute=UPDATE_MINUTE, second=0, microsecond=0)
-            else:
-                # 내일 오전 11시까지 대기
-                next_update = (now + timedelta(days=1)).replace(hour=UPDATE_HOUR, minute=UPDATE_MINUTE, second=0, microsecond=0)
-            
-            wait_seconds = (next_update - now).total_seconds()
-            
-            # 다음 업데이트 시간까지 대기 (최대 1시간씩 체크)
-            while wait_seconds > 0:
-                sleep_time = min(wait_seconds, 3600)  # 최대 1시간씩 체크
-                time.sleep(sleep_time)
-                wait_seconds -= sleep_time
-                
-                # 중간에 업데이트 시간이 되었는지 확인
-                now = datetime.now()
-                if now.hour >= UPDATE_HOUR and should_update_cache():
-                    break
-            
-            # 업데이트 시간이 되었는지 확인
-            try:
-                with _update_lock:
-                    if should_update_cache() and not _updating_cache:
-                        _updating_cache = True
-                        # V2 캐시 강제 업데이트
-                        try:
-                            if ONEDRIVE_SHARE_LINK_V2:
-                                ensure_excel_file_v2()
-                            # V2 데이터 재로드
-                            get_cached_data_v2("수량 기준")
-                            get_cached_data_v2("스타일수 기준")
-                            print(f"V2 cache updated at {datetime.now()}")
-                        except Exception as e:
-                            print(f"Error updating V2 cache: {e}")
-                        _updating_cache = False
-            except Exception:
+    try:
+        with _update_lock:
+            if should_update_cache() and not _updating_cache:
+                _updating_cache = True
+                # V2 캐시 강제 업데이트
+                try:
+                    if ONEDRIVE_SHARE_LINK_V2:
+                        ensure_excel_file_v2()
+                    # V2 데이터 재로드
+                    get_cached_data_v2("수량 기준")
+                    get_cached_data_v2("스타일수 기준")
+                    print(f"V2 cache updated at {datetime.now()}")
+                except Exception as e:
+                    print(f"Error updating V2 cache: {e}")
                 _updating_cache = False
-                pass  # 에러 발생해도 계속 실행
+    except Exception:
+        _updating_cache = False  # 에러 발생해도 다음 예약은 계속 진행
+
+
+async def _daily_update_loop() -> None:
+    """매일 오전 11시까지 한 번에 잠들었다가 깨어나 캐시를 업데이트합니다.
+    시간마다 깨어나는 폴링 없이 하루 한 번만 깨어나고, 파일 다운로드/파싱은 스레드 풀에서 실행해 이벤트 루프를 막지 않습니다."""
+    while True:
+        await asyncio.sleep(_seconds_until_next_update(datetime.now()))
+        await run_in_threadpool(_run_daily_update)
+
+
+# 매일 업데이트 태스크 참조 (가비지 컬렉션으로 태스크가 사라지지 않도록 보관)
+_daily_update_task: Optional[asyncio.Task] = None
+
+
+@app.on_event("startup")
+async def startup_event():
+    """서버 시작 시 초기 캐시 warm-up 스레드와 매일 업데이트 태스크 시작"""
+    # 비밀번호 설정 확인 (디버깅용)
+    password_set = os.getenv("DASHBOARD_PASSWORD")
+    if password_set:
+        print(f"[서버 시작] 환경 변수에서 비밀번호를 사용합니다. (길이: {len(password_set)})")
+    else:
+        print(f"[서버 시작] 기본 비밀번호 사용: MLB123")
+    
+    # V2 파일 확인 및 캐시 warm-up은 백그라운드 스레드에서 실행
+    # (OneDrive 다운로드/엑셀 파싱이 끝날 때까지 서버 시작(포트 바인딩)을 막지 않음)
+    _warming_up.set()
+    threading.Thread(target=_warm_up_caches, daemon=True, name="cache-warm-up").start()
     
-    thread = threading.Thread(target=background_update_check, daemon=True)
-    thread.start()
+    # 매일 11시 업데이트는 이벤트 루프의 asyncio 태스크로 예약 (엑셀 파일이 10시 30분~11시 사이에 업데이트됨)
+    global _daily_update_task
+    _daily_update_task = asyncio.create_task(_daily_update_loop())
 
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료 시 매일 업데이트 태스크를 바로 깨워 종료 (다음 11시까지 잠든 채 남지 않도록)"""
+    global _daily_update_task
+    task = _daily_update_task
+    _daily_update_task = None
+    if task is None or task.done():
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
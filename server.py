@@ -1,26 +1,64 @@
 from __future__ import annotations
 
+import json
+import asyncio
+import logging
 import os
 import re
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import openpyxl
 from fastapi import FastAPI, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from openpyxl.worksheet.worksheet import Worksheet
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from openpyxl.utils import get_column_letter
+
+try:
+    import orjson
+except ImportError:
+    # orjson이 없으면 표준 json으로 직렬화 (느리지만 동일하게 동작)
+    orjson = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    # python-calamine이 없으면 openpyxl(read_only)로 시트를 읽음 (느리지만 동일하게 동작)
+    CalamineWorkbook = None
+
+# 로드/파싱 경로의 로그용 (레벨로 걸러서 성공 경로에서는 문자열 포맷·stdout 출력을 하지 않음)
+logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent
 DEFAULT_WORKBOOK = BASE_DIR / "★26SS MLB 생산스케쥴_DASHBOARD.xlsx"
 
 FILE_PATH = Path(os.getenv("SUMMARY_EXCEL", str(DEFAULT_WORKBOOK)))
 SHEET_NAME = os.getenv("SUMMARY_SHEET", "수량 기준")
+# 서버 시작 시 미리 읽어 두는 요약 시트
+SUMMARY_SHEETS = ("수량 기준", "스타일수 기준")
+# 파싱한 요약 JSON을 저장해 두는 디렉터리 (설정하면 재시작 후에도 엑셀이 그대로면 다시 파싱하지 않음)
+SUMMARY_COMPILED_DIR = os.getenv("SUMMARY_COMPILED_DIR")
+# 저장된 요약 JSON의 형식 버전. 파서/응답 구조를 바꾸면 올려서 이전 배포가 만든 파일을 쓰지 않게 함
+SUMMARY_COMPILED_VERSION = 1
 
 # 기본값 (주차를 찾을 수 없을 때 사용)
 DEFAULT_WEEK1 = 48
 DEFAULT_WEEK2 = 49
 
+# 헤더의 'xx주차' 패턴 (모듈 로드 시 한 번만 컴파일)
+_WEEK_RE = re.compile(r'(\d+)\s*주차')
+
+# 숫자 문자열에서 천 단위 구분자(,)와 공백을 한 번에 제거하는 변환 테이블
+_CLEAN_TRANS = str.maketrans("", "", ", ")
+
+# 엑셀 오류 값 (#VALUE!, #REF! 등). 그 밖의 '#...' 문자열도 숫자 변환에 실패하므로 결과는 같음
+_EXCEL_ERRORS = frozenset({"#VALUE!", "#REF!", "#NAME?", "#DIV/0!", "#NULL!", "#N/A", "#NUM!", "#SPILL!", "#CALC!", "#GETTING_DATA"})
+
 # 고정 컬럼: 총 수량
 TOTAL_QTY_COL = "C"
 TOTAL_QTY_COL_DETAIL = "P"
@@ -28,14 +66,14 @@ TOTAL_QTY_COL_DETAIL = "P"
 
 def _extract_week_from_header(cell_value: Any) -> Optional[int]:
     """셀 값에서 주차 번호를 추출합니다. 'xx주차' 형식을 찾습니다."""
-    if cell_value is None:
+    # '주차'는 문자열 셀에만 있을 수 있으므로 숫자/날짜/None 셀은 바로 건너뜀
+    if not isinstance(cell_value, str):
         return None
     
-    # 문자열로 변환
-    text = str(cell_value).strip()
+    text = cell_value.strip()
     
     # 'xx주차' 패턴 찾기 (예: "49주차", "49 주차" 등)
-    match = re.search(r'(\d+)\s*주차', text)
+    match = _WEEK_RE.search(text)
     if match:
         try:
             return int(match.group(1))
@@ -45,15 +83,14 @@ def _extract_week_from_header(cell_value: Any) -> Optional[int]:
     return None
 
 
-def _find_week_numbers(ws: Worksheet) -> Tuple[int, int]:
+def _find_week_numbers(rows: List[Tuple[Any, ...]]) -> Tuple[int, int]:
     """엑셀 시트의 헤더 행에서 주차 번호를 찾습니다."""
     week_numbers = []
     
-    # 헤더 행을 확인 (일반적으로 1-4행)
-    for row in range(1, 5):
-        # D열부터 L열까지 확인 (첫 번째 주차 그룹)
-        for col_letter in ["D", "E", "F", "G", "H", "I", "J", "K", "L"]:
-            cell_value = ws[f"{col_letter}{row}"].value
+    # 헤더 행을 확인 (일반적으로 1-4행), D열부터 L열까지 한 번에 훑기 (첫 번째 주차 그룹)
+    # 헤더는 읽기만 하므로 _iter_rows처럼 None 패딩한 튜플을 만들지 않고 행을 바로 잘라 사용
+    for row_values in rows[:4]:
+        for cell_value in row_values[3:12]:
             week_num = _extract_week_from_header(cell_value)
             if week_num is not None and week_num not in week_numbers:
                 week_numbers.append(week_num)
@@ -71,12 +108,19 @@ def _find_week_numbers(ws: Worksheet) -> Tuple[int, int]:
         return (week_numbers[0], week_numbers[0] + 1)
     else:
         # 찾지 못했으면 기본값 사용
-        print(f"Warning: Could not find week numbers in header, using defaults: {DEFAULT_WEEK1}, {DEFAULT_WEEK2}")
+        logger.warning("Could not find week numbers in header, using defaults: %s, %s", DEFAULT_WEEK1, DEFAULT_WEEK2)
         return (DEFAULT_WEEK1, DEFAULT_WEEK2)
 
 
+# 열 번호 <-> 열 문자 변환 테이블 (A..ZZ, 두 글자 열까지 모두 포함. 그 밖은 계산으로 변환)
+_COL_LETTERS = [""] + [get_column_letter(i) for i in range(1, 703)]
+_COL_NUMS = {letter: i for i, letter in enumerate(_COL_LETTERS) if letter}
+
+
 def _col_num_to_letter(n: int) -> str:
     """열 번호를 엑셀 열 문자로 변환 (1=A, 2=B, ..., 27=AA)"""
+    if 0 < n < len(_COL_LETTERS):
+        return _COL_LETTERS[n]
     result = ""
     while n > 0:
         n -= 1
@@ -87,8 +131,12 @@ def _col_num_to_letter(n: int) -> str:
 
 def _col_letter_to_num(col: str) -> int:
     """엑셀 열 문자를 열 번호로 변환 (A=1, B=2, ..., AA=27)"""
+    col = col.upper()
+    num = _COL_NUMS.get(col)
+    if num is not None:
+        return num
     result = 0
-    for char in col.upper():
+    for char in col:
         result = result * 26 + (ord(char) - ord('A') + 1)
     return result
 
@@ -104,23 +152,31 @@ def _build_value_columns(week1: int, week2: int, total_qty_col: str = "C", first
     """
     # 첫 번째 주차 target 컬럼의 열 번호
     base_col_num = _col_letter_to_num(first_week_target_col)
+    # target 컬럼부터 9개 열 문자 (변환 테이블 범위 안이면 슬라이스 한 번으로)
+    if base_col_num + 8 < len(_COL_LETTERS):
+        letters = _COL_LETTERS[base_col_num:base_col_num + 9]
+    else:
+        letters = [_col_num_to_letter(base_col_num + i) for i in range(9)]
     
     columns = [
         ("total_qty", total_qty_col),
-        (f"target_{week1}", _col_num_to_letter(base_col_num)),      # D 또는 Q
-        (f"actual_{week1}", _col_num_to_letter(base_col_num + 1)),  # E 또는 R
-        (f"diff_{week1}", _col_num_to_letter(base_col_num + 2)),    # F 또는 S
-        (f"target_{week1}_pct", _col_num_to_letter(base_col_num + 3)),  # G 또는 T
-        (f"actual_{week1}_pct", _col_num_to_letter(base_col_num + 4)),  # H 또는 U
-        (f"target_{week2}", _col_num_to_letter(base_col_num + 5)),      # I 또는 V
-        (f"actual_{week2}", _col_num_to_letter(base_col_num + 6)),      # J 또는 W
-        (f"target_{week2}_pct", _col_num_to_letter(base_col_num + 7)),  # K 또는 X
-        (f"actual_{week2}_pct", _col_num_to_letter(base_col_num + 8)),  # L 또는 Y
+        (f"target_{week1}", letters[0]),      # D 또는 Q
+        (f"actual_{week1}", letters[1]),  # E 또는 R
+        (f"diff_{week1}", letters[2]),    # F 또는 S
+        (f"target_{week1}_pct", letters[3]),  # G 또는 T
+        (f"actual_{week1}_pct", letters[4]),  # H 또는 U
+        (f"target_{week2}", letters[5]),      # I 또는 V
+        (f"actual_{week2}", letters[6]),      # J 또는 W
+        (f"target_{week2}_pct", letters[7]),  # K 또는 X
+        (f"actual_{week2}_pct", letters[8]),  # L 또는 Y
     ]
     
     return tuple(columns)
 
 
+# 주차를 찾기 전(VALUE_COLUMNS 미설정) 사용할 기본 컬럼 (모듈 로드 시 한 번만 생성)
+_DEFAULT_VALUE_COLUMNS = _build_value_columns(DEFAULT_WEEK1, DEFAULT_WEEK2, "C", "D")
+
 # 동적으로 생성할 예정이므로 None으로 초기화
 VALUE_COLUMNS: Optional[Tuple[Tuple[str, str], ...]] = None
 DETAIL_VALUE_COLUMNS: Optional[Tuple[Tuple[str, str], ...]] = None
@@ -153,7 +209,35 @@ BLOCK_LAYOUT = (
     ),
 )
 
-app = FastAPI(title="26SS Quantity Summary API")
+
+@lru_cache(maxsize=8)
+def _block_configs(week1: int, week2: int) -> Tuple[Tuple[str, Dict[str, Any]], ...]:
+    """주차에 맞는 value_columns를 넣은 BLOCK_LAYOUT 설정을 반환합니다.
+    sub_categories 블록은 DETAIL_VALUE_COLUMNS(P~Y), 나머지는 VALUE_COLUMNS(C~L)를 사용합니다.
+    주차가 같으면 시트/요청마다 설정 dict를 다시 복사하지 않고 재사용합니다 (호출 측에서 수정하지 않음)."""
+    value_columns = _build_value_columns(week1, week2, "C", "D")
+    detail_value_columns = _build_value_columns(week1, week2, "P", "Q")
+    return tuple(
+        (
+            name,
+            {
+                **config,
+                "value_columns": detail_value_columns if config.get("use_detail_columns") else config.get("value_columns", value_columns),
+            },
+        )
+        for name, config in BLOCK_LAYOUT
+    )
+
+
+# 시트에서 읽는 최대 범위: BLOCK_LAYOUT의 마지막 행, 상세 컬럼(P~Y)의 마지막 열
+SHEET_READ_MAX_ROW = max(config["rows"].stop - 1 for _, config in BLOCK_LAYOUT)
+SHEET_READ_MAX_COL = _col_letter_to_num("Y")
+
+# orjson(Rust)이 있으면 모든 JSON 응답을 orjson으로 직렬화
+app = FastAPI(
+    title="26SS Quantity Summary API",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -163,105 +247,296 @@ app.add_middleware(
 )
 
 
-def _extract_block(ws: Worksheet, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+# 마지막으로 읽은 워크북의 (파일 지문(크기, 수정 시간 ns), 시트 목록). /api/sheets가 워크북을 다시 열지 않도록 보관
+_sheet_names_cache: Optional[Tuple[Tuple[int, int], List[str]]] = None
+
+
+def _file_fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    """파일 지문 (크기, 수정 시간 ns)을 반환합니다. 파일이 없거나 읽을 수 없으면 None."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _open_workbook(path: Path) -> Any:
+    """openpyxl로 값만 읽는 read_only 워크북을 엽니다 (python-calamine이 없을 때 사용, 호출 측에서 close).
+
+    data_only: 수식 대신 캐시된 값, keep_links=False: 외부 링크 대상 시트의 캐시 사본을 읽지 않음,
+    keep_vba=False: VBA 파트를 보관하지 않음, rich_text=False: 셀 서식 텍스트를 일반 문자열로 읽음.
+    """
+    return openpyxl.load_workbook(path, data_only=True, read_only=True, keep_links=False, keep_vba=False, rich_text=False)
+
+
+def _workbook_sheet_names(path: Path) -> List[str]:
+    """워크북의 시트 목록을 반환합니다. 같은 파일을 이미 읽었으면 워크북을 열지 않습니다."""
+    global _sheet_names_cache
+    fingerprint = _file_fingerprint(path)
+    cached = _sheet_names_cache
+    if cached is not None and fingerprint is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    if CalamineWorkbook is not None:
+        sheets = list(CalamineWorkbook.from_path(str(path)).sheet_names)
+    else:
+        workbook = _open_workbook(path)
+        try:
+            sheets = workbook.sheetnames
+        finally:
+            workbook.close()
+    if fingerprint is not None:
+        _sheet_names_cache = (fingerprint, sheets)
+    return sheets
+
+
+def _calamine_rows(sheet: Any) -> List[Tuple[Any, ...]]:
+    """python-calamine 시트를 openpyxl(values_only)과 같은 값의 행 튜플 리스트로 읽습니다.
+
+    calamine은 숫자 셀을 모두 float로 돌려주므로, 정수로 떨어지는 값은 openpyxl처럼 int로 바꿉니다
+    (그래야 JSON/ETag가 어느 리더를 쓰든 같음). 엑셀은 1e15 이상을 지수 표기로 저장해 openpyxl도 float로 읽으므로 그 범위는 그대로 둡니다.
+    각 행은 최소 SHEET_READ_MAX_COL 길이로 맞추고, SHEET_READ_MAX_ROW 이후 행은 아예 만들지 않습니다.
+    """
+    rows: List[Tuple[Any, ...]] = []
+    # skip_empty_area=False: 앞쪽 빈 행/열을 건너뛰지 않아 행/열 번호가 엑셀과 일치
+    for row in sheet.to_python(skip_empty_area=False, nrows=SHEET_READ_MAX_ROW):
+        values = tuple(int(v) if type(v) is float and v.is_integer() and -1e15 < v < 1e15 else v for v in row)
+        if len(values) < SHEET_READ_MAX_COL:
+            values += (None,) * (SHEET_READ_MAX_COL - len(values))
+        rows.append(values)
+    return rows
+
+
+def _read_sheets(path: Path, sheet_names: Tuple[str, ...]) -> Tuple[List[str], Dict[str, List[Tuple[Any, ...]]]]:
+    """워크북을 한 번 열어 시트 목록과 요청한 시트들의 행 데이터(값 튜플 리스트)를 반환합니다.
+    rows[0]이 엑셀 1행에 해당하며, 각 행은 최소 SHEET_READ_MAX_COL(Y열) 길이입니다.
+    워크북에 없는 시트는 결과 dict에 포함되지 않습니다.
+
+    python-calamine(Rust)이 설치되어 있으면 시트 전체를 한 번에 파싱하고,
+    없으면 openpyxl read_only 모드로 필요한 범위만 읽습니다.
+    읽은 시트 목록은 _sheet_names_cache에 남겨 /api/sheets에서 재사용합니다.
+    """
+    global _sheet_names_cache
+    fingerprint = _file_fingerprint(path)
+    sheets: Dict[str, List[Tuple[Any, ...]]] = {}
+    if CalamineWorkbook is not None:
+        workbook = CalamineWorkbook.from_path(str(path))
+        available = list(workbook.sheet_names)
+        if fingerprint is not None:
+            _sheet_names_cache = (fingerprint, available)
+        for name in sheet_names:
+            if name in available:
+                sheets[name] = _calamine_rows(workbook.get_sheet_by_name(name))
+        return available, sheets
+
+    workbook = _open_workbook(path)
+    try:
+        available = workbook.sheetnames
+        if fingerprint is not None:
+            _sheet_names_cache = (fingerprint, available)
+        for name in sheet_names:
+            if name in available:
+                ws = workbook[name]
+                sheets[name] = list(ws.iter_rows(min_row=1, max_row=SHEET_READ_MAX_ROW, min_col=1, max_col=SHEET_READ_MAX_COL, values_only=True))
+        return available, sheets
+    finally:
+        workbook.close()
+
+
+def _iter_rows(rows: List[Tuple[Any, ...]], min_row: int, max_row: int, min_col: int, max_col: int):
+    """Worksheet.iter_rows(values_only=True)와 같은 방식으로 행 데이터를 잘라 반환합니다.
+    각 튜플은 항상 (max_col - min_col + 1) 길이로 맞춰집니다 (부족한 열은 None)."""
+    width = max_col - min_col + 1
+    for values in rows[min_row - 1:max_row]:
+        sliced = tuple(values[min_col - 1:max_col])
+        if len(sliced) < width:
+            sliced += (None,) * (width - len(sliced))
+        yield sliced
+
+
+def _parse_value_column(values: Tuple[Any, ...], column: str, row_nums: List[int]) -> List[Any]:
+    """블록의 한 값 열을 한 번에 변환합니다.
+
+    숫자는 그대로, 숫자 문자열은 int/float로, 빈 값/엑셀 오류/숫자가 아닌 문자열은 None으로,
+    날짜 등 기타 타입은 그대로 둡니다. 셀마다 isinstance 분기를 차례로 거치지 않도록
+    흔한 타입(None/int/float)을 먼저 type()으로 바로 가릅니다.
+    """
+    parsed: List[Any] = []
+    append = parsed.append
+    for row, value in zip(row_nums, values):
+        value_type = type(value)
+        if value is None or value_type is int or value_type is float:
+            append(value)
+        elif isinstance(value, str):
+            if value in _EXCEL_ERRORS:
+                # 엑셀 오류 값 (#VALUE!, #REF!, #N/A 등)은 None으로 처리
+                logger.warning("Excel error value at %s%s: %s", column, row, value)
+                append(None)
+                continue
+            # 구분자/공백 제거를 한 번의 translate로 처리 (앞뒤 공백은 int/float가 무시)
+            # 빈 문자열이나 그 밖의 '#...' 문자열은 변환에 실패하므로 None
+            cleaned = value.translate(_CLEAN_TRANS)
+            try:
+                # 소수점이 있으면 float, 없으면 int
+                append(float(cleaned) if "." in cleaned else int(cleaned))
+            except ValueError:
+                append(None)
+        else:
+            # bool/날짜 등 기타 타입은 그대로 저장
+            append(value)
+    return parsed
+
+
+@lru_cache(maxsize=16)
+def _block_columns(label_col: str, columns: Tuple[Tuple[str, str], ...]) -> Tuple[int, Tuple[int, ...], int, int]:
+    """블록의 라벨 열/값 열 문자를 열 번호로 바꿔 (라벨 열 번호, 값 열 번호들, 최소 열, 최대 열)을 반환합니다.
+    주차가 같으면 열 구성도 같으므로 블록/시트/요청마다 다시 계산하지 않고 재사용합니다."""
+    label_col_num = _col_letter_to_num(label_col)
+    column_nums = tuple(_col_letter_to_num(column) for _, column in columns)
+    all_cols = (label_col_num,) + column_nums
+    return label_col_num, column_nums, min(all_cols), max(all_cols)
+
+
+def _extract_block(sheet_rows: List[Tuple[Any, ...]], config: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Generic reader for a contiguous table that shares the same value columns."""
 
     payload: List[Dict[str, Any]] = []
     blank_streak = 0
-    # 동적 컬럼이 설정되지 않은 경우 기본값 사용 (하위 호환성)
-    default_columns = _build_value_columns(DEFAULT_WEEK1, DEFAULT_WEEK2, "C", "D")
     
     # value_columns가 config에 명시적으로 설정되어 있으면 그것을 우선 사용
     if "value_columns" in config and config["value_columns"] is not None:
         columns = config["value_columns"]
-        print(f"Using value_columns from config: {columns[:2] if columns else 'None'}...")
     else:
-        columns = VALUE_COLUMNS or default_columns
-        print(f"Using default VALUE_COLUMNS or default_columns")
+        # 동적 컬럼이 설정되지 않은 경우 기본값 사용 (하위 호환성)
+        columns = VALUE_COLUMNS or _DEFAULT_VALUE_COLUMNS
+        logger.debug("Using default VALUE_COLUMNS or default_columns")
     
     label_col = config.get("label_col", "B")
     label_key = config.get("label_key", "label")
     rows = config.get("rows", [])
-    print(f"Extracting block: label_col={label_col}, label_key={label_key}, rows={list(rows)[:5] if rows else 'empty'}...")
+    logger.debug("Extracting block: label_col=%s, label_key=%s, rows=%s", label_col, label_key, rows)
+
+    if not rows:
+        return payload
+
+    # 행/열 범위를 한 번에 잘라 읽고 열 번호로 직접 인덱싱 (셀 좌표 문자열 파싱 제거)
+    label_col_num, column_nums, min_col, max_col = _block_columns(label_col, tuple(columns))
+    # 블록 설정값도 행마다 조회하지 않도록 루프 밖에서 한 번만 읽기
+    stop_on_blank = config.get("stop_on_blank")
+    blank_tolerance = config.get("blank_tolerance", 1)
+    # 시트 행은 최소 SHEET_READ_MAX_COL 길이로 맞춰져 있으므로, 그 안의 열만 쓰면 블록마다 행을 잘라 복사하지 않고
+    # 엑셀 열 위치(base_col=1 기준)로 바로 읽음. 범위를 넘는 열이 있으면 _iter_rows로 잘라서 읽기
+    # rows는 BLOCK_LAYOUT의 연속된 range이므로 잘라낸 모든 행이 대상
+    if max_col <= SHEET_READ_MAX_COL:
+        base_col = 1
+        block_rows = sheet_rows[rows.start - 1:rows.stop - 1]
+    else:
+        base_col = min_col
+        block_rows = _iter_rows(sheet_rows, min_row=rows.start, max_row=rows.stop - 1, min_col=min_col, max_col=max_col)
+    label_idx = label_col_num - base_col
+    column_plan = [(key, column, col_num - base_col) for (key, column), col_num in zip(columns, column_nums)]
+
+    # 1단계: 라벨 기준으로 대상 행만 고르기
+    selected_rows: List[int] = []
+    selected: List[Tuple[Any, ...]] = []
+    for row, row_values in enumerate(block_rows, start=rows.start):
+        label = row_values[label_idx]
+
+        if label in (None, ""):
+            if stop_on_blank:
+                blank_streak += 1
+                if blank_streak >= blank_tolerance:
+                    break
+            continue
 
-    for row in config["rows"]:
-        try:
-            label = ws[f"{config['label_col']}{row}"].value
+        blank_streak = 0
+        selected_rows.append(row)
+        selected.append(row_values)
 
-            if label in (None, ""):
-                if config.get("stop_on_blank"):
-                    blank_streak += 1
-                    if blank_streak >= config.get("blank_tolerance", 1):
-                        break
-                continue
+    if not selected:
+        return payload
 
-            blank_streak = 0
-            entry = {config["label_key"]: label}
-
-            for key, column in columns:
-                try:
-                    cell_value = ws[f"{column}{row}"].value
-                    
-                    # #VALUE! 같은 엑셀 오류 문자열 처리
-                    if isinstance(cell_value, str) and cell_value.startswith("#"):
-                        # 엑셀 오류 값 (#VALUE!, #REF!, #N/A 등)은 None으로 처리
-                        entry[key] = None
-                        print(f"Warning: Excel error value at {column}{row}: {cell_value}")
-                    elif cell_value is None:
-                        entry[key] = None
-                    elif isinstance(cell_value, (int, float)):
-                        # 이미 숫자인 경우 그대로 사용
-                        entry[key] = cell_value
-                    elif isinstance(cell_value, str):
-                        # 문자열 처리
-                        cleaned = cell_value.strip().replace(",", "").replace(" ", "")
-                        if not cleaned:
-                            entry[key] = None
-                        elif cleaned.startswith("#"):
-                            # 엑셀 오류 값
-                            entry[key] = None
-                        else:
-                            # 숫자로 변환 시도
-                            try:
-                                # 소수점이 있으면 float, 없으면 int
-                                if "." in cleaned:
-                                    entry[key] = float(cleaned)
-                                else:
-                                    entry[key] = int(cleaned)
-                            except (ValueError, TypeError):
-                                entry[key] = None
-                    else:
-                        # 기타 타입은 그대로 저장
-                        entry[key] = cell_value
-                except Exception as e:
-                    # 특정 셀 읽기 실패 시 None으로 처리
-                    entry[key] = None
-                    print(f"Warning: Failed to read {column}{row}: {e}")
-
-            payload.append(entry)
-        except Exception as e:
-            print(f"Warning: Failed to process row {row}: {e}")
-            continue
+    # 2단계: 선택한 행을 zip으로 한 번에 열 단위로 전치한 뒤, 값 열별로 변환해서 행(entry)으로 묶기
+    # (열마다 행 리스트를 다시 훑지 않음. 모든 행은 max_col 이상 길이이므로 zip이 잘라내는 열은 없음)
+    transposed = list(zip(*selected))
+    keys = [label_key] + [key for key, _, _ in column_plan]
+    value_columns = [transposed[label_idx]]
+    for _, column, col_idx in column_plan:
+        value_columns.append(_parse_value_column(transposed[col_idx], column, selected_rows))
+    payload = [dict(zip(keys, values)) for values in zip(*value_columns)]
 
     return payload
 
 
-def load_summary(sheet_name: Optional[str] = None) -> Dict[str, Any]:
+# (파일 경로, 시트명, 수정 시간 ns, 크기) -> load_summary 결과. 파일이 바뀌면 같은 시트의 이전 항목은 버림
+_summary_cache: Dict[Tuple[str, str, int, int], Dict[str, Any]] = {}
+# 동시 요청이 같은 캐시 미스를 만나도 파싱은 한 번만 하도록 채우는 쪽만 잠금
+_summary_cache_lock = threading.Lock()
+
+
+def load_summary(
+    sheet_name: Optional[str] = None,
+    preloaded: Optional[Tuple[List[str], Optional[List[Tuple[Any, ...]]]]] = None,
+) -> Dict[str, Any]:
     """엑셀 파일에서 데이터를 로드하고 주차 정보를 포함하여 반환합니다.
+    같은 파일(경로, 수정 시간, 크기)의 같은 시트는 한 번만 파싱하고 결과를 재사용합니다.
+    (반환된 dict는 공유되므로 호출 측에서 수정하지 않음)
     
     Args:
         sheet_name: 시트 이름 (None이면 기본값 SHEET_NAME 사용)
+        preloaded: 이미 읽어 둔 (시트 목록, 대상 시트 행 데이터). 있으면 워크북을 다시 열지 않음
     """
-    global VALUE_COLUMNS, DETAIL_VALUE_COLUMNS, WEEK1, WEEK2
-    
     target_sheet = sheet_name or SHEET_NAME
     
-    if not FILE_PATH.exists():
+    fingerprint = _file_fingerprint(FILE_PATH)
+    if fingerprint is None:
         raise FileNotFoundError(f"Excel file not found at {FILE_PATH}")
+    
+    key = (str(FILE_PATH), target_sheet, fingerprint[1], fingerprint[0])
+    cached = _summary_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    with _summary_cache_lock:
+        # 락을 기다리는 동안 다른 요청이 이미 읽었으면 그 결과 사용
+        cached = _summary_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # 대시보드는 두 요약 시트를 연달아 요청하므로, 다른 요약 시트도 캐시에 없으면 같은 워크북 열기에서 함께 읽음
+        # (파싱은 이 락 안에서 차례로 진행되므로 시트별로 워크북을 따로 여는 것보다 열기/압축 해제가 한 번 줄어듦)
+        siblings: Tuple[str, ...] = ()
+        if preloaded is None and target_sheet in SUMMARY_SHEETS:
+            siblings = tuple(
+                name for name in SUMMARY_SHEETS
+                if name != target_sheet and (key[0], name) + key[2:] not in _summary_cache
+            )
+        if siblings:
+            available, sheets = _open_summary_sheets((target_sheet,) + siblings)
+            preloaded = (available, sheets.pop(target_sheet, None))
+        
+        result = _load_summary_uncached(target_sheet, preloaded)
+        _store_summary(key, result)
+        for name in siblings:
+            try:
+                _store_summary((key[0], name) + key[2:], _load_summary_uncached(name, (available, sheets.pop(name, None))))
+            except RuntimeError as exc:
+                # 함께 읽은 시트가 실패해도 요청한 시트 응답에는 영향 없음 (그 시트는 요청 시 다시 로드)
+                logger.warning("Failed to preload sheet '%s': %s", name, exc)
+        return result
+
 
-    workbook = None
+def _store_summary(key: Tuple[str, str, int, int], result: Dict[str, Any]) -> None:
+    """요약 결과를 캐시에 넣고 같은 시트의 이전 파일 버전 항목은 버립니다 (_summary_cache_lock 안에서 호출)."""
+    for old_key in [k for k in _summary_cache if k[:2] == key[:2]]:
+        del _summary_cache[old_key]
+    _summary_cache[key] = result
+
+
+def _open_summary_sheets(sheet_names: Tuple[str, ...]) -> Tuple[List[str], Dict[str, List[Tuple[Any, ...]]]]:
+    """FILE_PATH 워크북을 한 번 열어 시트들을 읽습니다. 파일 접근 오류는 안내 메시지를 담은 RuntimeError로 바꿉니다."""
     try:
-        workbook = openpyxl.load_workbook(FILE_PATH, data_only=True, read_only=True)
+        return _read_sheets(FILE_PATH, sheet_names)
     except PermissionError as exc:
         error_msg = (
             f"엑셀 파일에 접근할 수 없습니다. 파일이 다른 프로그램(Excel 등)에서 열려있거나 "
@@ -271,67 +546,62 @@ def load_summary(sheet_name: Optional[str] = None) -> Dict[str, Any]:
     except Exception as exc:
         raise RuntimeError(f"Failed to open workbook: {exc}") from exc
 
-    try:
-        # 시트 목록 확인 및 로깅
-        available_sheets = workbook.sheetnames
-        print(f"Available sheets in workbook: {available_sheets}")
-        print(f"Looking for sheet: '{target_sheet}'")
-        
-        if target_sheet not in available_sheets:
-            raise RuntimeError(
-                f"Worksheet '{target_sheet}' not found. Available sheets: {', '.join(available_sheets)}"
-            )
-        
-        sheet = workbook[target_sheet]
-        print(f"Successfully opened sheet: '{target_sheet}'")
-        
-    except KeyError as exc:
-        if workbook:
-            workbook.close()
-        raise RuntimeError(f"Worksheet '{target_sheet}' not found in workbook") from exc
+
+def _load_summary_uncached(
+    target_sheet: str,
+    preloaded: Optional[Tuple[List[str], Optional[List[Tuple[Any, ...]]]]] = None,
+) -> Dict[str, Any]:
+    """엑셀 파일에서 시트 하나를 새로 읽어 주차 정보와 블록 데이터를 만듭니다 (load_summary 캐시 미스 시)."""
+    global VALUE_COLUMNS, DETAIL_VALUE_COLUMNS, WEEK1, WEEK2
+
+    # 워크북은 여기서 한 번 열어 대상 시트의 값만 읽고 바로 닫음 (미리 읽어 둔 값이 있으면 그대로 사용)
+    if preloaded is not None:
+        available_sheets, sheet_rows = preloaded
+    else:
+        available_sheets, sheets = _open_summary_sheets((target_sheet,))
+        sheet_rows = sheets.get(target_sheet)
+
+    # 시트 목록 확인 및 로깅
+    logger.debug("Available sheets in workbook: %s", available_sheets)
+    logger.debug("Looking for sheet: '%s'", target_sheet)
+    
+    if sheet_rows is None:
+        raise RuntimeError(
+            f"Worksheet '{target_sheet}' not found. Available sheets: {', '.join(available_sheets)}"
+        )
+    
+    logger.debug("Successfully opened sheet: '%s'", target_sheet)
 
     try:
         # 헤더에서 주차 정보 추출
-        WEEK1, WEEK2 = _find_week_numbers(sheet)
-        print(f"Found weeks in Excel: 금주={WEEK1}, 차주={WEEK2}")
+        WEEK1, WEEK2 = _find_week_numbers(sheet_rows)
+        logger.debug("Found weeks in Excel: 금주=%s, 차주=%s", WEEK1, WEEK2)
         
         # 주차 정보에 따라 동적으로 컬럼 생성
         VALUE_COLUMNS = _build_value_columns(WEEK1, WEEK2, "C", "D")
         DETAIL_VALUE_COLUMNS = _build_value_columns(WEEK1, WEEK2, "P", "Q")
         
         data = {}
-        for name, config in BLOCK_LAYOUT:
+        # 블록별 value_columns는 주차 기준으로 한 번만 만들어 둔 설정을 그대로 사용
+        for name, current_config in _block_configs(WEEK1, WEEK2):
             try:
-                # sub_categories 블록의 경우 DETAIL_VALUE_COLUMNS를 명시적으로 설정
-                current_config = config.copy()
-                if config.get("use_detail_columns"):
-                    current_config["value_columns"] = DETAIL_VALUE_COLUMNS
-                    print(f"Block '{name}': Using DETAIL_VALUE_COLUMNS (P~Y columns)")
-                    print(f"DETAIL_VALUE_COLUMNS: {DETAIL_VALUE_COLUMNS}")
-                elif "value_columns" not in current_config:
-                    # 다른 블록들은 VALUE_COLUMNS 사용
-                    current_config["value_columns"] = VALUE_COLUMNS
-                    print(f"Block '{name}': Using VALUE_COLUMNS (C~L columns)")
-                
-                extracted = _extract_block(sheet, current_config)
+                extracted = _extract_block(sheet_rows, current_config)
                 data[name] = extracted
-                print(f"Extracted {len(extracted)} rows for block '{name}'")
+                logger.debug("Extracted %d rows for block '%s'", len(extracted), name)
                 if name == "sub_categories":
-                    print(f"=== Sub Categories Debug ===")
-                    print(f"Total rows extracted: {len(extracted)}")
-                    if len(extracted) > 0:
-                        print(f"Sample sub_categories data (first 3 rows):")
+                    if not extracted:
+                        logger.warning(
+                            "No sub_categories data extracted (label_col=%s, rows=%s, value_columns=%s)",
+                            current_config.get("label_col"),
+                            current_config.get("rows"),
+                            (current_config.get("value_columns") or ())[:3],
+                        )
+                    elif logger.isEnabledFor(logging.DEBUG):
+                        # 샘플 행 문자열은 DEBUG 레벨일 때만 만들기
                         for i, row in enumerate(extracted[:3]):
-                            print(f"  Row {i+1}: {row}")
-                    else:
-                        print(f"WARNING: No sub_categories data extracted!")
-                        print(f"Config used: label_col={current_config.get('label_col')}, rows={list(current_config.get('rows', []))[:10] if current_config.get('rows') else 'None'}")
-                        print(f"Value columns used: {current_config.get('value_columns', 'Not set')[:3] if current_config.get('value_columns') else 'Not set'}")
-                    print(f"===========================")
+                            logger.debug("sub_categories row %d: %s", i + 1, row)
             except Exception as e:
-                error_msg = f"Failed to extract block '{name}': {str(e)}"
-                print(f"Warning: {error_msg}")
-                print(traceback.format_exc())
+                logger.exception("Failed to extract block '%s': %s", name, e)
                 # 일부 블록 실패해도 다른 블록은 계속 진행
                 data[name] = []
         
@@ -345,25 +615,145 @@ def load_summary(sheet_name: Optional[str] = None) -> Dict[str, Any]:
             "sheet_name": target_sheet,
         }
         
-        print(f"Successfully loaded summary data with keys: {list(data.keys())}")
-        print(f"Week info: {result['week_info']}")
+        logger.debug("Loaded summary for '%s': blocks=%s, week_info=%s", target_sheet, list(data), result["week_info"])
         return result
     except Exception as e:
         error_msg = f"Unexpected error in load_summary: {str(e)}"
-        print(error_msg)
-        print(traceback.format_exc())
+        logger.exception("%s", error_msg)
         raise RuntimeError(error_msg) from e
-    finally:
-        if workbook:
-            try:
-                workbook.close()
-            except Exception:
-                pass  # close 실패해도 무시
+
+
+# 시트명 -> (파일 지문(크기, 수정 시간 ns), JSON bytes). 파일이 그대로면 워크북을 다시 읽거나 직렬화하지 않음
+_summary_json_cache: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
+
+
+# 엑셀 로드 전용 스레드 풀: 동시에 캐시 미스가 몰려도 파싱은 최대 2개만 (메모리 사용량 제한)
+_XLSX_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="xlsx")
+
+
+def _cached_summary_json(sheet_name: str) -> Optional[bytes]:
+    """파일이 바뀌지 않았으면 직렬화해 둔 JSON bytes를, 아니면 None을 반환합니다 (stat 1회만 수행)."""
+    cached = _summary_json_cache.get(sheet_name)
+    if cached is not None and cached[0] == _file_fingerprint(FILE_PATH):
+        return cached[1]
+    return None
+
+
+def _compiled_path(sheet_name: str, fingerprint: Tuple[int, int]) -> Path:
+    """형식 버전/엑셀 파일 지문별 요약 JSON 저장 경로 (SUMMARY_COMPILED_DIR 아래)"""
+    return Path(SUMMARY_COMPILED_DIR) / (
+        f"{FILE_PATH.stem}.{sheet_name}.v{SUMMARY_COMPILED_VERSION}.{fingerprint[0]}.{fingerprint[1]}.json"
+    )
+
+
+def _load_compiled_json(sheet_name: str, fingerprint: Tuple[int, int]) -> Optional[bytes]:
+    """저장해 둔 요약 JSON이 현재 엑셀 파일과 같은 지문이면 읽어서 메모리 캐시에 올리고 반환합니다."""
+    if not SUMMARY_COMPILED_DIR:
+        return None
+    try:
+        body = _compiled_path(sheet_name, fingerprint).read_bytes()
+    except OSError:
+        return None
+    _summary_json_cache[sheet_name] = (fingerprint, body)
+    return body
+
+
+def _store_compiled_json(sheet_name: str, fingerprint: Tuple[int, int], body: bytes) -> None:
+    """요약 JSON을 디스크에 저장하고 같은 시트의 이전 버전/지문 파일은 지웁니다 (실패해도 응답에는 영향 없음)."""
+    if not SUMMARY_COMPILED_DIR:
+        return
+    path = _compiled_path(sheet_name, fingerprint)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)
+        for old_path in path.parent.glob(f"{FILE_PATH.stem}.{sheet_name}.*.json"):
+            if old_path != path:
+                old_path.unlink(missing_ok=True)
+    except OSError as exc:
+        logger.warning("Failed to store compiled summary for '%s': %s", sheet_name, exc)
+
+
+def _remove_compiled_json() -> int:
+    """이 엑셀 파일로 저장해 둔 요약 JSON을 모두 지우고 지운 개수를 반환합니다."""
+    if not SUMMARY_COMPILED_DIR:
+        return 0
+    removed = 0
+    for path in Path(SUMMARY_COMPILED_DIR).glob(f"{FILE_PATH.stem}.*.json"):
+        try:
+            path.unlink()
+            removed += 1
+        except OSError as exc:
+            logger.warning("Failed to remove compiled summary %s: %s", path, exc)
+    return removed
+
+
+def _summary_json(sheet_name: str) -> bytes:
+    """시트 요약 데이터를 JSON bytes로 반환합니다. 엑셀 파일이 바뀌었을 때만 새로 로드/직렬화합니다."""
+    # 파일이 없으면 fingerprint는 None이고 load_summary에서 FileNotFoundError 발생
+    fingerprint = _file_fingerprint(FILE_PATH)
+    cached = _summary_json_cache.get(sheet_name)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    if fingerprint is not None:
+        body = _load_compiled_json(sheet_name, fingerprint)
+        if body is not None:
+            return body
+
+    data = load_summary(sheet_name)
+    # 날짜/기간 등 셀 값은 FastAPI 기본 응답과 같게 jsonable_encoder로 변환 (datetime -> ISO 문자열, timedelta -> 초)
+    if orjson is not None:
+        body = orjson.dumps(data, default=jsonable_encoder)
+    else:
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=jsonable_encoder).encode("utf-8")
+    if fingerprint is not None:
+        _summary_json_cache[sheet_name] = (fingerprint, body)
+        _store_compiled_json(sheet_name, fingerprint, body)
+    return body
+
+
+def _warm_up_summaries() -> None:
+    """워크북을 한 번만 열어 두 요약 시트를 읽고 데이터/JSON 캐시를 미리 채웁니다 (서버 시작 시 _XLSX_POOL에서 실행)."""
+    try:
+        fingerprint = _file_fingerprint(FILE_PATH)
+        if fingerprint is None:
+            logger.warning("Excel file not found at %s, skipping warm-up", FILE_PATH)
+            return
+        # 저장해 둔 요약 JSON이 있는 시트는 워크북을 열지 않음
+        pending = tuple(sheet for sheet in SUMMARY_SHEETS if _load_compiled_json(sheet, fingerprint) is None)
+        if not pending:
+            logger.info("Warm-up complete (compiled): %s", ", ".join(SUMMARY_SHEETS))
+            return
+        available, sheets = _read_sheets(FILE_PATH, pending)
+        # 읽는 동안 파일이 바뀌었으면 미리 읽은 값은 버리고 각 시트를 새로 로드
+        if _file_fingerprint(FILE_PATH) != fingerprint:
+            available, sheets = None, {}
+        # 시트 행은 파싱에 넘기면서 dict에서 빼서, 다음 시트를 파싱하는 동안 이미 처리한 행 데이터가 남지 않게 함
+        # (메모리 최대치 ≈ 읽은 범위(79행 × 25열) × 시트 수 + 요약 결과. 워크북 전체 크기와 무관)
+        for sheet in pending:
+            load_summary(sheet, (available, sheets.pop(sheet, None)) if available is not None else None)
+            _summary_json(sheet)
+        logger.info("Warm-up complete: %s", ", ".join(SUMMARY_SHEETS))
+    except Exception as exc:
+        # 실패해도 서버는 계속 동작 (첫 요청 시 다시 로드)
+        logger.warning("Warm-up failed: %s", exc)
+
+
+@app.on_event("startup")
+async def startup_event() -> None:
+    """서버 시작 시 두 요약 시트를 백그라운드에서 미리 로드 (포트 바인딩/첫 요청을 막지 않음)"""
+    asyncio.get_running_loop().run_in_executor(_XLSX_POOL, _warm_up_summaries)
+
+
+# 헬스 체크 응답 본문 (요청마다 dict 생성/JSON 직렬화 없이 그대로 전송)
+_HEALTH_BODY = b'{"status":"ok"}'
 
 
 @app.get("/health")
-def healthcheck() -> Dict[str, str]:
-    return {"status": "ok"}
+def healthcheck() -> Response:
+    # Response 객체는 미들웨어가 헤더를 덧붙일 수 있어 공유하지 않고 요청마다 새로 만듦
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/api/sheets")
@@ -378,9 +768,8 @@ def list_sheets() -> Dict[str, Any]:
             }
         
         try:
-            workbook = openpyxl.load_workbook(FILE_PATH, read_only=True)
-            sheets = workbook.sheetnames
-            workbook.close()
+            # 요약 데이터를 읽을 때 남겨 둔 시트 목록을 재사용 (파일이 바뀌었거나 처음이면 시트 목록만 읽음)
+            sheets = _workbook_sheet_names(FILE_PATH)
             
             return {
                 "file_path": str(FILE_PATH),
@@ -415,6 +804,19 @@ def list_sheets() -> Dict[str, Any]:
         }
 
 
+@app.post("/api/cache/clear")
+def clear_cache() -> Dict[str, Any]:
+    """요약 데이터/응답/시트 목록 캐시와 저장해 둔 요약 JSON을 비웁니다 (디버깅용). 다음 요청에서 엑셀을 다시 읽습니다."""
+    global _sheet_names_cache
+    with _summary_cache_lock:
+        cleared = len(_summary_cache)
+        _summary_cache.clear()
+        _summary_json_cache.clear()
+        _sheet_names_cache = None
+        compiled_removed = _remove_compiled_json()
+    return {"status": "ok", "cleared": cleared, "compiled_removed": compiled_removed}
+
+
 @app.get("/api/quantity/debug")
 def get_quantity_debug() -> Dict[str, Any]:
     """수량 기준 데이터 디버깅용 - 상세 정보 반환"""
@@ -448,35 +850,39 @@ def get_quantity_debug() -> Dict[str, Any]:
 
 
 @app.get("/api/quantity")
-def get_quantity_summary() -> Dict[str, Any]:
-    """수량 기준 데이터를 주차 정보와 함께 반환합니다."""
+async def get_quantity_summary() -> Response:
+    """수량 기준 데이터를 주차 정보와 함께 반환합니다. (파일이 그대로면 직렬화해 둔 JSON을 그대로 전송)"""
     try:
-        return load_summary("수량 기준")
+        # 캐시 히트는 이벤트 루프에서 바로 응답하고, 미스일 때만 엑셀 로드를 _XLSX_POOL에서 실행
+        body = _cached_summary_json("수량 기준")
+        if body is None:
+            body = await asyncio.get_running_loop().run_in_executor(_XLSX_POOL, _summary_json, "수량 기준")
+        return Response(content=body, media_type="application/json")
     except (FileNotFoundError, RuntimeError) as exc:
         error_detail = str(exc)
-        print(f"Error in /api/quantity: {error_detail}")
-        print(traceback.format_exc())
+        logger.exception("Error in /api/quantity: %s", error_detail)
         raise HTTPException(status_code=500, detail=error_detail) from exc
     except Exception as exc:
         error_detail = f"Unexpected error: {str(exc)}"
-        print(f"Unexpected error in /api/quantity: {error_detail}")
-        print(traceback.format_exc())
+        logger.exception("Unexpected error in /api/quantity: %s", error_detail)
         raise HTTPException(status_code=500, detail=error_detail) from exc
 
 
 @app.get("/api/style-count")
-def get_style_count_summary() -> Dict[str, Any]:
-    """스타일수 기준 데이터를 주차 정보와 함께 반환합니다."""
+async def get_style_count_summary() -> Response:
+    """스타일수 기준 데이터를 주차 정보와 함께 반환합니다. (파일이 그대로면 직렬화해 둔 JSON을 그대로 전송)"""
     try:
-        return load_summary("스타일수 기준")
+        # 캐시 히트는 이벤트 루프에서 바로 응답하고, 미스일 때만 엑셀 로드를 _XLSX_POOL에서 실행
+        body = _cached_summary_json("스타일수 기준")
+        if body is None:
+            body = await asyncio.get_running_loop().run_in_executor(_XLSX_POOL, _summary_json, "스타일수 기준")
+        return Response(content=body, media_type="application/json")
     except (FileNotFoundError, RuntimeError) as exc:
         error_detail = str(exc)
-        print(f"Error in /api/style-count: {error_detail}")
-        print(traceback.format_exc())
+        logger.exception("Error in /api/style-count: %s", error_detail)
         raise HTTPException(status_code=500, detail=error_detail) from exc
     except Exception as exc:
         error_detail = f"Unexpected error: {str(exc)}"
-        print(f"Unexpected error in /api/style-count: {error_detail}")
-        print(traceback.format_exc())
+        logger.exception("Unexpected error in /api/style-count: %s", error_detail)
         raise HTTPException(status_code=500, detail=error_detail) from exc
 